@@ -0,0 +1,46 @@
+"""
+Command-line entry point: crawls FRED series metadata into the series catalog.
+
+Run from the src directory with `python crawl_catalog.py`. With no arguments every release is
+crawled, which takes longer than a Lambda invocation allows; pass --release-ids, --category-ids
+or --series-ids to crawl part of FRED, as catalog_handler does.
+"""
+
+import argparse
+import datetime
+import logging
+import sys
+
+from fred_extractor import aws_cache
+from fred_extractor.catalog import CatalogCrawler
+from fred_extractor.fred_extractor import FredExtractor
+from index import FRED_BUCKET_NAME, FRED_MAX_WORKERS, fred_client, session
+
+logger = logging.getLogger()
+
+
+def _parse_args(argv: list) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--release-ids", type=int, nargs="+", help="Releases to crawl (default: all)")
+    parser.add_argument("--category-ids", type=int, nargs="+", help="Categories whose trees are crawled")
+    parser.add_argument("--series-ids", nargs="+", help="Individual series to add")
+    return parser.parse_args(argv)
+
+
+def main(argv: list) -> int:
+    if not FRED_BUCKET_NAME:
+        raise ValueError("FRED_BUCKET_NAME environment variable is not set")
+
+    args = _parse_args(argv)
+    logging.basicConfig()
+    event = {"time": datetime.datetime.now(datetime.timezone.utc).isoformat()}
+    api_key = FredExtractor(event, None, session, FRED_BUCKET_NAME, fred_client=fred_client).retrieve_api_key()
+    crawler = CatalogCrawler(api_key, fred_client=fred_client, max_workers=FRED_MAX_WORKERS)
+    catalog = crawler.crawl(release_ids=args.release_ids, category_ids=args.category_ids, series_ids=args.series_ids)
+    response = catalog.save(aws_cache.get_client(session, "s3"), FRED_BUCKET_NAME)
+    logger.info(f"Successfully catalogued {response['Series']} series")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,236 @@
+import io
+import logging
+from typing import Iterable, Optional
+
+from botocore.exceptions import ClientError
+
+from .dates import DateLike, to_date
+from .reader import FredReader
+from .watermark import MISSING_OBJECT_ERROR_CODES
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+AGGREGATE_PREFIX = "fred-agg"
+# Weekly (Monday to Sunday), monthly and quarterly rollups
+FREQUENCIES = ("W", "M", "Q")
+COLUMNS = ("period_start", "period_end", "last", "mean", "min", "max", "count", "pct_change")
+COMPRESSION = "zstd"
+
+
+def aggregate_key(series_id: str, frequency: str) -> str:
+    """
+    S3 key of the rollup object of a series at one frequency.
+
+    Example:
+        fred-agg/SP500/freq=M/SP500-M.parquet
+    """
+    return f"{AGGREGATE_PREFIX}/{series_id}/freq={frequency}/{series_id}-{frequency}.parquet"
+
+
+def period_start(dates, frequency: str):
+    """
+    First day of the period each date falls in.
+
+    Args:
+        dates: datetime64 array
+        frequency: "W", "M" or "Q"
+
+    Returns:
+        datetime64[D] array
+    """
+    import numpy as np
+
+    if frequency == "W":
+        days = dates.astype("datetime64[D]").astype(np.int64)
+        # Day 0 (1970-01-01) was a Thursday, so (days + 3) % 7 counts days since Monday
+        return (days - (days + 3) % 7).astype("datetime64[D]")
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    if frequency == "Q":
+        months = months - months % 3
+    elif frequency != "M":
+        raise ValueError(f"Unsupported frequency '{frequency}', expected one of {', '.join(FREQUENCIES)}")
+    return months.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def period_end(starts, frequency: str):
+    """Last day of the periods starting at starts (datetime64[D] array)."""
+    import numpy as np
+
+    if frequency == "W":
+        return starts + np.timedelta64(6, "D")
+    months = 3 if frequency == "Q" else 1
+    return (starts.astype("datetime64[M]") + np.timedelta64(months, "M")).astype("datetime64[D]") - np.timedelta64(
+        1, "D"
+    )
+
+
+def pct_change(last):
+    """Change of each period's last value relative to the previous period's, NaN for the first."""
+    import numpy as np
+
+    previous = np.concatenate(([np.nan], last[:-1]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return last / previous - 1
+
+
+def resample(dates, values, frequency: str) -> dict:
+    """
+    Roll daily observations up into periods with vectorized reductions.
+
+    Missing values (NaN) are left out; periods without any value are not returned.
+
+    Args:
+        dates: datetime64[D] array
+        values: float64 array
+        frequency: "W", "M" or "Q"
+
+    Returns:
+        Dictionary of arrays: period_start, period_end, last, mean, min, max and count
+        (pct_change is added once the periods are merged with the stored ones)
+    """
+    import numpy as np
+
+    present = ~np.isnan(values)
+    order = np.argsort(dates[present], kind="stable")
+    dates, values = dates[present][order], values[present][order]
+
+    starts = period_start(dates, frequency)
+    first = np.flatnonzero(np.concatenate(([True], starts[1:] != starts[:-1]))) if len(starts) else np.array([], int)
+    count = np.diff(np.append(first, len(values)))
+
+    if not len(first):
+        empty = np.array([], dtype=np.float64)
+        return {
+            "period_start": starts,
+            "period_end": starts,
+            "last": empty,
+            "mean": empty,
+            "min": empty,
+            "max": empty,
+            "count": count,
+        }
+    return {
+        "period_start": starts[first],
+        "period_end": period_end(starts[first], frequency),
+        "last": values[first + count - 1],
+        "mean": np.add.reduceat(values, first) / count,
+        "min": np.minimum.reduceat(values, first),
+        "max": np.maximum.reduceat(values, first),
+        "count": count,
+    }
+
+
+class RollupWriter:
+    """
+    Maintains weekly, monthly and quarterly rollups of a series next to its daily objects.
+
+    Each frequency is one small Parquet object under fred-agg/{series_id}/freq={frequency}/ with
+    last, mean, min, max, count and pct_change per period. An update reads only the daily data
+    of the periods that overlap the changed dates and replaces just those rows; pct_change is
+    then recomputed across the (short) period table.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket: str,
+        frequencies: Iterable[str] = FREQUENCIES,
+        reader: Optional[FredReader] = None,
+    ) -> None:
+        """
+        Initialize the rollup writer.
+
+        Args:
+            s3_client: boto3 S3 client
+            bucket: Bucket holding the fred/ data and the fred-agg/ rollups
+            frequencies: Any of "W", "M" and "Q" (default: all three)
+            reader: Reader for the daily data (default: a FredReader for JSON objects)
+
+        Raises:
+            ValueError: If a frequency is not supported
+        """
+        self.frequencies = tuple(dict.fromkeys(frequencies))
+        unsupported = [f for f in self.frequencies if f not in FREQUENCIES]
+        if unsupported or not self.frequencies:
+            raise ValueError(f"Unsupported rollup frequencies {unsupported}, expected some of {', '.join(FREQUENCIES)}")
+
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.reader = reader or FredReader(s3_client, bucket)
+
+    def load(self, series_id: str, frequency: str) -> Optional[dict]:
+        """
+        Read the stored rollup of a series.
+
+        Returns:
+            Dictionary of NumPy arrays keyed by COLUMNS, or None if no rollup is stored
+
+        Raises:
+            ClientError: If the object exists but cannot be read
+        """
+        import pyarrow.parquet as pq
+
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=aggregate_key(series_id, frequency))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in MISSING_OBJECT_ERROR_CODES:
+                return None
+            raise
+        table = pq.read_table(io.BytesIO(response["Body"].read()))
+        return {column: table[column].to_numpy() for column in COLUMNS}
+
+    def _write(self, series_id: str, frequency: str, rollup: dict) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        buffer = io.BytesIO()
+        table = pa.table({column: pa.array(rollup[column]) for column in COLUMNS})
+        pq.write_table(table, buffer, compression=COMPRESSION)
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=aggregate_key(series_id, frequency),
+            Body=buffer.getvalue(),
+            ContentType="application/vnd.apache.parquet",
+        )
+
+    def update(self, series_id: str, start: DateLike, end: DateLike) -> dict:
+        """
+        Recompute the periods overlapping start..end at every frequency and store them.
+
+        Args:
+            series_id: FRED series identifier
+            start: First changed date (inclusive)
+            end: Last changed date (inclusive)
+
+        Returns:
+            Dictionary mapping each frequency to the number of periods rewritten
+        """
+        import numpy as np
+
+        bounds = np.array([to_date(start), to_date(end)], dtype="datetime64[D]")
+        period_bounds = {f: period_start(bounds, f) for f in self.frequencies}
+        # One read covers the affected periods of every frequency
+        span_start = min(starts[0] for starts in period_bounds.values())
+        span_end = max(period_end(starts, f)[1] for f, starts in period_bounds.items())
+        dates, values = self.reader.load(series_id, span_start.item(), span_end.item())
+
+        updated = {}
+        for frequency, (first, last) in period_bounds.items():
+            periods = resample(dates, values, frequency)
+            keep = (periods["period_start"] >= first) & (periods["period_start"] <= last)
+            periods = {column: array[keep] for column, array in periods.items()}
+
+            stored = self.load(series_id, frequency)
+            if stored is not None:
+                unchanged = (stored["period_start"] < first) | (stored["period_start"] > last)
+                periods = {column: np.concatenate((stored[column][unchanged], periods[column])) for column in periods}
+
+            order = np.argsort(periods["period_start"], kind="stable")
+            rollup = {column: array[order] for column, array in periods.items()}
+            rollup["pct_change"] = pct_change(rollup["last"])
+            self._write(series_id, frequency, rollup)
+            updated[frequency] = int(keep.sum())
+
+        logger.info(f"[RollupWriter][update] Updated {series_id} rollups for {start} to {end}: {updated}")
+        return updated
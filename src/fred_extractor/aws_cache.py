@@ -0,0 +1,130 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+import boto3
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+SECRET_TTL_SECONDS = 300
+CLIENT_TTL_SECONDS = 3600
+
+
+class TTLCache:
+    """Thread-safe key/value cache whose entries expire after a fixed time-to-live."""
+
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Seconds an entry stays valid after it is loaded
+            clock: Monotonic clock, injectable for tests
+        """
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: dict = {}
+        self._lock = threading.RLock()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, calling loader when it is missing or expired.
+
+        The lock is held while loading so concurrent callers trigger a single load.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument function producing the value
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            now = self._clock()
+            if entry is not None and entry[1] > now:
+                return entry[0]
+
+            value = loader()
+            self._entries[key] = (value, now + self.ttl_seconds)
+            return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop one entry, or every entry when no key is given.
+
+        Args:
+            key: Cache key to drop (default: all keys)
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > self._clock()
+
+
+# Module state survives warm Lambda invocations, so secrets and clients are fetched/built
+# once per TTL per execution environment instead of once per invocation.
+_secret_cache = TTLCache(SECRET_TTL_SECONDS)
+_client_cache = TTLCache(CLIENT_TTL_SECONDS)
+
+
+def get_client(session: boto3.Session, service_name: str):
+    """
+    Return a cached boto3 client for the session and service.
+
+    Args:
+        session: Boto3 session the client is created from
+        service_name: AWS service name, e.g. "s3"
+
+    Returns:
+        boto3 client
+    """
+    return _client_cache.get_or_load((session, service_name), lambda: session.client(service_name=service_name))
+
+
+def get_secret_string(session: boto3.Session, secret_id: str) -> str:
+    """
+    Return the SecretString of a Secrets Manager secret, cached for SECRET_TTL_SECONDS.
+
+    Args:
+        session: Boto3 session used when the secret has to be fetched
+        secret_id: Secret name or ARN
+
+    Returns:
+        Secret string
+
+    Raises:
+        ClientError: If the secret cannot be retrieved
+    """
+
+    def load() -> str:
+        logger.info(f"[aws_cache][get_secret_string] Fetching secret: {secret_id}")
+        response = get_client(session, "secretsmanager").get_secret_value(SecretId=secret_id)
+        return response["SecretString"]
+
+    return _secret_cache.get_or_load(secret_id, load)
+
+
+def invalidate_secret(secret_id: Optional[str] = None) -> None:
+    """
+    Force the next lookup of a secret (or of all secrets) to go to Secrets Manager.
+
+    Args:
+        secret_id: Secret to invalidate (default: all secrets)
+    """
+    logger.info(f"[aws_cache][invalidate_secret] Invalidating secret: {secret_id or 'all'}")
+    _secret_cache.invalidate(secret_id)
+
+
+def clear() -> None:
+    """Drop every cached secret and client."""
+    _secret_cache.invalidate()
+    _client_cache.invalidate()
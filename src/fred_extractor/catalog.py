@@ -0,0 +1,439 @@
+import datetime
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from botocore.exceptions import ClientError
+
+from .dates import parse_datetime
+from .fred_client import FredClient
+from .watermark import MISSING_OBJECT_ERROR_CODES, WATERMARK_PREFIX
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+API_URL = "https://api.stlouisfed.org/fred"
+CATALOG_KEY = f"{WATERMARK_PREFIX}/catalog/series.parquet"
+# Largest page FRED serves for release, category and series listings
+PAGE_LIMIT = 1000
+ROOT_CATEGORY_ID = 0
+# Parquet key-value metadata holding the crawl time as an ISO 8601 UTC timestamp
+CRAWLED_AT_METADATA = b"fred:crawled_at"
+
+
+class SeriesCatalog:
+    """
+    Columnar index of FRED series metadata.
+
+    One row per series with series_id, title, frequency (FRED's short code, e.g. "D"), units,
+    last_updated, observation_end, release_id and category_ids. Stored as a single Parquet
+    object, so choosing series or checking last_updated costs one GET instead of one API call
+    per series. The catalog is only as fresh as its last crawl, whose time it records (crawled_at).
+    """
+
+    COMPRESSION = "zstd"
+
+    def __init__(self, table) -> None:
+        """
+        Initialize the catalog.
+
+        Args:
+            table: pyarrow.Table with the schema() columns
+        """
+        self.table = table
+        self._rows: Optional[dict] = None
+
+    @staticmethod
+    def schema():
+        import pyarrow as pa
+
+        return pa.schema(
+            [
+                pa.field("series_id", pa.string(), nullable=False),
+                pa.field("title", pa.string()),
+                # Few distinct values across hundreds of thousands of series
+                pa.field("frequency", pa.dictionary(pa.int8(), pa.string())),
+                pa.field("units", pa.dictionary(pa.int32(), pa.string())),
+                pa.field("last_updated", pa.string()),
+                pa.field("observation_end", pa.date32()),
+                pa.field("release_id", pa.int32()),
+                pa.field("category_ids", pa.list_(pa.int32())),
+            ]
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], crawled_at: Optional[datetime.datetime] = None) -> "SeriesCatalog":
+        """
+        Build a catalog from crawled rows, sorted by series_id.
+
+        Args:
+            records: Dictionaries with the schema() fields; missing fields are null
+            crawled_at: When the rows were crawled (default: now)
+
+        Returns:
+            SeriesCatalog
+        """
+        import pyarrow as pa
+
+        crawled_at = crawled_at or datetime.datetime.now(datetime.timezone.utc)
+        rows = sorted(records, key=lambda r: r["series_id"])
+        columns = {field.name: [row.get(field.name) for row in rows] for field in cls.schema()}
+        columns["observation_end"] = [
+            datetime.date.fromisoformat(value) if value else None for value in columns["observation_end"]
+        ]
+        schema = cls.schema().with_metadata({CRAWLED_AT_METADATA: crawled_at.isoformat().encode("utf-8")})
+        return cls(pa.table(columns, schema=schema))
+
+    @property
+    def crawled_at(self) -> Optional[datetime.datetime]:
+        """When the catalog was crawled, or None for catalogs written before the time was recorded."""
+        value = (self.table.schema.metadata or {}).get(CRAWLED_AT_METADATA)
+        return datetime.datetime.fromisoformat(value.decode("utf-8")) if value else None
+
+    def is_stale(self, max_age_seconds: float, now: Optional[datetime.datetime] = None) -> bool:
+        """
+        Whether the catalog was crawled more than max_age_seconds ago.
+
+        Args:
+            max_age_seconds: Oldest crawl still considered current
+            now: Reference time (default: now)
+
+        Returns:
+            True if the catalog is older, or its crawl time is unknown
+        """
+        crawled_at = self.crawled_at
+        if crawled_at is None:
+            return True
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        return (now - crawled_at).total_seconds() > max_age_seconds
+
+    @classmethod
+    def load(cls, s3_client, bucket: str, key: str = CATALOG_KEY) -> Optional["SeriesCatalog"]:
+        """
+        Read the catalog from S3.
+
+        Args:
+            s3_client: boto3 S3 client
+            bucket: Bucket holding the catalog
+            key: Catalog object key (default: fred-state/catalog/series.parquet)
+
+        Returns:
+            SeriesCatalog, or None if no catalog has been written yet
+
+        Raises:
+            ClientError: If the object exists but cannot be read
+        """
+        import pyarrow.parquet as pq
+
+        try:
+            response = s3_client.get_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in MISSING_OBJECT_ERROR_CODES:
+                logger.info(f"[SeriesCatalog][load] No catalog found at s3://{bucket}/{key}")
+                return None
+            raise
+        return cls(pq.read_table(io.BytesIO(response["Body"].read())))
+
+    def save(self, s3_client, bucket: str, key: str = CATALOG_KEY) -> dict:
+        """
+        Write the catalog to S3 as one Parquet object.
+
+        Args:
+            s3_client: boto3 S3 client
+            bucket: Destination bucket
+            key: Catalog object key (default: fred-state/catalog/series.parquet)
+
+        Returns:
+            Dictionary with the object key, series count and object size
+        """
+        import pyarrow.parquet as pq
+
+        buffer = io.BytesIO()
+        pq.write_table(self.table, buffer, compression=self.COMPRESSION)
+        body = buffer.getvalue()
+        s3_client.put_object(Bucket=bucket, Key=key, Body=body, ContentType="application/vnd.apache.parquet")
+        logger.info(f"[SeriesCatalog][save] Wrote {len(self)} series ({len(body)} bytes) to s3://{bucket}/{key}")
+        return {"Key": key, "Series": len(self), "Bytes": len(body)}
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def __contains__(self, series_id: str) -> bool:
+        return series_id in self._index()
+
+    def _index(self) -> dict:
+        if self._rows is None:
+            self._rows = {series_id: row for row, series_id in enumerate(self.table["series_id"].to_pylist())}
+        return self._rows
+
+    def metadata(self, series_id: str) -> Optional[dict]:
+        """
+        Catalog row of a series in the shape of FRED's series metadata.
+
+        Args:
+            series_id: FRED series identifier
+
+        Returns:
+            Dictionary with id, title, frequency_short, units, last_updated and observation_end,
+            or None if the series is not in the catalog
+        """
+        row = self._index().get(series_id)
+        if row is None:
+            return None
+        values = self.table.slice(row, 1).to_pylist()[0]
+        observation_end = values["observation_end"]
+        return {
+            "id": series_id,
+            "title": values["title"],
+            "frequency_short": values["frequency"],
+            "units": values["units"],
+            "last_updated": values["last_updated"],
+            "observation_end": observation_end.isoformat() if observation_end else None,
+        }
+
+    def select(
+        self,
+        frequency: Optional[str] = None,
+        release_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        title: Optional[str] = None,
+        units: Optional[str] = None,
+        updated_since: Optional[str] = None,
+    ) -> list:
+        """
+        Series IDs matching every given filter.
+
+        Example:
+            catalog.select(frequency="D", release_id=51)
+
+        Args:
+            frequency: FRED short frequency code, e.g. "D", "W", "M"
+            release_id: FRED release the series belongs to
+            category_id: FRED category the series is listed in
+            title: Case-insensitive substring of the title
+            units: Exact units, e.g. "Percent"
+            updated_since: Only series whose last_updated is at or after this ISO 8601 time
+
+        Returns:
+            Sorted list of series IDs
+        """
+        import pyarrow.compute as pc
+
+        table = self.table
+        if frequency is not None:
+            table = table.filter(pc.equal(table["frequency"].cast("string"), frequency))
+        if release_id is not None:
+            table = table.filter(pc.equal(table["release_id"], release_id))
+        if category_id is not None:
+            table = table.take(_rows_in_category(table, category_id))
+        if title is not None:
+            table = table.filter(pc.match_substring(table["title"], title, ignore_case=True))
+        if units is not None:
+            table = table.filter(pc.equal(table["units"].cast("string"), units))
+
+        series_ids = table["series_id"].to_pylist()
+        if updated_since is not None:
+            since = parse_datetime(updated_since)
+            last_updated = table["last_updated"].to_pylist()
+            # FRED's last_updated, e.g. '2022-07-21 07:01:22-05', is ISO 8601 with an hour-only offset
+            series_ids = [
+                series_id
+                for series_id, updated in zip(series_ids, last_updated, strict=True)
+                if updated and parse_datetime(updated) >= since
+            ]
+        return series_ids
+
+
+def _rows_in_category(table, category_id: int):
+    """Indices of the rows whose category_ids contain category_id, in row order."""
+    import pyarrow.compute as pc
+
+    column = table["category_ids"]
+    matches = pc.equal(pc.list_flatten(column), category_id)
+    return pc.unique(pc.filter(pc.list_parent_indices(column), matches))
+
+
+class CatalogCrawler:
+    """
+    Builds a SeriesCatalog from FRED's release, category and series endpoints.
+
+    Listings are paged concurrently on a bounded thread pool; every request goes through the
+    shared FredClient, so the crawl stays under the per-key rate limit however many workers run.
+    """
+
+    API_TIMEOUT = 60
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(
+        self, api_key: str, fred_client: Optional[FredClient] = None, max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> None:
+        """
+        Initialize the crawler.
+
+        Args:
+            api_key: FRED API key
+            fred_client: Shared FRED HTTP client (default: a new client sized to max_workers)
+            max_workers: Requests in flight at once (default: 8)
+
+        Raises:
+            ValueError: If max_workers is less than 1
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.api_key = api_key
+        self.fred_client = fred_client or FredClient(pool_size=max_workers)
+        self.max_workers = max_workers
+
+    def _get(self, path: str, params: dict) -> dict:
+        """
+        One FRED API request.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        response = self.fred_client.get(
+            url=f"{API_URL}/{path}",
+            params={**params, "api_key": self.api_key, "file_type": "json"},
+            timeout=self.API_TIMEOUT,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _map(self, function, items: list) -> list:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(function, items))
+
+    def _list_all(self, listings: list, field: str) -> list:
+        """
+        Fetch every page of several listings.
+
+        The first page of each listing is fetched first; its count tells how many pages remain,
+        and all remaining pages of all listings are then fetched together.
+
+        Args:
+            listings: (path, params) tuples
+            field: Response field holding the items, e.g. "seriess"
+
+        Returns:
+            List of item lists, one per listing, in listing order
+        """
+
+        def page(request):
+            path, params, offset = request
+            return self._get(path, {**params, "limit": PAGE_LIMIT, "offset": offset})
+
+        first_pages = self._map(page, [(path, params, 0) for path, params in listings])
+        remaining = [
+            (index, (path, params, offset))
+            for index, ((path, params), first) in enumerate(zip(listings, first_pages, strict=True))
+            for offset in range(PAGE_LIMIT, int(first.get("count", 0)), PAGE_LIMIT)
+        ]
+        pages = self._map(page, [request for _, request in remaining])
+
+        items = [list(first.get(field, [])) for first in first_pages]
+        for (index, _), data in zip(remaining, pages, strict=True):
+            items[index].extend(data.get(field, []))
+        return items
+
+    def release_ids(self) -> list:
+        """IDs of every FRED release."""
+        [releases] = self._list_all([("releases", {})], "releases")
+        return [release["id"] for release in releases]
+
+    def category_tree(self, category_ids: Iterable[int] = (ROOT_CATEGORY_ID,)) -> list:
+        """
+        The given categories and all their descendants, fetched one tree level at a time.
+
+        Args:
+            category_ids: Top categories (default: the root category)
+
+        Returns:
+            Category IDs
+        """
+        seen = list(dict.fromkeys(category_ids))
+        level = list(seen)
+        while level:
+            children = self._map(lambda c: self._get("category/children", {"category_id": c}), level)
+            level = [
+                child["id"] for data in children for child in data.get("categories", []) if child["id"] not in seen
+            ]
+            level = list(dict.fromkeys(level))
+            seen.extend(level)
+        return seen
+
+    def crawl(
+        self,
+        release_ids: Optional[Iterable[int]] = None,
+        category_ids: Optional[Iterable[int]] = None,
+        series_ids: Optional[Iterable[str]] = None,
+    ) -> SeriesCatalog:
+        """
+        Crawl series metadata into a catalog.
+
+        With no arguments every release is crawled, which covers every series FRED publishes.
+        Categories (with their descendants) add category_ids to the rows; individual series
+        are looked up through the series endpoint.
+
+        Args:
+            release_ids: Releases to crawl (default: all, unless categories or series are given)
+            category_ids: Categories whose trees are crawled (default: none)
+            series_ids: Individual series to add (default: none)
+
+        Returns:
+            SeriesCatalog
+
+        Raises:
+            requests.exceptions.RequestException: If a request fails
+        """
+        if release_ids is None and category_ids is None and series_ids is None:
+            release_ids = self.release_ids()
+
+        rows = {}
+
+        def add(series: dict, **fields) -> dict:
+            row = rows.setdefault(
+                series["id"],
+                {
+                    "series_id": series["id"],
+                    "title": series.get("title"),
+                    "frequency": series.get("frequency_short"),
+                    "units": series.get("units"),
+                    "last_updated": series.get("last_updated"),
+                    "observation_end": series.get("observation_end"),
+                    "release_id": None,
+                    "category_ids": [],
+                },
+            )
+            row.update(fields)
+            return row
+
+        release_ids = list(release_ids or [])
+        for release_id, series in zip(
+            release_ids,
+            self._list_all([("release/series", {"release_id": r}) for r in release_ids], "seriess"),
+            strict=True,
+        ):
+            for item in series:
+                add(item, release_id=release_id)
+
+        categories = self.category_tree(category_ids) if category_ids is not None else []
+        for category_id, series in zip(
+            categories,
+            self._list_all([("category/series", {"category_id": c}) for c in categories], "seriess"),
+            strict=True,
+        ):
+            for item in series:
+                add(item)["category_ids"].append(category_id)
+
+        lookups = self._map(lambda s: self._get("series", {"series_id": s}), list(dict.fromkeys(series_ids or [])))
+        for data in lookups:
+            for item in data.get("seriess", []):
+                add(item)
+
+        logger.info(
+            f"[CatalogCrawler][crawl] Catalogued {len(rows)} series from {len(release_ids)} releases "
+            f"and {len(categories)} categories"
+        )
+        return SeriesCatalog.from_records(rows.values())
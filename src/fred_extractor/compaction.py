@@ -0,0 +1,239 @@
+import hashlib
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Optional
+
+from .manifest import update_manifest
+from .serializers import decode_response, get_serializer, object_extensions
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# S3 DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+# Regex alternation of every extension a stored object can be written with (json, ndjson.zst, parquet, ...)
+OBJECT_EXTENSIONS = "|".join(re.escape(extension) for extension in object_extensions())
+
+
+def partition_prefix(series_id: str, year: int, month: int) -> str:
+    """Key prefix of one monthly partition, e.g. fred/SP500/year=2022/month=07/."""
+    return f"fred/{series_id}/year={year:04d}/month={month:02d}/"
+
+
+def compacted_object_key(series_id: str, year: int, month: int, extension: str = "json") -> str:
+    """
+    Key of the compacted object of a monthly partition.
+
+    Example:
+        fred/SP500/year=2022/month=07/SP500-2022-07.json
+    """
+    return f"{partition_prefix(series_id, year, month)}{series_id}-{year:04d}-{month:02d}.{extension}"
+
+
+def merge_observations(
+    compacted: Optional[dict], daily_responses: Iterable[dict], revised_responses: Iterable[dict] = ()
+) -> list:
+    """
+    Merge a compacted object with daily objects into one sorted, deduplicated observation list.
+
+    Read rule while compaction runs: the compacted object wins for every date it covers, and
+    daily objects only contribute dates it does not contain yet. Dailies written after the
+    compacted object (a FRED revision or a repair refetch) are passed as revised_responses and
+    win over it. Readers that find both forms in a partition should apply this function rather
+    than concatenating them.
+
+    Args:
+        compacted: Compacted API response for the month, or None
+        daily_responses: Daily API responses from the same partition, older than the compacted object
+        revised_responses: Daily API responses written after the compacted object (default: none)
+
+    Returns:
+        Observations sorted by date with one entry per date
+    """
+    by_date = {}
+    for response in daily_responses:
+        for observation in response.get("observations", []):
+            by_date[observation["date"]] = observation
+
+    if compacted:
+        for observation in compacted.get("observations", []):
+            by_date[observation["date"]] = observation
+
+    for response in revised_responses:
+        for observation in response.get("observations", []):
+            by_date[observation["date"]] = observation
+
+    return [by_date[date] for date in sorted(by_date)]
+
+
+class MonthlyCompactor:
+    """
+    Merges a month of daily FRED objects into one object per series per month.
+
+    Compaction is idempotent: reruns merge whatever daily objects are still present into the
+    existing compacted object, and a partition that only holds the compacted object is left alone.
+    Dailies written after the compacted object (LastModified) are revisions and replace its values.
+
+    The compacted object is written in the same format as the dailies, so a Glue table over fred/
+    reads it with the same SerDe. Each date is only stored once when delete_daily is set.
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(
+        self,
+        s3_client,
+        bucket: str,
+        delete_daily: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        output_format: str = "json",
+        compression: Optional[str] = None,
+    ):
+        """
+        Initialize the compactor.
+
+        Args:
+            s3_client: boto3 S3 client
+            bucket: Bucket holding the fred/ data
+            delete_daily: Delete daily objects once the compacted object is written (default: False)
+            max_workers: Upper bound on partitions compacted concurrently (default: 8)
+            output_format: Format the dailies are written in, see FredExtractor (default: json)
+            compression: Compression the dailies are written with, "gzip" or "zstd" (default: None)
+
+        Raises:
+            ValueError: If the output format or compression is not supported
+        """
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.delete_daily = delete_daily
+        self.max_workers = max_workers
+        self.serializer = get_serializer(output_format, compression)
+
+    def compacted_key(self, series_id: str, year: int, month: int) -> str:
+        """Key this compactor writes the compacted object of a monthly partition to."""
+        return compacted_object_key(series_id, year, month, self.serializer.EXTENSION)
+
+    def _list_objects(self, prefix: str) -> dict:
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        return {
+            obj["Key"]: obj["LastModified"]
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        }
+
+    def _read(self, key: str) -> dict:
+        return decode_response(key, self.s3_client.get_object(Bucket=self.bucket, Key=key)["Body"].read())
+
+    def _delete(self, keys: list) -> None:
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start : start + DELETE_BATCH_SIZE]
+            self.s3_client.delete_objects(
+                Bucket=self.bucket, Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+            )
+
+    def compact(self, series_id: str, year: int, month: int) -> dict:
+        """
+        Compact one monthly partition.
+
+        Args:
+            series_id: FRED series identifier
+            year: Partition year
+            month: Partition month
+
+        Returns:
+            Dictionary with the compacted key and counts of merged and deleted daily objects
+        """
+        compacted_key = self.compacted_key(series_id, year, month)
+        prefix = partition_prefix(series_id, year, month)
+        name = rf"/{re.escape(series_id)}-{year:04d}-{month:02d}"
+        daily_pattern = re.compile(rf"{name}-\d{{2}}\.({OBJECT_EXTENSIONS})$")
+        compacted_pattern = re.compile(rf"{name}\.({OBJECT_EXTENSIONS})$")
+
+        objects = self._list_objects(prefix)
+        daily_keys = sorted(key for key in objects if daily_pattern.search(key))
+        # Compacted objects written before the output format changed are merged into the new one, oldest first
+        compacted_keys = sorted((key for key in objects if compacted_pattern.search(key)), key=objects.get)
+        compacted_modified = max((objects[key] for key in compacted_keys), default=None)
+
+        skipped = sorted(set(objects) - set(daily_keys) - set(compacted_keys))
+        if skipped:
+            logger.warning(
+                f"[MonthlyCompactor][compact] Skipping objects under {prefix} not in a known format: {skipped}"
+            )
+
+        result = {"Key": compacted_key, "DailyObjectsMerged": 0, "DailyObjectsDeleted": 0, "Observations": 0}
+
+        if not daily_keys and compacted_keys in ([], [compacted_key]):
+            logger.info(f"[MonthlyCompactor][compact] Nothing to compact under {prefix}")
+            return result
+
+        compacted = None
+        if compacted_keys:
+            compacted = {
+                **self._read(compacted_keys[-1]),
+                "observations": merge_observations(None, [], [self._read(key) for key in compacted_keys]),
+            }
+        # LastModified has one-second resolution, so a daily written in the compaction's second counts as revised
+        revised_keys = {key for key in daily_keys if compacted_modified and objects[key] >= compacted_modified}
+        daily_responses = {key: self._read(key) for key in daily_keys}
+        observations = merge_observations(
+            compacted,
+            [response for key, response in daily_responses.items() if key not in revised_keys],
+            [response for key, response in daily_responses.items() if key in revised_keys],
+        )
+
+        template = compacted or daily_responses[daily_keys[-1]]
+        payload = {
+            **{key: value for key, value in template.items() if key != "observations"},
+            "observation_start": observations[0]["date"] if observations else None,
+            "observation_end": observations[-1]["date"] if observations else None,
+            "count": len(observations),
+            "offset": 0,
+            "observations": observations,
+        }
+
+        body = self.serializer.serialize(payload)
+        put_kwargs = {"ContentType": self.serializer.CONTENT_TYPE}
+        if self.serializer.CONTENT_ENCODING:
+            put_kwargs["ContentEncoding"] = self.serializer.CONTENT_ENCODING
+        self.s3_client.put_object(Bucket=self.bucket, Key=compacted_key, Body=body, **put_kwargs)
+        result.update(DailyObjectsMerged=len(daily_keys), Observations=len(observations))
+
+        # Point the manifest at the compacted object, which now wins for every date it holds
+        entry = {"key": compacted_key, "size": len(body), "sha256": hashlib.sha256(body).hexdigest()}
+        update_manifest(self.s3_client, self.bucket, series_id, [{"date": o["date"], **entry} for o in observations])
+
+        # Superseded compacted objects would duplicate every date in the partition, so they always go
+        self._delete([key for key in compacted_keys if key != compacted_key])
+        # Dailies are only removed after the compacted object holding their data is written
+        if self.delete_daily:
+            self._delete(daily_keys)
+            result["DailyObjectsDeleted"] = len(daily_keys)
+
+        logger.info(
+            f"[MonthlyCompactor][compact] Compacted {len(daily_keys)} daily objects into s3://{self.bucket}/{compacted_key}"
+        )
+        return result
+
+    def compact_many(self, partitions: Iterable[tuple]) -> dict:
+        """
+        Compact many (series_id, year, month) partitions in parallel.
+
+        Args:
+            partitions: Iterable of (series_id, year, month) tuples
+
+        Returns:
+            Dictionary mapping each compacted key to its result, or to an error entry
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.compact, *partition): partition for partition in set(partitions)}
+            for future in as_completed(futures):
+                key = self.compacted_key(*futures[future])
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    logger.error(f"[MonthlyCompactor][compact_many] Failed to compact {key}: {e}", exc_info=True)
+                    results[key] = {"Key": key, "Error": str(e)}
+        return results
@@ -0,0 +1,60 @@
+import datetime
+from typing import Union
+
+DateLike = Union[str, datetime.date]
+
+
+def parse_datetime(value: DateLike) -> datetime.datetime:
+    """
+    Parse an ISO 8601 string, date or datetime into a timezone-aware datetime.
+
+    Values without an offset are taken as UTC, so '2022-07-21' and '2022-07-22T00:00:00Z' compare
+    cleanly. Standard library only: pendulum costs noticeable import time on every cold start.
+
+    Args:
+        value: ISO 8601 string, date or datetime
+
+    Returns:
+        Timezone-aware datetime
+
+    Raises:
+        ValueError: If the string is not ISO 8601
+    """
+    if isinstance(value, datetime.datetime):
+        parsed = value
+    elif isinstance(value, datetime.date):
+        parsed = datetime.datetime(value.year, value.month, value.day)
+    else:
+        parsed = datetime.datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)
+
+
+def to_date(value: DateLike) -> datetime.date:
+    """
+    Calendar date of an ISO 8601 string, date or datetime.
+
+    Args:
+        value: ISO 8601 string, date or datetime
+
+    Returns:
+        Date
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return parse_datetime(value).date()
+
+
+def previous_month(value: DateLike) -> tuple:
+    """
+    (year, month) of the month before the given date.
+
+    Args:
+        value: ISO 8601 string, date or datetime
+
+    Returns:
+        (year, month) tuple
+    """
+    last_day = to_date(value).replace(day=1) - datetime.timedelta(days=1)
+    return last_day.year, last_day.month
@@ -0,0 +1,391 @@
+import logging
+import random
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; callers block
+    in `acquire` until enough tokens are available.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+            clock: Monotonic clock, injectable for tests
+            sleep: Sleep function, injectable for tests
+
+        Raises:
+            ValueError: If rate or capacity is not positive
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Token bucket rate and capacity must be positive")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket if they are available, without blocking.
+
+        Args:
+            tokens: Number of tokens to take (default: 1)
+
+        Returns:
+            0.0 if the tokens were taken, otherwise the seconds until they will be available
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket, blocking until they are available.
+
+        Args:
+            tokens: Number of tokens to take (default: 1)
+
+        Returns:
+            Total seconds spent waiting for tokens
+        """
+        waited = 0.0
+        while (wait := self.try_acquire(tokens)) > 0:
+            self._sleep(wait)
+            waited += wait
+        return waited
+
+
+class ApiKeyPool:
+    """
+    Spreads FRED requests across several API keys, each with its own rate budget.
+
+    Keys are handed out round-robin, skipping keys whose token bucket is empty, so aggregate
+    throughput grows with the number of keys. A key that was throttled or rejected is benched:
+    it is skipped until its bench time is over.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str],
+        requests_per_minute: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Initialize the key pool.
+
+        Args:
+            keys: FRED API keys; duplicates are dropped
+            requests_per_minute: Sustained request rate allowed for each key
+            burst: Requests each key may send back-to-back before throttling
+            clock: Monotonic clock, injectable for tests
+            sleep: Sleep function, injectable for tests
+
+        Raises:
+            ValueError: If no keys are given
+        """
+        self.keys = tuple(dict.fromkeys(key for key in keys if key))
+        if not self.keys:
+            raise ValueError("At least one API key is required")
+
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets = {
+            key: TokenBucket(rate=requests_per_minute / 60, capacity=burst, clock=clock, sleep=sleep)
+            for key in self.keys
+        }
+        self._benched_until = dict.fromkeys(self.keys, 0.0)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def available(self) -> int:
+        """Number of keys that are not benched."""
+        now = self._clock()
+        with self._lock:
+            return sum(1 for until in self._benched_until.values() if until <= now)
+
+    def bench(self, key: str, seconds: float) -> None:
+        """Skip key for the next seconds; a longer bench already in place is kept."""
+        with self._lock:
+            if key in self._benched_until:
+                self._benched_until[key] = max(self._benched_until[key], self._clock() + seconds)
+
+    def _try_acquire(self) -> tuple:
+        """(key, 0.0) for the next key with a token, or (None, seconds until one may have)."""
+        now = self._clock()
+        with self._lock:
+            wait = None
+            for offset in range(len(self.keys)):
+                index = (self._next + offset) % len(self.keys)
+                key = self.keys[index]
+                if self._benched_until[key] > now:
+                    key_wait = self._benched_until[key] - now
+                else:
+                    key_wait = self._buckets[key].try_acquire()
+                    if key_wait == 0:
+                        self._next = index + 1
+                        return key, 0.0
+                wait = key_wait if wait is None else min(wait, key_wait)
+            return None, wait
+
+    def acquire(self) -> tuple:
+        """
+        Take a token from the next key in round-robin order, blocking until one has a token.
+
+        Returns:
+            (key, seconds spent waiting)
+        """
+        waited = 0.0
+        while True:
+            key, wait = self._try_acquire()
+            if key is not None:
+                return key, waited
+            self._sleep(wait)
+            waited += wait
+
+
+class FredClient:
+    """
+    Reusable HTTP client for the FRED API.
+
+    Keeps connections alive through a pooled requests session, shares one token bucket
+    across threads to stay under the per-key rate limit, and retries 429 and 5xx
+    responses with exponential backoff and full jitter. With several API keys (see
+    use_api_keys) the api_key parameter of each request is taken from an ApiKeyPool
+    instead, and throttled or rejected keys are benched and retried on another key.
+    """
+
+    DEFAULT_REQUESTS_PER_MINUTE = 120
+    DEFAULT_BURST = 10
+    DEFAULT_POOL_SIZE = 32
+    MAX_RETRIES = 5
+    BACKOFF_BASE = 0.5
+    BACKOFF_CAP = 30.0
+
+    # Keys FRED throttled sit out this long unless Retry-After says otherwise; rejected keys much longer
+    THROTTLED_KEY_BENCH_SECONDS = 60.0
+    INVALID_KEY_BENCH_SECONDS = 900.0
+
+    HTTP_TOO_MANY_REQUESTS = 429
+    HTTP_BAD_REQUEST = 400
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        burst: float = DEFAULT_BURST,
+        max_retries: int = MAX_RETRIES,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        sleep: Callable[[float], None] = time.sleep,
+        rate_limiter: Optional[TokenBucket] = None,
+    ) -> None:
+        """
+        Initialize the FRED client.
+
+        Args:
+            requests_per_minute: Sustained request rate allowed for the API key (default: 120)
+            burst: Requests that may be sent back-to-back before throttling (default: 10)
+            max_retries: Retries for 429/5xx responses before giving up (default: 5)
+            pool_size: Maximum pooled connections, should cover the worker count (default: 32)
+            sleep: Sleep function used for backoff, injectable for tests
+            rate_limiter: Shared token bucket (default: one built from requests_per_minute and burst);
+                with several API keys each key gets its own bucket instead
+        """
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.max_retries = max_retries
+        self._sleep = sleep
+        self.rate_limiter = rate_limiter or TokenBucket(rate=requests_per_minute / 60, capacity=burst, sleep=sleep)
+        self.key_pool: Optional[ApiKeyPool] = None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "retries": 0,
+            "throttle_waits": 0,
+            "throttle_wait_seconds": 0.0,
+            "keys_benched": 0,
+        }
+
+    @property
+    def stats(self) -> dict:
+        """Snapshot of request, retry and throttle counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _record(self, **increments) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+    def use_api_keys(self, keys: Iterable[str]) -> None:
+        """
+        Spread requests across several API keys, each with its own requests_per_minute budget.
+
+        Calling it again with the same keys keeps the pool and its budgets; with a single key
+        the pool is dropped and the shared rate limiter applies again.
+
+        Args:
+            keys: FRED API keys
+        """
+        keys = tuple(dict.fromkeys(key for key in keys if key))
+        if len(keys) < 2:
+            self.key_pool = None
+        elif self.key_pool is None or self.key_pool.keys != keys:
+            self.key_pool = ApiKeyPool(keys, self.requests_per_minute, self.burst, sleep=self._sleep)
+            logger.info(f"[FredClient][use_api_keys] Spreading requests across {len(keys)} API keys")
+
+    def set_requests_per_minute(self, requests_per_minute: float) -> None:
+        """
+        Change the sustained request rate, e.g. to one invocation's share of the per-key limit.
+
+        Calling it again with the same rate keeps the current budget; a new rate starts new token
+        buckets for the shared rate limiter and for every pooled API key.
+
+        Args:
+            requests_per_minute: Sustained request rate allowed for each API key
+
+        Raises:
+            ValueError: If the rate is not positive
+        """
+        if requests_per_minute == self.requests_per_minute:
+            return
+        self.rate_limiter = TokenBucket(rate=requests_per_minute / 60, capacity=self.burst, sleep=self._sleep)
+        self.requests_per_minute = requests_per_minute
+        if self.key_pool is not None:
+            self.key_pool = ApiKeyPool(self.key_pool.keys, requests_per_minute, self.burst, sleep=self._sleep)
+        logger.info(f"[FredClient][set_requests_per_minute] Limiting requests to {requests_per_minute:g}/min")
+
+    @classmethod
+    def is_invalid_api_key_response(cls, response: requests.Response) -> bool:
+        """Whether FRED rejected the request because of the api_key parameter."""
+        if response.status_code != cls.HTTP_BAD_REQUEST:
+            return False
+        try:
+            message = response.json().get("error_message", "")
+        except ValueError:
+            return False
+        return "api_key" in message
+
+    def _bench_key(self, pool: ApiKeyPool, key: str, attempt: int, response: requests.Response) -> bool:
+        """Bench a throttled or rejected key; True when another key can take the retry right away."""
+        if response.status_code == self.HTTP_TOO_MANY_REQUESTS:
+            retry_after = response.headers.get("Retry-After")
+            seconds = self._backoff(attempt, response) if retry_after is not None else self.THROTTLED_KEY_BENCH_SECONDS
+        elif self.is_invalid_api_key_response(response):
+            seconds = self.INVALID_KEY_BENCH_SECONDS
+        else:
+            return False
+
+        pool.bench(key, seconds)
+        self._record(keys_benched=1)
+        logger.warning(f"[FredClient][get] HTTP {response.status_code}, API key benched for {seconds:.0f}s")
+        return pool.available() > 0
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Seconds to wait before the next attempt, honouring Retry-After when FRED sends it."""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is not None:
+            try:
+                return min(self.BACKOFF_CAP, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2**attempt))  # noqa: S311
+
+    def get(
+        self, url: str, params: dict, timeout: float, headers: Optional[dict] = None, stream: bool = False
+    ) -> requests.Response:
+        """
+        Send a rate-limited GET request, retrying 429 and 5xx responses.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            timeout: Request timeout in seconds
+            headers: Extra request headers, e.g. conditional request validators (default: none)
+            stream: Leave the body unread so it can be consumed incrementally (default: False)
+
+        Returns:
+            The final response; callers are responsible for raise_for_status()
+        """
+        extra = {"headers": headers} if headers else {}
+        if stream:
+            extra["stream"] = True
+        pool = self.key_pool if "api_key" in params else None
+        attempt = 0
+        while True:
+            if pool is not None:
+                key, waited = pool.acquire()
+                params = {**params, "api_key": key}
+            else:
+                waited = self.rate_limiter.acquire()
+            if waited > 0:
+                self._record(throttle_waits=1, throttle_wait_seconds=waited)
+
+            self._record(requests=1)
+            response = self.session.get(url=url, params=params, timeout=timeout, **extra)
+
+            if pool is not None and attempt < self.max_retries and self._bench_key(pool, key, attempt, response):
+                # Another key takes the retry without backing off
+                response.close()
+                attempt += 1
+                self._record(retries=1)
+                continue
+            if response.status_code not in self.RETRY_STATUS_CODES or attempt >= self.max_retries:
+                return response
+
+            delay = self._backoff(attempt, response)
+            # Release the connection of a streamed response that will not be read
+            response.close()
+            attempt += 1
+            self._record(retries=1)
+            logger.warning(
+                f"[FredClient][get] HTTP {response.status_code}, retry {attempt}/{self.max_retries} in {delay:.2f}s"
+            )
+            self._sleep(delay)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
@@ -1,12 +1,31 @@
+import datetime
+import hashlib
 import json
 import logging
-from typing import Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
 
 import boto3
-import pendulum
 import requests
 from botocore.exceptions import ClientError
-from toolz import pipe
+
+from . import aws_cache
+from .dates import DateLike, parse_datetime, to_date
+from .fred_client import FredClient
+from .gaps import DEFAULT_MAX_BRIDGE, GapScanner
+from .manifest import load_manifest, update_manifest
+from .metrics import MetricsLogger
+from .s3_upload import DEFAULT_PART_SIZE, upload_stream
+from .serializers import get_serializer
+from .streaming import READ_SIZE, ObservationStream, validate_observations
+from .vintages import DEFAULT_CHECKPOINT_INTERVAL, EARLIEST_REALTIME, LATEST_REALTIME, VintageStore
+from .watermark import MISSING_OBJECT_ERROR_CODES, load_watermark, save_watermark
+
+if TYPE_CHECKING:
+    # Only annotates the cache argument; the handler imports the module when caching is on
+    from .response_cache import ResponseCache
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -19,14 +38,27 @@ class FredExtractor:
     """
 
     API_URL = "https://api.stlouisfed.org/fred/series/observations"
+    SERIES_URL = "https://api.stlouisfed.org/fred/series"
     API_TIMEOUT = 180
     DEFAULT_SERIES_ID = "SP500"
 
     SECRET_NAME = "dev/FredExtractor/APIKey"  # noqa: S105
     SECRET_KEY = "fred-api-key"  # noqa: S105
+    # Optional list of further keys; requests are spread across all of them (see FredClient.use_api_keys)
+    SECRET_KEYS = "fred-api-keys"  # noqa: S105
+
+    DEFAULT_OUTPUT_FORMAT = "json"
+    MULTIPART_PART_SIZE = DEFAULT_PART_SIZE
+    API_PAGE_LIMIT = 100000
+    # Object metadata key (x-amz-meta-content-sha256) holding the hash of the normalized payload
+    CONTENT_HASH_METADATA = "content-sha256"
+    BACKFILL_MAX_WORKERS = 16
 
     HTTP_OK = 200
     HTTP_NO_CONTENT = 204
+    HTTP_NOT_MODIFIED = 304
+    HTTP_BAD_REQUEST = 400
+    HTTP_NOT_FOUND = 404
 
     def __init__(
         self,
@@ -35,6 +67,15 @@ class FredExtractor:
         session: boto3.Session,
         bucket: str,
         series_id: str = DEFAULT_SERIES_ID,
+        api_key: Optional[str] = None,
+        fred_client: Optional[FredClient] = None,
+        s3_client=None,
+        output_format: str = DEFAULT_OUTPUT_FORMAT,
+        compression: Optional[str] = None,
+        response_cache: Optional["ResponseCache"] = None,
+        metrics: Optional[MetricsLogger] = None,
+        stream_chunk_size: Optional[int] = None,
+        aggregate_frequencies: Optional[Iterable[str]] = None,
     ) -> None:
         """
         Initialize the FRED data extractor.
@@ -45,19 +86,37 @@ class FredExtractor:
             session: Boto3 session for AWS service access
             bucket: S3 bucket name for data storage
             series_id: FRED series identifier (default: SP500)
+            api_key: Pre-fetched FRED API key, skips the Secrets Manager lookup when provided
+            fred_client: Shared FRED HTTP client (default: a new client for this extractor)
+            s3_client: Shared S3 client (default: created lazily from the session)
+            output_format: Object format: "json", "json-compact", "ndjson" or "parquet" (default: json)
+            compression: Optional "gzip" or "zstd" compression for non-Parquet formats (default: None)
+            response_cache: Cache for observations responses, reused across runs (default: no cache)
+            metrics: EMF metrics logger for per-stage timings and counts (default: one writing to stdout)
+            stream_chunk_size: Parse observations responses incrementally and store backfills in chunks of
+                this many observations, bypassing the response cache (default: parse whole responses)
+            aggregate_frequencies: Rollup frequencies ("W", "M", "Q") updated under fred-agg/ after new
+                data is stored (default: no rollups)
 
         Raises:
-            ValueError: If required event data is missing
+            ValueError: If required event data is missing or the output format is unsupported
         """
         self._validate_event(event)
+        self.serializer = get_serializer(output_format, compression)
 
         self.event = event
         self.context = context
         self.session = session
         self.bucket = bucket
         self.series_id = series_id
-        self._observation_date: Optional[pendulum.DateTime] = None
-        self._api_key: Optional[str] = None
+        self._observation_date: Optional[datetime.datetime] = None
+        self._api_key: Optional[str] = api_key
+        self._fred_client = fred_client
+        self._s3_client = s3_client
+        self.response_cache = response_cache
+        self.metrics = metrics or MetricsLogger()
+        self.stream_chunk_size = stream_chunk_size
+        self.aggregate_frequencies = tuple(aggregate_frequencies or ())
 
     @staticmethod
     def _validate_event(event: dict) -> None:
@@ -66,17 +125,31 @@ class FredExtractor:
             raise ValueError("Event must contain 'time' field")
 
     @property
-    def observation_date(self) -> pendulum.DateTime:
+    def fred_client(self) -> FredClient:
+        """Lazily create the FRED client unless a shared one was provided."""
+        if self._fred_client is None:
+            self._fred_client = FredClient()
+        return self._fred_client
+
+    @property
+    def s3_client(self):
+        """Return the shared S3 client, falling back to the process-wide client cache."""
+        if self._s3_client is None:
+            self._s3_client = aws_cache.get_client(self.session, "s3")
+        return self._s3_client
+
+    @property
+    def observation_date(self) -> datetime.datetime:
         """
         Lazily compute and cache the observation date from the event.
         The observation date is one day before the event time.
 
         Returns:
-            Observation date as pendulum DateTime
+            Observation date as a timezone-aware datetime
         """
         if self._observation_date is None:
-            event_datetime = pendulum.parse(self.event["time"])
-            self._observation_date = event_datetime.subtract(days=1)
+            event_datetime = parse_datetime(self.event["time"])
+            self._observation_date = event_datetime - datetime.timedelta(days=1)
         return self._observation_date
 
     def execute(self) -> dict:
@@ -89,10 +162,13 @@ class FredExtractor:
         Raises:
             Exception: If any step in the pipeline fails
         """
+        # toolz is only needed here; importing it lazily keeps it off the cold-start path
+        from toolz import pipe
+
         try:
             logger.info(
                 f"[FredExtractor][execute] Starting extraction for series: {self.series_id}, "
-                f"observation date: {self.observation_date.to_date_string()}"
+                f"observation date: {self.observation_date.date().isoformat()}"
             )
 
             response = pipe(
@@ -100,6 +176,10 @@ class FredExtractor:
                 self.request_fred_data,
                 self.store_fred_data_in_s3,
             )
+            if self.aggregate_frequencies and response["HTTPStatusCode"] == self.HTTP_OK:
+                if not response.get("ObjectsSkipped"):
+                    date = self.observation_date.date()
+                    response["PeriodsUpdated"] = self.aggregate(date, date)
 
             logger.info("[FredExtractor][execute] Extraction completed successfully")
             return response
@@ -124,10 +204,10 @@ class FredExtractor:
         """
         logger.info(
             f"[FredExtractor][request_fred_data] Requesting data for {self.series_id} "
-            f"on {self.observation_date.to_date_string()}"
+            f"on {self.observation_date.date().isoformat()}"
         )
 
-        observation_date_string = self.observation_date.format("YYYY-MM-DD")
+        observation_date_string = self.observation_date.date().isoformat()
         params = {
             "series_id": self.series_id,
             "frequency": "d",
@@ -137,15 +217,320 @@ class FredExtractor:
             "file_type": "json",
         }
 
+        with self.metrics.stage(self.series_id, "request_fred_data") as stage, self._request_counters(stage):
+            data = self._get_observations(params)
+            stage["Observations"] = len(data.get("observations", []))
+        logger.info(f"[FredExtractor][request_fred_data] Received {len(data.get('observations', []))} observations")
+        return data
+
+    def request_fred_data_range(self, api_key: str, start_date: datetime.date, end_date: datetime.date) -> dict:
+        """
+        Request every observation between two dates, paging with limit/offset when needed.
+
+        Args:
+            api_key: FRED API key for authentication
+            start_date: First observation date (inclusive)
+            end_date: Last observation date (inclusive)
+
+        Returns:
+            API response dictionary whose 'observations' holds every page
+
+        Raises:
+            requests.exceptions.RequestException: If an API request fails
+            ValueError: If an API response is invalid
+        """
+        logger.info(
+            f"[FredExtractor][request_fred_data_range] Requesting data for {self.series_id} "
+            f"from {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}"
+        )
+
+        params = self._range_params(api_key, start_date, end_date)
+        data = self._get_all_pages(params, "request_fred_data_range")
+        logger.info(f"[FredExtractor][request_fred_data_range] Received {len(data['observations'])} observations")
+        return data
+
+    def _get_all_pages(self, params: dict, stage_name: str) -> dict:
+        """
+        Perform an observations request and every further page it needs, timed as one metrics stage.
+
+        Args:
+            params: Query parameters for the observations endpoint, including limit and offset
+            stage_name: Metrics stage name
+
+        Returns:
+            API response dictionary whose 'observations' holds every page
+        """
+        with self.metrics.stage(self.series_id, stage_name) as stage, self._request_counters(stage):
+            data = self._get_observations(params)
+            observations = list(data["observations"])
+            total = data.get("count", len(observations))
+            pages = 1
+
+            while len(observations) < total:
+                page = self._get_observations({**params, "offset": len(observations)})
+                if not page["observations"]:
+                    break
+                observations.extend(page["observations"])
+                pages += 1
+
+            stage.update(Observations=len(observations), Pages=pages)
+
+        data["observations"] = observations
+        data["offset"] = 0
+        return data
+
+    def request_vintages(self, api_key: str, realtime_start: DateLike = EARLIEST_REALTIME) -> dict:
+        """
+        Request every real-time period (ALFRED vintage) of the series' observations since realtime_start.
+
+        The series is requested at its native frequency; each observation row carries the
+        realtime_start/realtime_end during which its value was current.
+
+        Args:
+            api_key: FRED API key for authentication
+            realtime_start: First real-time date to include (default: every vintage)
+
+        Returns:
+            API response dictionary whose 'observations' holds every page
+
+        Raises:
+            requests.exceptions.RequestException: If an API request fails
+            ValueError: If an API response is invalid
+        """
+        params = {
+            "series_id": self.series_id,
+            "realtime_start": f"{to_date(realtime_start):%Y-%m-%d}",
+            "realtime_end": LATEST_REALTIME,
+            "api_key": api_key,
+            "file_type": "json",
+            "limit": self.API_PAGE_LIMIT,
+            "offset": 0,
+        }
+        data = self._get_all_pages(params, "request_vintages")
+        logger.info(f"[FredExtractor][request_vintages] Received {len(data['observations'])} real-time periods")
+        return data
+
+    def execute_vintages(self, checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL) -> dict:
+        """
+        Store the series' new ALFRED vintages as revision deltas (see vintages.VintageStore).
+
+        Only real-time periods after the last stored vintage are requested.
+
+        Args:
+            checkpoint_interval: Vintages per delta segment (default: 50)
+
+        Returns:
+            Dictionary with HTTP status code, vintages and deltas added, checkpoints written
+            and the last stored vintage
+
+        Raises:
+            Exception: If any step fails
+        """
         try:
-            response = requests.get(url=self.API_URL, params=params, timeout=self.API_TIMEOUT)
-            response.raise_for_status()
+            api_key = self.retrieve_api_key()
+            store = VintageStore(self.s3_client, self.bucket, checkpoint_interval)
+            last_vintage = (store.load_index(self.series_id) or {}).get("last_vintage")
+            start = datetime.date.fromisoformat(last_vintage) + datetime.timedelta(days=1) if last_vintage else None
+
+            data = self.request_vintages(api_key, start or EARLIEST_REALTIME)
+            with self.metrics.stage(self.series_id, "store_vintages") as stage:
+                summary = store.update(self.series_id, data["observations"])
+                stage.update(Vintages=summary["Vintages"], Deltas=summary["Deltas"])
+
+            status = self.HTTP_OK if summary["Vintages"] else self.HTTP_NO_CONTENT
+            return {"HTTPStatusCode": status, **summary}
+
+        except Exception as e:
+            logger.error(f"[FredExtractor][execute_vintages] Vintage extraction failed: {str(e)}", exc_info=True)
+            raise
+
+    def _range_params(self, api_key: str, start_date: datetime.date, end_date: datetime.date) -> dict:
+        return {
+            "series_id": self.series_id,
+            "frequency": "d",
+            "observation_start": f"{start_date:%Y-%m-%d}",
+            "observation_end": f"{end_date:%Y-%m-%d}",
+            "api_key": api_key,
+            "file_type": "json",
+            "limit": self.API_PAGE_LIMIT,
+            "offset": 0,
+        }
+
+    def iter_fred_data_range(
+        self, api_key: str, start_date: datetime.date, end_date: datetime.date, metadata: Optional[dict] = None
+    ) -> Iterator[list]:
+        """
+        Stream every observation between two dates in chunks of stream_chunk_size, paging as needed.
 
-            data = response.json()
-            self._validate_api_response(data)
+        Each response is parsed incrementally, so memory holds one chunk rather than the whole range.
 
-            logger.info(f"[FredExtractor][request_fred_data] Received {len(data.get('observations', []))} observations")
-            return data
+        Args:
+            api_key: FRED API key for authentication
+            start_date: First observation date (inclusive)
+            end_date: Last observation date (inclusive)
+            metadata: Dictionary filled with the response fields other than observations (default: none)
+
+        Returns:
+            Iterator of observation lists
+
+        Raises:
+            requests.exceptions.RequestException: If an API request fails
+            ValueError: If an API response is invalid
+        """
+        metadata = {} if metadata is None else metadata
+        params = self._range_params(api_key, start_date, end_date)
+        offset = 0
+
+        while True:
+            received = 0
+            for chunk in self._iter_observation_chunks({**params, "offset": offset}, metadata):
+                received += len(chunk)
+                yield chunk
+            offset += received
+            if not received or offset >= metadata.get("count", offset):
+                return
+
+    def _iter_observation_chunks(self, params: dict, metadata: dict) -> Iterator[list]:
+        """
+        Perform one observations request and parse its body incrementally, validating each chunk.
+
+        Args:
+            params: Query parameters for the observations endpoint
+            metadata: Dictionary filled with the response fields other than observations
+
+        Returns:
+            Iterator of observation lists of at most stream_chunk_size
+
+        Raises:
+            requests.exceptions.RequestException: If API request fails
+            ValueError: If API response is invalid
+        """
+        response = self._get_response(self.API_URL, params, stream=True)
+        try:
+            stream = ObservationStream(response.iter_content(READ_SIZE))
+            seen = 0
+            for chunk in stream.chunks(self.stream_chunk_size):
+                validate_observations(chunk, seen)
+                seen += len(chunk)
+                metadata.update(stream.metadata)
+                yield chunk
+            metadata.update(stream.metadata)
+            if not stream.has_observations:
+                raise ValueError("API response missing 'observations' field")
+        finally:
+            response.close()
+
+    @contextmanager
+    def _request_counters(self, stage: dict):
+        """
+        Add the retries, throttle waits and response cache hits/misses of the block to stage metrics.
+
+        The counters belong to the FRED client and response cache, which may be shared; with several
+        series in flight the deltas include the other series' requests.
+        """
+        client_before = self.fred_client.stats
+        cache_before = self.response_cache.stats if self.response_cache else None
+        try:
+            yield
+        finally:
+            client_after = self.fred_client.stats
+            stage["Retries"] = client_after["retries"] - client_before["retries"]
+            stage["ThrottleWaits"] = client_after["throttle_waits"] - client_before["throttle_waits"]
+            if cache_before is not None:
+                cache_after = self.response_cache.stats
+                stage["CacheHits"] = cache_after["hits"] - cache_before["hits"]
+                stage["CacheMisses"] = cache_after["misses"] - cache_before["misses"]
+
+    def _get_observations(self, params: dict) -> dict:
+        """
+        Perform one observations request and validate the response.
+
+        With a response cache, fresh entries are served without a request and stale ones are
+        revalidated with their ETag / Last-Modified validators. Only valid responses with observations
+        are cached: an empty window may just not be published yet, so retries and repairs refetch it.
+
+        Args:
+            params: Query parameters for the observations endpoint
+
+        Returns:
+            API response as dictionary
+
+        Raises:
+            requests.exceptions.RequestException: If API request fails
+            ValueError: If API response is invalid
+        """
+        if self.stream_chunk_size:
+            metadata = {}
+            observations = [o for chunk in self._iter_observation_chunks(params, metadata) for o in chunk]
+            return {**metadata, "observations": observations}
+
+        cache = self.response_cache
+        cached = cache.lookup(self.API_URL, params) if cache else None
+        if cached is not None and cache.is_fresh(cached):
+            return cached["body"]
+
+        headers = cache.revalidation_headers(cached) if cached is not None else None
+        response = self._get_response(self.API_URL, params, headers=headers)
+
+        if cached is not None and response.status_code == self.HTTP_NOT_MODIFIED:
+            return cache.renew(self.API_URL, params, cached)["body"]
+
+        data = response.json()
+        self._validate_api_response(data)
+        if cache and data["observations"]:
+            cache.store(self.API_URL, params, data, response.headers)
+        return data
+
+    def _get_json(self, url: str, params: dict) -> dict:
+        """
+        Perform one FRED API request and decode the JSON response.
+
+        Args:
+            url: FRED endpoint URL
+            params: Query parameters including api_key
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            requests.exceptions.RequestException: If API request fails
+        """
+        return self._get_response(url, params).json()
+
+    def _get_response(
+        self, url: str, params: dict, headers: Optional[dict] = None, stream: bool = False
+    ) -> requests.Response:
+        """
+        Perform one FRED API request, retrying once with a refreshed key if the key was rejected.
+
+        Args:
+            url: FRED endpoint URL
+            params: Query parameters including api_key
+            headers: Extra request headers such as conditional request validators (default: none)
+            stream: Leave the body unread for incremental parsing (default: False)
+
+        Returns:
+            Successful (2xx or 304) response
+
+        Raises:
+            requests.exceptions.RequestException: If API request fails
+        """
+        extra = {"headers": headers} if headers else {}
+        if stream:
+            extra["stream"] = True
+        try:
+            response = self.fred_client.get(url=url, params=params, timeout=self.API_TIMEOUT, **extra)
+
+            if FredClient.is_invalid_api_key_response(response):
+                # The secret may have been rotated since it was cached; refetch once and retry
+                refreshed_key = self.refresh_api_key(params.get("api_key"))
+                if refreshed_key != params.get("api_key"):
+                    logger.warning("[FredExtractor][request_fred_data] API key rejected, retrying with rotated key")
+                    params = {**params, "api_key": refreshed_key}
+                    response = self.fred_client.get(url=url, params=params, timeout=self.API_TIMEOUT, **extra)
+
+            response.raise_for_status()
+            return response
 
         except requests.exceptions.HTTPError as e:
             logger.error(f"[FredExtractor][request_fred_data] HTTP error: {e.response.status_code}")
@@ -181,6 +566,9 @@ class FredExtractor:
         """
         Store FRED API response data in S3 with partitioned structure.
 
+        The stored object is also recorded in the series manifest (see manifest.py), so readers
+        and gap checks can find every stored date with a single GET instead of a prefix listing.
+
         Args:
             api_response: FRED API response containing observations
 
@@ -197,38 +585,464 @@ class FredExtractor:
         if len(observations) == 0:
             logger.warning(
                 f"[FredExtractor][store_fred_data_in_s3] No data available for "
-                f"{self.series_id} on {self.observation_date.to_date_string()}"
+                f"{self.series_id} on {self.observation_date.date().isoformat()}"
             )
             return {"HTTPStatusCode": self.HTTP_NO_CONTENT}
 
+        date = self.observation_date.date().isoformat()
+        object_key = self.generate_s3_object_key()
+        with self.metrics.stage(self.series_id, "store_fred_data_in_s3") as stage:
+            manifest, etag = load_manifest(self.s3_client, self.bucket, self.series_id)
+            stored = manifest["entries"].get(date)
+            response, entry = self._put_object(object_key, api_response, stored)
+            if entry != stored:
+                # The conditional write reuses this read; only a concurrent change costs another GET
+                self._record_in_manifest([{"date": date, **entry}], (manifest, etag))
+
+            if response is None:
+                stage.update(ObjectsWritten=0, ObjectsSkipped=1, Observations=len(observations))
+                return {"HTTPStatusCode": self.HTTP_OK, "ObjectsSkipped": 1}
+            stage.update(ObjectsWritten=1, PayloadBytes=entry["size"], Observations=len(observations))
+        return {"HTTPStatusCode": response["ResponseMetadata"]["HTTPStatusCode"]}
+
+    def _record_in_manifest(self, entries: list, loaded: Optional[tuple] = None) -> None:
+        """
+        Add stored objects to the series manifest in one conditional write.
+
+        Args:
+            entries: Dictionaries with date, key, size and sha256
+            loaded: (manifest, etag) already read by the caller (default: read it again)
+        """
+        update_manifest(self.s3_client, self.bucket, self.series_id, entries, loaded=loaded)
+
+    def content_hash(self, payload: dict) -> str:
+        """
+        SHA-256 of the normalized payload: the object format and every observation date and value.
+
+        FRED stamps each response with the request day's realtime_start/realtime_end, so those
+        and the other response fields are left out; refetching unchanged data gives the same hash.
+
+        Args:
+            payload: API response dictionary
+
+        Returns:
+            Hex digest
+        """
+        digest = hashlib.sha256(f"{self.serializer.FORMAT}:{self.serializer.CONTENT_ENCODING}\n".encode("utf-8"))
+        for observation in payload.get("observations", []):
+            digest.update(f"{observation.get('date')}\t{observation.get('value')}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _holds_content(self, object_key: str, content_hash: str, stored: Optional[dict]) -> bool:
+        """
+        Whether object_key already holds a payload with content_hash.
+
+        The manifest entry answers without a request; entries written before content hashes
+        were recorded fall back to a HEAD of the object's metadata.
+        """
+        if not stored or stored.get("key") != object_key:
+            return False
+        if "content_sha256" in stored:
+            return stored["content_sha256"] == content_hash
         try:
-            client = self.session.client("s3")
-            object_key = self.generate_s3_object_key()
+            head = self.s3_client.head_object(Bucket=self.bucket, Key=object_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in MISSING_OBJECT_ERROR_CODES:
+                return False
+            raise
+        return head.get("Metadata", {}).get(self.CONTENT_HASH_METADATA) == content_hash
+
+    def _put_object(self, object_key: str, payload: dict, stored: Optional[dict] = None) -> tuple:
+        """
+        Serialize a payload with the configured serializer and stream it to S3.
+
+        Large bodies go through a multipart upload in MULTIPART_PART_SIZE parts,
+        so memory use stays bounded regardless of the series length. The upload is skipped when
+        the object already holds the same content (see content_hash), so retries and re-runs do
+        not create new object versions.
+
+        Args:
+            object_key: Destination S3 object key
+            payload: API response dictionary to serialize
+            stored: Manifest entry currently recorded for the object's date (default: none)
+
+        Returns:
+            (response, entry) where response is the raw put_object or complete_multipart_upload
+            response, or None when the upload was skipped, and entry holds the key, size, sha256
+            and content_sha256 of the stored body
+
+        Raises:
+            ClientError: If S3 upload fails
+        """
+        content_hash = self.content_hash(payload)
+        if self._holds_content(object_key, content_hash, stored):
+            logger.info(f"[FredExtractor][store_fred_data_in_s3] s3://{self.bucket}/{object_key} unchanged, skipping")
+            return None, {**stored, "content_sha256": content_hash}
+
+        digest = hashlib.sha256()
+        size = 0
 
-            # Convert to JSON with proper formatting
-            body = json.dumps(api_response, indent=2, ensure_ascii=False)
+        def hashed(chunks):
+            nonlocal size
+            for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                yield chunk
 
-            response = client.put_object(
-                Bucket=self.bucket,
-                Key=object_key,
-                Body=body,
-                ContentType="application/json",
+        try:
+            put_kwargs = {
+                "ContentType": self.serializer.CONTENT_TYPE,
+                "Metadata": {self.CONTENT_HASH_METADATA: content_hash},
+            }
+            if self.serializer.CONTENT_ENCODING:
+                put_kwargs["ContentEncoding"] = self.serializer.CONTENT_ENCODING
+
+            response = upload_stream(
+                self.s3_client,
+                self.bucket,
+                object_key,
+                hashed(self.serializer.iter_chunks(payload)),
+                part_size=self.MULTIPART_PART_SIZE,
+                **put_kwargs,
             )
 
             logger.info(
                 f"[FredExtractor][store_fred_data_in_s3] Successfully saved data to s3://{self.bucket}/{object_key}"
             )
-            return {"HTTPStatusCode": response["ResponseMetadata"]["HTTPStatusCode"]}
+            entry = {"key": object_key, "size": size, "sha256": digest.hexdigest(), "content_sha256": content_hash}
+            return response, entry
 
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "Unknown")
             logger.error(f"[FredExtractor][store_fred_data_in_s3] Failed to upload to S3: {error_code}", exc_info=True)
             raise
 
+    def request_series_metadata(self, api_key: str) -> dict:
+        """
+        Request the series metadata (last_updated, observation_end, ...) from FRED.
+
+        This is a single small response regardless of the series length.
+
+        Args:
+            api_key: FRED API key for authentication
+
+        Returns:
+            Series metadata dictionary
+
+        Raises:
+            requests.exceptions.RequestException: If API request fails
+            ValueError: If the series is not in the response
+        """
+        params = {"series_id": self.series_id, "api_key": api_key, "file_type": "json"}
+        data = self._get_json(self.SERIES_URL, params)
+
+        series = data.get("seriess") if isinstance(data, dict) else None
+        if not series:
+            raise ValueError(f"Series metadata response for '{self.series_id}' contains no series")
+        return series[0]
+
+    def execute_incremental(self, metadata: Optional[dict] = None) -> dict:
+        """
+        Fetch only observations newer than the series watermark.
+
+        The series metadata endpoint is checked first; when FRED has published nothing since
+        the watermark, no observations request is made at all.
+
+        Args:
+            metadata: Series metadata with last_updated and observation_end, e.g. from the series
+                catalog, instead of requesting it from FRED (default: requested)
+
+        Returns:
+            Dictionary with HTTP status code, objects written and the updated watermark
+
+        Raises:
+            Exception: If any step fails
+        """
+        try:
+            api_key = self.retrieve_api_key()
+            watermark = load_watermark(self.s3_client, self.bucket, self.series_id) or {}
+            if metadata is None:
+                metadata = self.request_series_metadata(api_key)
+
+            last_updated = metadata.get("last_updated")
+            last_stored = watermark.get("last_observation_date")
+            observation_end = metadata.get("observation_end")
+            if observation_end:
+                available_end = min(parse_datetime(observation_end), self.observation_date)
+            else:
+                # Catalog rows and newly listed series may carry no observation_end yet
+                logger.info(
+                    f"[FredExtractor][execute_incremental] {self.series_id} has no observation_end, "
+                    f"checking up to the observation date"
+                )
+                available_end = self.observation_date
+            start = parse_datetime(last_stored) + datetime.timedelta(days=1) if last_stored else self.observation_date
+
+            if (last_stored and last_updated == watermark.get("last_updated")) or start > available_end:
+                logger.info(
+                    f"[FredExtractor][execute_incremental] {self.series_id} unchanged since "
+                    f"{last_stored or 'never'} (last_updated: {last_updated}), skipping observations request"
+                )
+                if last_updated != watermark.get("last_updated"):
+                    watermark = save_watermark(self.s3_client, self.bucket, self.series_id, last_stored, last_updated)
+                return {"HTTPStatusCode": self.HTTP_NO_CONTENT, "ObjectsWritten": 0, "Watermark": watermark}
+
+            response = self.backfill(start, available_end)
+            new_last_stored = response.get("LastObservationDate") or last_stored
+            response["Watermark"] = save_watermark(
+                self.s3_client, self.bucket, self.series_id, new_last_stored, last_updated
+            )
+            return response
+
+        except Exception as e:
+            logger.error(f"[FredExtractor][execute_incremental] Incremental extraction failed: {str(e)}", exc_info=True)
+            raise
+
+    @staticmethod
+    def split_observations_by_date(api_response: dict) -> dict:
+        """
+        Split a multi-day API response into one response per observation date.
+
+        Each daily payload keeps the response metadata, with observation_start/end
+        narrowed to that day, so it matches what a single-day request returns.
+
+        Args:
+            api_response: FRED API response spanning several dates
+
+        Returns:
+            Dictionary mapping 'YYYY-MM-DD' to a single-day API response
+        """
+        observations_by_date = defaultdict(list)
+        for observation in api_response.get("observations", []):
+            observations_by_date[observation["date"]].append(observation)
+
+        metadata = {key: value for key, value in api_response.items() if key != "observations"}
+        return {
+            date: {
+                **metadata,
+                "observation_start": date,
+                "observation_end": date,
+                "count": len(observations),
+                "offset": 0,
+                "observations": observations,
+            }
+            for date, observations in observations_by_date.items()
+        }
+
+    def _iter_daily_batches(self, api_key: str, start: datetime.date, end: datetime.date) -> Iterator[dict]:
+        """Stream a range as dictionaries of daily responses, one per chunk, never splitting a date across two."""
+        metadata = {}
+        carry = []
+        for chunk in self.iter_fred_data_range(api_key, start, end, metadata):
+            observations = carry + chunk
+            # Observations arrive sorted by date, so only the last date can continue in the next chunk
+            last_date = observations[-1]["date"]
+            carry = [o for o in observations if o["date"] == last_date]
+            ready = [o for o in observations if o["date"] != last_date]
+            if ready:
+                yield self.split_observations_by_date({**metadata, "observations": ready})
+        if carry:
+            yield self.split_observations_by_date({**metadata, "observations": carry})
+
+    def backfill(
+        self,
+        start_date: Union[str, datetime.date],
+        end_date: Union[str, datetime.date, None] = None,
+        max_workers: int = BACKFILL_MAX_WORKERS,
+    ) -> dict:
+        """
+        Backfill a date range with as few FRED calls as possible.
+
+        The whole range is fetched at once (paging only when it exceeds the API limit),
+        then split into the usual daily objects and uploaded concurrently. With stream_chunk_size
+        set, responses are parsed and uploaded chunk by chunk, so memory no longer grows with
+        the length of the range. Dates whose stored object already holds the same content are
+        checked against one manifest read and not uploaded again.
+
+        Args:
+            start_date: First observation date (inclusive)
+            end_date: Last observation date (inclusive, default: the observation date)
+            max_workers: Upper bound on concurrent S3 uploads (default: 16)
+
+        Returns:
+            Dictionary with HTTP status code, objects written and skipped, and the last date stored
+
+        Raises:
+            ValueError: If the date range is invalid
+            Exception: If any step in the backfill fails
+        """
+        start = parse_datetime(start_date)
+        end = self.observation_date if end_date is None else parse_datetime(end_date)
+
+        if start > end:
+            raise ValueError(f"Backfill start {start:%Y-%m-%d} is after end {end:%Y-%m-%d}")
+
+        try:
+            logger.info(
+                f"[FredExtractor][backfill] Starting backfill for series: {self.series_id}, "
+                f"range: {start:%Y-%m-%d} to {end:%Y-%m-%d}"
+            )
+
+            api_key = self.retrieve_api_key()
+            if self.stream_chunk_size:
+                batches = self._iter_daily_batches(api_key, start, end)
+            else:
+                batches = [self.split_observations_by_date(self.request_fred_data_range(api_key, start, end))]
+
+            def upload(item):
+                date, payload = item
+                stored = manifest_entries.get(date)
+                key = self.generate_s3_object_key(datetime.date.fromisoformat(date))
+                response, entry = self._put_object(key, payload, stored)
+                return {"date": date, **entry}, response is not None, entry != stored
+
+            results = []
+            with self.metrics.stage(self.series_id, "store_backfill") as stage:
+                manifest, etag = load_manifest(self.s3_client, self.bucket, self.series_id)
+                manifest_entries = dict(manifest["entries"])
+                try:
+                    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                        for daily_responses in batches:
+                            futures = [executor.submit(upload, item) for item in daily_responses.items()]
+                            wait(futures)
+                            results.extend(future.result() for future in futures if future.exception() is None)
+                            errors = [future.exception() for future in futures if future.exception() is not None]
+                            if errors:
+                                raise errors[0]
+                finally:
+                    changed = [entry for entry, _, updated in results if updated]
+                    if changed:
+                        # One manifest write for the whole range rather than one per day; uploads that
+                        # succeeded are recorded even when another one failed
+                        self._record_in_manifest(changed, (manifest, etag))
+
+                entries = [entry for entry, _, _ in results]
+                uploaded = [entry for entry, was_uploaded, _ in results if was_uploaded]
+                written = len(uploaded)
+                stage.update(
+                    ObjectsWritten=written,
+                    ObjectsSkipped=len(entries) - written,
+                    PayloadBytes=sum(entry["size"] for entry in uploaded),
+                )
+
+            if not entries:
+                logger.warning(f"[FredExtractor][backfill] No data available for {self.series_id} in range")
+                return {"HTTPStatusCode": self.HTTP_NO_CONTENT, "ObjectsWritten": 0}
+
+            logger.info(
+                f"[FredExtractor][backfill] Wrote {written} objects for {self.series_id}, "
+                f"{len(entries) - written} unchanged"
+            )
+            response = {
+                "HTTPStatusCode": self.HTTP_OK,
+                "ObjectsWritten": written,
+                "ObjectsSkipped": len(entries) - written,
+                "LastObservationDate": max(entry["date"] for entry in entries),
+            }
+            if self.aggregate_frequencies and uploaded:
+                dates = [entry["date"] for entry in uploaded]
+                response["PeriodsUpdated"] = self.aggregate(min(dates), max(dates))
+            return response
+
+        except Exception as e:
+            logger.error(f"[FredExtractor][backfill] Backfill failed: {str(e)}", exc_info=True)
+            raise
+
+    def repair_gaps(
+        self,
+        start_date: DateLike,
+        end_date: Optional[DateLike] = None,
+        holidays: Iterable[DateLike] = (),
+        max_bridge: int = DEFAULT_MAX_BRIDGE,
+    ) -> dict:
+        """
+        Find business days without a stored object and refetch them in as few FRED calls as possible.
+
+        Stored dates come from the manifest or a listing, never from reading objects (see
+        gaps.GapScanner). Missing days are coalesced into ranges and each range is refetched with
+        one backfill call, which writes through the normal key scheme and skips dates whose stored
+        content is unchanged. Missing days FRED still has no observation for, although it has
+        published later ones (market holidays), are recorded in the manifest as empty and are not
+        reported or refetched again.
+
+        Args:
+            start_date: First date to check (inclusive)
+            end_date: Last date to check (inclusive, default: the observation date)
+            holidays: Dates without observations, never reported as gaps (default: none)
+            max_bridge: Present days a repair range may span to absorb the next gap (default: 20)
+
+        Returns:
+            Dictionary with HTTP status code, missing days found, ranges refetched, objects written and
+            missing days confirmed empty
+
+        Raises:
+            Exception: If a repair backfill fails
+        """
+        end = self.observation_date if end_date is None else end_date
+        with self.metrics.stage(self.series_id, "scan_gaps") as stage:
+            gaps = GapScanner(self.s3_client, self.bucket, holidays).scan(self.series_id, start_date, end, max_bridge)
+            stage.update(Gaps=len(gaps["missing"]), Ranges=len(gaps["ranges"]))
+
+        if not gaps["missing"]:
+            return {"HTTPStatusCode": self.HTTP_NO_CONTENT, "Gaps": 0, "Ranges": [], "ObjectsWritten": 0}
+
+        written = 0
+        for range_start, range_end in gaps["ranges"]:
+            written += self.backfill(range_start, range_end).get("ObjectsWritten", 0)
+
+        # Days after the last stored observation may just not be published yet, so only earlier ones count as empty
+        manifest, etag = load_manifest(self.s3_client, self.bucket, self.series_id)
+        last_stored = max(manifest["entries"], default="")
+        empty = [date for date in gaps["missing"] if date not in manifest["entries"] and date < last_stored]
+        if empty:
+            update_manifest(self.s3_client, self.bucket, self.series_id, [], loaded=(manifest, etag), empty_dates=empty)
+
+        logger.info(
+            f"[FredExtractor][repair_gaps] Repaired {self.series_id}: {len(gaps['missing'])} missing days in "
+            f"{len(gaps['ranges'])} ranges, {written} objects written, {len(empty)} confirmed empty"
+        )
+        return {
+            "HTTPStatusCode": self.HTTP_OK,
+            "Gaps": len(gaps["missing"]),
+            "Ranges": [list(r) for r in gaps["ranges"]],
+            "ObjectsWritten": written,
+            "EmptyDates": len(empty),
+        }
+
+    def aggregate(self, start: DateLike, end: DateLike) -> dict:
+        """
+        Bring the series' rollups up to date for the periods touched by start..end.
+
+        Only the weekly, monthly or quarterly periods overlapping the changed dates are
+        recomputed (see aggregates.RollupWriter), so a daily run rewrites one row per frequency.
+
+        Args:
+            start: First changed date (inclusive)
+            end: Last changed date (inclusive)
+
+        Returns:
+            Dictionary mapping each frequency to the number of periods rewritten
+        """
+        # NumPy and the reader are only needed for rollups; the reader also imports this module
+        from .aggregates import RollupWriter
+        from .reader import FredReader
+
+        reader = FredReader(self.s3_client, self.bucket, extension=self.serializer.EXTENSION)
+        writer = RollupWriter(self.s3_client, self.bucket, self.aggregate_frequencies, reader)
+        with self.metrics.stage(self.series_id, "aggregate") as stage:
+            updated = writer.update(self.series_id, start, end)
+            stage.update(Periods=sum(updated.values()))
+        return updated
+
     def retrieve_api_key(self) -> str:
         """
         Retrieve FRED API key from AWS Secrets Manager with caching.
 
+        The secret is cached on the instance and process-wide (see aws_cache), so warm
+        invocations do not call Secrets Manager again until the cache TTL expires. When the
+        secret also lists keys under SECRET_KEYS, the FRED client is set up to spread requests
+        across all of them; the key returned here is then replaced per request.
+
         Returns:
             FRED API key string
 
@@ -244,15 +1058,21 @@ class FredExtractor:
         logger.info(f"[FredExtractor][retrieve_api_key] Retrieving secret: {self.SECRET_NAME}")
 
         try:
-            client = self.session.client(service_name="secretsmanager")
-            response = client.get_secret_value(SecretId=self.SECRET_NAME)
-
-            secret = json.loads(response["SecretString"])
+            with self.metrics.stage(self.series_id, "retrieve_api_key"):
+                secret = json.loads(aws_cache.get_secret_string(self.session, self.SECRET_NAME))
 
             if self.SECRET_KEY not in secret:
                 raise ValueError(f"Secret '{self.SECRET_NAME}' missing required key: '{self.SECRET_KEY}'")
 
+            # A plain string here would otherwise be spread into one "key" per character
+            keys = secret.get(self.SECRET_KEYS, [])
+            if not isinstance(keys, list) or not all(isinstance(key, str) and key.strip() for key in keys):
+                raise ValueError(
+                    f"Secret '{self.SECRET_NAME}' key '{self.SECRET_KEYS}' must be a list of non-empty strings"
+                )
+
             self._api_key = secret[self.SECRET_KEY]
+            self.fred_client.use_api_keys([self._api_key, *keys])
             logger.info("[FredExtractor][retrieve_api_key] Successfully retrieved API key")
             return self._api_key
 
@@ -264,11 +1084,38 @@ class FredExtractor:
             logger.error("[FredExtractor][retrieve_api_key] Invalid JSON in secret", exc_info=True)
             raise ValueError(f"Secret '{self.SECRET_NAME}' contains invalid JSON") from e
 
-    def generate_s3_object_key(self) -> str:
+    def refresh_api_key(self, rejected_key: Optional[str] = None) -> str:
+        """
+        Retrieve the API key again after FRED rejected it, e.g. because the secret was rotated.
+
+        The process-wide cache is only invalidated when it still holds the rejected key,
+        so concurrent extractors hitting the same rotation trigger a single Secrets Manager call.
+
+        Args:
+            rejected_key: API key FRED refused (default: always invalidate)
+
+        Returns:
+            FRED API key string
+        """
+        self._api_key = None
+        api_key = self.retrieve_api_key()
+        if rejected_key is None or api_key == rejected_key:
+            aws_cache.invalidate_secret(self.SECRET_NAME)
+            self._api_key = None
+            api_key = self.retrieve_api_key()
+        return api_key
+
+    def generate_s3_object_key(self, observation_date: Optional[datetime.date] = None) -> str:
         """
         Generate S3 object key with Hive-style partitioning.
 
-        Format: fred/{series_id}/year={YYYY}/month={MM}/{series_id}-{YYYY-MM-DD}.json
+        Format: fred/{series_id}/year={YYYY}/month={MM}/{series_id}-{YYYY-MM-DD}.{extension}
+
+        The extension follows the output format and compression (e.g. json, parquet, ndjson.gz);
+        the partition layout is the same for all of them.
+
+        Args:
+            observation_date: Date to generate the key for (default: the observation date)
 
         Returns:
             S3 object key string
@@ -276,11 +1123,29 @@ class FredExtractor:
         Example:
             fred/SP500/year=2026/month=01/SP500-2026-01-24.json
         """
-        year = self.observation_date.format("YYYY")
-        month = self.observation_date.format("MM")
-        date_string = self.observation_date.format("YYYY-MM-DD")
-
-        object_key = f"fred/{self.series_id}/year={year}/month={month}/{self.series_id}-{date_string}.json"
+        observation_date = self.observation_date if observation_date is None else observation_date
+        object_key = self.build_s3_object_key(self.series_id, observation_date, self.serializer.EXTENSION)
 
         logger.debug(f"[FredExtractor][generate_s3_object_key] Generated key: {object_key}")
         return object_key
+
+    @staticmethod
+    def build_s3_object_key(series_id: str, observation_date, extension: str = "json") -> str:
+        """
+        Build the Hive-style S3 object key for a series and date.
+
+        Shared by writers and readers so both agree on the layout.
+
+        Args:
+            series_id: FRED series identifier
+            observation_date: Any date-like object with year, month and day attributes
+            extension: Object extension (default: json)
+
+        Returns:
+            S3 object key string
+        """
+        year, month, day = observation_date.year, observation_date.month, observation_date.day
+        return (
+            f"fred/{series_id}/year={year:04d}/month={month:02d}/"
+            f"{series_id}-{year:04d}-{month:02d}-{day:02d}.{extension}"
+        )
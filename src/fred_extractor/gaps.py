@@ -0,0 +1,154 @@
+import calendar
+import datetime
+import logging
+import re
+from typing import Iterable
+
+from .dates import DateLike, to_date
+from .manifest import load_manifest, manifest_dates
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Present business days a repair range may span to absorb the next gap: refetching them is part of
+# the same FRED call, and their unchanged objects are not uploaded again
+DEFAULT_MAX_BRIDGE = 20
+
+
+def business_days(start: DateLike, end: DateLike, holidays: Iterable[DateLike] = ()) -> list:
+    """
+    Expected observation dates between start and end: weekdays that are not holidays.
+
+    Args:
+        start: First date (inclusive)
+        end: Last date (inclusive)
+        holidays: Dates without observations, e.g. market holidays (default: none)
+
+    Returns:
+        Sorted list of 'YYYY-MM-DD' strings
+    """
+    start, end = to_date(start), to_date(end)
+    skipped = {to_date(day) for day in holidays}
+    days = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5 and day not in skipped:
+            days.append(day.isoformat())
+        day += datetime.timedelta(days=1)
+    return days
+
+
+def coalesce(missing: Iterable[str], expected: list, max_bridge: int = DEFAULT_MAX_BRIDGE) -> list:
+    """
+    Merge missing dates into the fewest (start, end) ranges.
+
+    Missing dates that follow each other in the expected calendar always share a range, so a
+    weekend never splits one. Ranges separated by at most max_bridge present dates are merged
+    as well, trading a few refetched days for one API call less.
+
+    Args:
+        missing: Missing 'YYYY-MM-DD' dates, all of them in expected
+        expected: Sorted expected dates (see business_days)
+        max_bridge: Present dates a range may span to reach the next gap (default: 20)
+
+    Returns:
+        Sorted list of inclusive (start, end) date string tuples
+    """
+    position = {date: i for i, date in enumerate(expected)}
+    indexes = sorted(position[date] for date in set(missing))
+
+    ranges = []
+    for index in indexes:
+        if ranges and index - ranges[-1][1] <= max_bridge + 1:
+            ranges[-1][1] = index
+        else:
+            ranges.append([index, index])
+    return [(expected[first], expected[last]) for first, last in ranges]
+
+
+class GapScanner:
+    """
+    Finds the business days a series has no stored object for, without reading any object.
+
+    Stored dates come from the series manifest; business days it has no entry for, such as
+    objects written before manifests existed, are looked up with one listing of each affected
+    year's fred/{series}/year=/ prefix. A compacted monthly object found by listing counts as
+    covering its whole month.
+    """
+
+    def __init__(self, s3_client, bucket: str, holidays: Iterable[DateLike] = ()) -> None:
+        """
+        Initialize the scanner.
+
+        Args:
+            s3_client: boto3 S3 client
+            bucket: Bucket holding the fred/ data
+            holidays: Dates without observations, never reported as gaps (default: none)
+        """
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.holidays = tuple(holidays)
+
+    def _listed_dates(self, series_id: str, years: Iterable[int]) -> set:
+        daily = re.compile(rf"/{re.escape(series_id)}-(\d{{4}}-\d{{2}}-\d{{2}})\.")
+        monthly = re.compile(rf"/{re.escape(series_id)}-(\d{{4}})-(\d{{2}})\.")
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+
+        dates = set()
+        for year in sorted(years):
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=f"fred/{series_id}/year={year:04d}/"):
+                for obj in page.get("Contents", []):
+                    if match := daily.search(obj["Key"]):
+                        dates.add(match.group(1))
+                    elif match := monthly.search(obj["Key"]):
+                        y, m = int(match.group(1)), int(match.group(2))
+                        dates.update(f"{y:04d}-{m:02d}-{d:02d}" for d in range(1, calendar.monthrange(y, m)[1] + 1))
+        return dates
+
+    def stored_dates(self, series_id: str, start: DateLike, end: DateLike) -> set:
+        """
+        Dates between start and end that have a stored object or that FRED confirmed are empty.
+
+        Args:
+            series_id: FRED series identifier
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            Set of 'YYYY-MM-DD' strings
+        """
+        start, end = to_date(start), to_date(end)
+        manifest, _ = load_manifest(self.s3_client, self.bucket, series_id)
+        stored = set(manifest_dates(manifest, start.isoformat(), end.isoformat()))
+        # Holidays found by earlier repairs (see FredExtractor.repair_gaps) are not gaps
+        stored.update(d for d in manifest.get("empty_dates", ()) if start.isoformat() <= d <= end.isoformat())
+
+        # Objects written before the manifest existed have no entry: list the years the manifest leaves uncovered
+        uncovered_years = {int(date[:4]) for date in business_days(start, end, self.holidays) if date not in stored}
+        if uncovered_years:
+            listed = self._listed_dates(series_id, uncovered_years)
+            stored.update(date for date in listed if start.isoformat() <= date <= end.isoformat())
+        return stored
+
+    def scan(self, series_id: str, start: DateLike, end: DateLike, max_bridge: int = DEFAULT_MAX_BRIDGE) -> dict:
+        """
+        Find the missing business days of a series and the ranges that repair them.
+
+        Args:
+            series_id: FRED series identifier
+            start: First date (inclusive)
+            end: Last date (inclusive)
+            max_bridge: Present dates a repair range may span (default: 20; 0 merges only adjacent gaps)
+
+        Returns:
+            Dictionary with the sorted missing dates and the coalesced (start, end) ranges
+        """
+        expected = business_days(start, end, self.holidays)
+        stored = self.stored_dates(series_id, start, end)
+        missing = [date for date in expected if date not in stored]
+        ranges = coalesce(missing, expected, max_bridge)
+        logger.info(
+            f"[GapScanner][scan] {series_id}: {len(missing)} of {len(expected)} business days missing, "
+            f"{len(ranges)} repair ranges"
+        )
+        return {"missing": missing, "ranges": ranges}
@@ -0,0 +1,155 @@
+import json
+import logging
+import random
+import time
+from typing import Callable, Iterable, Optional
+
+from botocore.exceptions import ClientError
+
+from .watermark import MISSING_OBJECT_ERROR_CODES, WATERMARK_PREFIX
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+MAX_UPDATE_ATTEMPTS = 10
+RETRY_BASE_SECONDS = 0.05
+RETRY_CAP_SECONDS = 2.0
+# PreconditionFailed: the manifest changed since it was read; ConditionalRequestConflict: concurrent write in flight
+CONFLICT_ERROR_CODES = frozenset({"PreconditionFailed", "ConditionalRequestConflict", "412", "409"})
+
+
+class ManifestConflictError(Exception):
+    """Raised when a manifest update keeps losing the race against concurrent writers."""
+
+
+def manifest_key(series_id: str) -> str:
+    """
+    S3 key of the partition manifest for a series.
+
+    Example:
+        fred-state/SP500/manifest.json
+    """
+    return f"{WATERMARK_PREFIX}/{series_id}/manifest.json"
+
+
+def empty_manifest(series_id: str) -> dict:
+    return {"series_id": series_id, "version": 0, "entries": {}}
+
+
+def load_manifest(s3_client, bucket: str, series_id: str) -> tuple:
+    """
+    Read the partition manifest for a series.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket: Bucket holding the manifest
+        series_id: FRED series identifier
+
+    Returns:
+        (manifest, etag) tuple; etag is None when no manifest exists yet
+
+    Raises:
+        ClientError: If the manifest exists but cannot be read
+    """
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=manifest_key(series_id))
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in MISSING_OBJECT_ERROR_CODES:
+            return empty_manifest(series_id), None
+        raise
+
+    return json.loads(response["Body"].read()), response["ETag"]
+
+
+def update_manifest(
+    s3_client,
+    bucket: str,
+    series_id: str,
+    entries: Iterable[dict],
+    max_attempts: int = MAX_UPDATE_ATTEMPTS,
+    sleep: Callable[[float], None] = time.sleep,
+    loaded: Optional[tuple] = None,
+    empty_dates: Iterable[str] = (),
+) -> dict:
+    """
+    Add or replace manifest entries with an optimistic-concurrency read-modify-write.
+
+    The write is conditional on the ETag that was read (or on the manifest not existing yet),
+    so a concurrent writer's entries are never overwritten; on conflict the manifest is re-read
+    and the update retried with jittered backoff.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket: Bucket holding the manifest
+        series_id: FRED series identifier
+        entries: Dictionaries with date, key, size and sha256
+        max_attempts: Attempts before giving up (default: 10)
+        sleep: Sleep function used between attempts, injectable for tests
+        loaded: (manifest, etag) the caller already read with load_manifest, used for the first
+            attempt instead of reading it again (default: read it)
+        empty_dates: 'YYYY-MM-DD' dates FRED confirmed have no observation, e.g. market holidays,
+            kept under "empty_dates" until an entry is recorded for them (default: none)
+
+    Returns:
+        The manifest that was written
+
+    Raises:
+        ManifestConflictError: If every attempt lost a race with another writer
+        ClientError: If S3 fails for any other reason
+    """
+    updates = {entry["date"]: {k: v for k, v in entry.items() if k != "date"} for entry in entries}
+    empty_dates = set(empty_dates)
+    if not updates and not empty_dates:
+        return load_manifest(s3_client, bucket, series_id)[0]
+
+    for attempt in range(max_attempts):
+        manifest, etag = loaded if attempt == 0 and loaded else load_manifest(s3_client, bucket, series_id)
+        manifest["entries"].update(updates)
+        manifest["entries"] = dict(sorted(manifest["entries"].items()))
+        if empty_dates or "empty_dates" in manifest:
+            manifest["empty_dates"] = sorted(
+                (set(manifest.get("empty_dates", ())) | empty_dates) - set(manifest["entries"])
+            )
+        manifest["version"] = manifest.get("version", 0) + 1
+
+        precondition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+        try:
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=manifest_key(series_id),
+                Body=json.dumps(manifest, separators=(",", ":")).encode("utf-8"),
+                ContentType="application/json",
+                **precondition,
+            )
+            logger.info(
+                f"[manifest][update_manifest] Updated {len(updates)} entries for {series_id} "
+                f"(version {manifest['version']})"
+            )
+            return manifest
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in CONFLICT_ERROR_CODES:
+                raise
+            delay = random.uniform(0, min(RETRY_CAP_SECONDS, RETRY_BASE_SECONDS * 2**attempt))  # noqa: S311
+            logger.warning(f"[manifest][update_manifest] Manifest for {series_id} changed concurrently, retrying")
+            sleep(delay)
+
+    raise ManifestConflictError(f"Could not update manifest for '{series_id}' after {max_attempts} attempts")
+
+
+def manifest_dates(manifest: dict, start: Optional[str] = None, end: Optional[str] = None) -> list:
+    """
+    Dates recorded in a manifest, optionally limited to an inclusive 'YYYY-MM-DD' range.
+
+    Args:
+        manifest: Manifest dictionary
+        start: First date to include (default: no lower bound)
+        end: Last date to include (default: no upper bound)
+
+    Returns:
+        Sorted list of date strings
+    """
+    return [
+        date
+        for date in sorted(manifest.get("entries", {}))
+        if (start is None or date >= start) and (end is None or date <= end)
+    ]
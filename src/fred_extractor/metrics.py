@@ -0,0 +1,122 @@
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, TextIO
+
+NAMESPACE = "FredExtractor"
+DIMENSIONS = ("SeriesId", "Stage")
+# CloudWatch units of the metrics the extractor records; anything else is emitted as a plain count
+UNITS = {
+    "Duration": "Milliseconds",
+    "PayloadBytes": "Bytes",
+    "Observations": "Count",
+    "ObjectsWritten": "Count",
+    "ObjectsSkipped": "Count",
+    "Pages": "Count",
+    "Retries": "Count",
+    "ThrottleWaits": "Count",
+    "CacheHits": "Count",
+    "CacheMisses": "Count",
+    "Vintages": "Count",
+    "Deltas": "Count",
+    "Periods": "Count",
+    "Gaps": "Count",
+    "Ranges": "Count",
+    "Errors": "Count",
+    "Jobs": "Count",
+    "JobsPerSecond": "Count/Second",
+}
+
+# Shared by every logger so records from concurrent extractors never interleave on stdout
+_write_lock = threading.Lock()
+
+
+class MetricsLogger:
+    """
+    Emits metrics as CloudWatch Embedded Metric Format (EMF) log lines.
+
+    Each record is one JSON line on stdout, which Lambda ships to CloudWatch Logs where it is
+    turned into metrics without any PutMetricData calls. Records carry the SeriesId and Stage
+    dimensions.
+    """
+
+    def __init__(
+        self,
+        namespace: str = NAMESPACE,
+        stream: Optional[TextIO] = None,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the metrics logger.
+
+        Args:
+            namespace: CloudWatch metric namespace (default: FredExtractor)
+            stream: Text stream the records are written to (default: sys.stdout at emit time)
+            enabled: Write records at all (default: True)
+            clock: Wall clock in epoch seconds, injectable for tests
+        """
+        self.namespace = namespace
+        self.stream = stream
+        self.enabled = enabled
+        self._clock = clock
+
+    def emit(self, series_id: str, stage: str, metrics: dict) -> dict:
+        """
+        Write one EMF record.
+
+        Args:
+            series_id: FRED series identifier (SeriesId dimension)
+            stage: Pipeline stage (Stage dimension)
+            metrics: Metric name to numeric value
+
+        Returns:
+            The record that was written
+        """
+        record = {
+            "_aws": {
+                "Timestamp": int(self._clock() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": [list(DIMENSIONS)],
+                        "Metrics": [{"Name": name, "Unit": UNITS.get(name, "Count")} for name in metrics],
+                    }
+                ],
+            },
+            "SeriesId": series_id,
+            "Stage": stage,
+            **metrics,
+        }
+        if self.enabled:
+            line = json.dumps(record, separators=(",", ":"))
+            with _write_lock:
+                stream = self.stream or sys.stdout
+                stream.write(line + "\n")
+                stream.flush()
+        return record
+
+    @contextmanager
+    def stage(self, series_id: str, stage: str) -> Iterator[dict]:
+        """
+        Time a pipeline stage and emit its metrics when it ends.
+
+        The yielded dictionary collects the stage's metrics; Duration is added on exit and
+        Errors is set to 1 when the stage raises.
+
+        Example:
+            with metrics.stage("SP500", "request_fred_data") as stage:
+                stage["Observations"] = len(observations)
+        """
+        metrics = {}
+        started = time.perf_counter()
+        try:
+            yield metrics
+        except Exception:
+            metrics["Errors"] = 1
+            raise
+        finally:
+            metrics["Duration"] = (time.perf_counter() - started) * 1000
+            self.emit(series_id, stage, metrics)
@@ -0,0 +1,200 @@
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import boto3
+
+from . import aws_cache
+from .fred_client import FredClient
+from .fred_extractor import FredExtractor
+from .metrics import MetricsLogger
+
+if TYPE_CHECKING:
+    # Only annotate arguments; the handler imports these modules when a catalog or cache is used
+    from .catalog import SeriesCatalog
+    from .response_cache import ResponseCache
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+class SeriesExtractionError(Exception):
+    """Raised by MultiSeriesExtractor.execute with fail_on_error set when any series failed."""
+
+    def __init__(self, results: dict) -> None:
+        self.results = results
+        self.failed = [series_id for series_id, result in results.items() if "Error" in result]
+        super().__init__(f"Extraction failed for {len(self.failed)}/{len(results)} series: {', '.join(self.failed)}")
+
+
+class MultiSeriesExtractor:
+    """
+    Extracts several FRED series in a single invocation.
+
+    All series share one API key lookup, one pooled, rate-limited FRED client and one S3 client,
+    and are processed concurrently on a bounded thread pool.
+    """
+
+    DEFAULT_MAX_WORKERS = 16
+    # FRED publishes releases daily, so an older catalog's last_updated may hide new observations
+    DEFAULT_CATALOG_MAX_AGE_SECONDS = 24 * 60 * 60
+    HTTP_INTERNAL_SERVER_ERROR = 500
+
+    def __init__(
+        self,
+        event: dict,
+        context,
+        session: boto3.Session,
+        bucket: str,
+        series_ids: Iterable[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        fred_client: Optional[FredClient] = None,
+        output_format: str = FredExtractor.DEFAULT_OUTPUT_FORMAT,
+        compression: Optional[str] = None,
+        incremental: bool = False,
+        response_cache: Optional["ResponseCache"] = None,
+        metrics: Optional[MetricsLogger] = None,
+        stream_chunk_size: Optional[int] = None,
+        catalog: Optional["SeriesCatalog"] = None,
+        aggregate_frequencies: Optional[Iterable[str]] = None,
+        catalog_max_age: float = DEFAULT_CATALOG_MAX_AGE_SECONDS,
+        fail_on_error: bool = False,
+    ) -> None:
+        """
+        Initialize the multi-series extractor.
+
+        Args:
+            event: Lambda event containing execution time
+            context: Lambda context object
+            session: Boto3 session for AWS service access
+            bucket: S3 bucket name for data storage
+            series_ids: FRED series identifiers to extract
+            max_workers: Upper bound on concurrently processed series (default: 16)
+            fred_client: Shared FRED HTTP client (default: a new client sized to max_workers)
+            output_format: Object format passed to every FredExtractor (default: json)
+            compression: Optional compression passed to every FredExtractor (default: None)
+            incremental: Use watermark-based incremental extraction for every series (default: False)
+            response_cache: Observations response cache shared by every FredExtractor (default: no cache)
+            metrics: EMF metrics logger shared by every FredExtractor (default: one writing to stdout)
+            stream_chunk_size: Streaming parse chunk size passed to every FredExtractor (default: None)
+            catalog: Series catalog whose last_updated replaces the per-series metadata request in
+                incremental mode; series missing from it are still looked up (default: none)
+            aggregate_frequencies: Rollup frequencies passed to every FredExtractor (default: no rollups)
+            catalog_max_age: Seconds after its crawl the catalog's last_updated is still trusted; an
+                older catalog is ignored and every series' metadata is requested (default: one day)
+            fail_on_error: Raise SeriesExtractionError once every series has run if any of them
+                failed, so a caller such as a Step Functions retry sees the failure (default: False)
+
+        Raises:
+            ValueError: If no series are given or required event data is missing
+        """
+        FredExtractor._validate_event(event)
+
+        # Preserve order while dropping duplicates
+        self.series_ids = list(dict.fromkeys(s.strip() for s in series_ids if s and s.strip()))
+        if not self.series_ids:
+            raise ValueError("At least one series ID is required")
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.event = event
+        self.context = context
+        self.session = session
+        self.bucket = bucket
+        self.max_workers = max_workers
+        self.fred_client = fred_client or FredClient(pool_size=max_workers)
+        self.output_format = output_format
+        self.compression = compression
+        self.incremental = incremental
+        self.response_cache = response_cache
+        self.metrics = metrics or MetricsLogger()
+        self.stream_chunk_size = stream_chunk_size
+        self.catalog = catalog
+        self.aggregate_frequencies = aggregate_frequencies
+        self.catalog_max_age = catalog_max_age
+        self.fail_on_error = fail_on_error
+
+    def _build_extractor(self, series_id: str, api_key: str, s3_client):
+        return FredExtractor(
+            self.event,
+            self.context,
+            self.session,
+            bucket=self.bucket,
+            series_id=series_id,
+            api_key=api_key,
+            fred_client=self.fred_client,
+            s3_client=s3_client,
+            output_format=self.output_format,
+            compression=self.compression,
+            response_cache=self.response_cache,
+            metrics=self.metrics,
+            stream_chunk_size=self.stream_chunk_size,
+            aggregate_frequencies=self.aggregate_frequencies,
+        )
+
+    def _current_catalog(self) -> Optional["SeriesCatalog"]:
+        """The catalog, or None when its crawl is too old for its last_updated to be trusted."""
+        if self.catalog is None or not self.catalog.is_stale(self.catalog_max_age):
+            return self.catalog
+        logger.warning(
+            f"[MultiSeriesExtractor][execute] Catalog crawled at {self.catalog.crawled_at or 'an unknown time'} "
+            f"is older than {self.catalog_max_age:.0f}s, requesting series metadata instead"
+        )
+        return None
+
+    def execute(self) -> dict:
+        """
+        Extract and store every series concurrently.
+
+        A failure for one series does not stop the others; it is recorded in the result map.
+
+        Returns:
+            Dictionary mapping each series ID to its response dictionary
+
+        Raises:
+            SeriesExtractionError: If fail_on_error is set and any series failed
+            Exception: If the shared API key or S3 client cannot be obtained
+        """
+        logger.info(
+            f"[MultiSeriesExtractor][execute] Starting extraction for {len(self.series_ids)} series "
+            f"with {self.max_workers} workers"
+        )
+
+        api_key = FredExtractor(
+            self.event, self.context, self.session, self.bucket, fred_client=self.fred_client
+        ).retrieve_api_key()
+        s3_client = aws_cache.get_client(self.session, "s3")
+        catalog = self._current_catalog()
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for series_id in self.series_ids:
+                extractor = self._build_extractor(series_id, api_key, s3_client)
+                if self.incremental:
+                    metadata = catalog.metadata(series_id) if catalog is not None else None
+                    run = functools.partial(extractor.execute_incremental, metadata)
+                else:
+                    run = extractor.execute
+                futures[executor.submit(run)] = series_id
+
+            for future in as_completed(futures):
+                series_id = futures[future]
+                try:
+                    results[series_id] = future.result()
+                except Exception as e:
+                    results[series_id] = {"HTTPStatusCode": self.HTTP_INTERNAL_SERVER_ERROR, "Error": str(e)}
+
+        failed = [series_id for series_id, result in results.items() if "Error" in result]
+        logger.info(
+            f"[MultiSeriesExtractor][execute] Completed {len(results) - len(failed)}/{len(results)} series"
+            + (f", failed: {', '.join(sorted(failed))}" if failed else "")
+        )
+
+        # Report results in the order the series were requested
+        results = {series_id: results[series_id] for series_id in self.series_ids}
+        if failed and self.fail_on_error:
+            raise SeriesExtractionError(results)
+        return results
@@ -0,0 +1,248 @@
+import datetime
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from botocore.exceptions import ClientError
+
+from .compaction import compacted_object_key, merge_observations
+from .dates import DateLike
+from .dates import to_date as _to_date
+from .fred_extractor import FredExtractor
+from .manifest import load_manifest
+from .serializers import FRED_MISSING_VALUE, decode_response
+from .watermark import MISSING_OBJECT_ERROR_CODES
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+PARTITION_PATTERN = re.compile(r"/year=(\d{4})/month=(\d{2})/")
+
+
+class FredReader:
+    """
+    Loads stored FRED observations for a series and date range back into NumPy or pandas.
+
+    Object keys come from the series manifest, and from the fred/{series}/year=/month= key scheme
+    for dates it does not cover (objects written before the manifest existed); they are fetched
+    concurrently with a shared S3 client, and missing candidates are skipped.
+    An optional local cache keyed on ETag turns repeat loads into conditional GETs.
+    """
+
+    DEFAULT_MAX_WORKERS = 32
+    NOT_MODIFIED_ERROR_CODES = frozenset({"304", "NotModified"})
+
+    def __init__(
+        self,
+        s3_client,
+        bucket: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        cache_dir: Optional[str] = None,
+        extension: str = "json",
+    ) -> None:
+        """
+        Initialize the reader.
+
+        Args:
+            s3_client: boto3 S3 client shared by every worker thread
+            bucket: Bucket holding the fred/ data
+            max_workers: Upper bound on concurrent GETs (default: 32)
+            cache_dir: Directory for the ETag-keyed local cache (default: no cache)
+            extension: Extension of daily objects when keys come from the key scheme (default: json)
+        """
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.extension = extension
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def keys_for_range(self, series_id: str, start: DateLike, end: DateLike) -> list:
+        """
+        Work out which objects hold the series between start and end.
+
+        Args:
+            series_id: FRED series identifier
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            Sorted list of S3 object keys
+        """
+        return self._plan(series_id, _to_date(start), _to_date(end))[0]
+
+    def _plan(self, series_id: str, start: datetime.date, end: datetime.date) -> tuple:
+        """(sorted keys, {date: key the manifest records for it}) for a date range."""
+        manifest, _ = load_manifest(self.s3_client, self.bucket, series_id)
+        covered = {
+            date: entry["key"]
+            for date, entry in manifest["entries"].items()
+            if start.isoformat() <= date <= end.isoformat()
+        }
+        keys = set(covered.values())
+
+        # Dates the manifest does not cover, e.g. objects written before it existed: derive
+        # candidates from the key scheme; weekends never have daily objects
+        day = start
+        while day <= end:
+            if day.weekday() < 5 and day.isoformat() not in covered:
+                keys.add(FredExtractor.build_s3_object_key(series_id, day, self.extension))
+                keys.add(compacted_object_key(series_id, day.year, day.month, self.extension))
+            day += datetime.timedelta(days=1)
+        return sorted(keys), covered
+
+    def _cache_paths(self, key: str) -> tuple:
+        name = hashlib.sha256(f"{self.bucket}/{key}".encode("utf-8")).hexdigest()
+        path = os.path.join(self.cache_dir, name)
+        return path, f"{path}.etag"
+
+    def _write_cache(self, key: str, body: bytes, etag: str) -> None:
+        path, etag_path = self._cache_paths(key)
+        for target, content in ((path, body), (etag_path, etag.encode("utf-8"))):
+            # Write then rename so concurrent readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+            os.replace(tmp, target)
+
+    def fetch(self, key: str) -> Optional[bytes]:
+        """
+        Fetch one object body, using the local cache when its ETag is still current.
+
+        Args:
+            key: S3 object key
+
+        Returns:
+            Object body, or None if the object does not exist
+        """
+        get_kwargs = {"Bucket": self.bucket, "Key": key}
+        cached_etag = None
+        if self.cache_dir:
+            path, etag_path = self._cache_paths(key)
+            if os.path.exists(path) and os.path.exists(etag_path):
+                with open(etag_path, "r") as file:
+                    cached_etag = file.read()
+                get_kwargs["IfNoneMatch"] = cached_etag
+
+        try:
+            response = self.s3_client.get_object(**get_kwargs)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if cached_etag and code in self.NOT_MODIFIED_ERROR_CODES:
+                with open(path, "rb") as file:
+                    return file.read()
+            if code in MISSING_OBJECT_ERROR_CODES:
+                return None
+            raise
+
+        body = response["Body"].read()
+        if self.cache_dir:
+            self._write_cache(key, body, response["ETag"])
+        return body
+
+    @staticmethod
+    def decode(key: str, body: bytes) -> list:
+        """
+        Decode a stored object into a list of observation dictionaries.
+
+        Args:
+            key: Object key; its extension selects the format
+            body: Object body
+
+        Returns:
+            List of observations with date and value
+        """
+        return decode_response(key, body).get("observations", [])
+
+    def load_observations(self, series_id: str, start: DateLike, end: DateLike) -> list:
+        """
+        Load sorted, deduplicated observations between start and end.
+
+        For dates the manifest covers, the object it records (the last one written) wins; otherwise
+        compacted monthly objects win over daily objects for the dates they cover.
+
+        Args:
+            series_id: FRED series identifier
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            List of observation dictionaries sorted by date
+        """
+        start, end = _to_date(start), _to_date(end)
+        keys, covered = self._plan(series_id, start, end)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            bodies = list(executor.map(self.fetch, keys))
+
+        compacted, daily, recorded = [], [], {}
+        for key, body in zip(keys, bodies, strict=True):
+            if body is None:
+                continue
+            observations = self.decode(key, body)
+            (compacted if self._is_compacted(series_id, key) else daily).extend(observations)
+            recorded.update((o["date"], o) for o in observations if covered.get(o["date"]) == key)
+
+        logger.info(f"[FredReader][load_observations] Loaded {len(keys)} objects for {series_id}")
+        # A daily re-uploaded after compaction is what the manifest records, so it beats the compacted value
+        observations = merge_observations({"observations": compacted}, [{"observations": daily}])
+        observations = [recorded.get(o["date"], o) for o in observations]
+        return [o for o in observations if start.isoformat() <= o["date"] <= end.isoformat()]
+
+    @staticmethod
+    def _is_compacted(series_id: str, key: str) -> bool:
+        match = PARTITION_PATTERN.search(key)
+        # Any extension: the compacted object is written in whichever format the dailies used
+        return bool(match) and key.startswith(
+            compacted_object_key(series_id, int(match.group(1)), int(match.group(2)), "")
+        )
+
+    @staticmethod
+    def _value(value) -> float:
+        if value is None or value == FRED_MISSING_VALUE:
+            return float("nan")
+        return float(value)
+
+    def load(self, series_id: str, start: DateLike, end: DateLike) -> tuple:
+        """
+        Load a series into NumPy arrays.
+
+        Args:
+            series_id: FRED series identifier
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            (dates, values) where dates is datetime64[D] and values is float64 with NaN for missing
+        """
+        import numpy as np
+
+        observations = self.load_observations(series_id, start, end)
+        dates = np.array([o["date"] for o in observations], dtype="datetime64[D]")
+        values = np.array([self._value(o.get("value")) for o in observations], dtype=np.float64)
+        return dates, values
+
+    def load_frame(self, series_id: str, start: DateLike, end: DateLike):
+        """
+        Load a series into a pandas DataFrame indexed by date.
+
+        Args:
+            series_id: FRED series identifier
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            DataFrame with a DatetimeIndex named 'date' and a float64 column named after the series
+
+        Raises:
+            ImportError: If pandas is not installed
+        """
+        import pandas as pd
+
+        dates, values = self.load(series_id, start, end)
+        return pd.DataFrame({series_id: values}, index=pd.DatetimeIndex(dates, name="date"))
@@ -0,0 +1,333 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Mapping, Optional
+
+from botocore.exceptions import ClientError
+
+from .watermark import MISSING_OBJECT_ERROR_CODES
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Kept outside the fred/ prefix so cached responses never show up in data scans
+CACHE_PREFIX = "fred-cache"
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Credentials never take part in the key, so a rotated API key still hits the cache
+STRIPPED_PARAMS = frozenset({"api_key"})
+
+
+def cache_key(url: str, params: Mapping) -> str:
+    """
+    Key of a cached response: a hash of the URL and the normalized query parameters.
+
+    Parameters are sorted and stringified, so {"limit": 10} and {"limit": "10"} share a key,
+    and the API key is dropped.
+    """
+    normalized = {str(k): str(v) for k, v in params.items() if k not in STRIPPED_PARAMS}
+    payload = json.dumps({"url": url, "params": normalized}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCacheBackend:
+    """
+    Stores cached responses as files in a local directory.
+
+    Entries are written atomically, and the least recently used ones are removed once the
+    directory grows beyond max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = DEFAULT_MAX_BYTES) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            directory: Directory holding the cache files, created if missing
+            max_bytes: Size budget for the directory, None for unbounded (default: 512 MiB)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                body = file.read()
+        except FileNotFoundError:
+            return None
+        # Reads count as use for LRU eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return body
+
+    def put(self, key: str, body: bytes) -> None:
+        # Write then rename so concurrent readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(body)
+        os.replace(tmp, self._path(key))
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def evict(self, max_bytes: int) -> int:
+        """
+        Remove least recently used entries until the directory fits in max_bytes.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+
+        if removed:
+            logger.info(f"[DiskCacheBackend][evict] Evicted {removed} entries from {self.directory}")
+        return removed
+
+
+class S3CacheBackend:
+    """
+    Stores cached responses as objects under fred-cache/ in S3, shared by every execution environment.
+
+    Size-based eviction lists the prefix, so it only runs when max_bytes is set; prefer an S3
+    lifecycle rule on the prefix for large caches.
+    """
+
+    def __init__(self, s3_client, bucket: str, prefix: str = CACHE_PREFIX, max_bytes: Optional[int] = None) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            s3_client: boto3 S3 client
+            bucket: Bucket holding the cache objects
+            prefix: Key prefix of the cache objects (default: fred-cache)
+            max_bytes: Size budget for the prefix, None to leave eviction to TTL (default: None)
+        """
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix.rstrip("/")
+        self.max_bytes = max_bytes
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}.json"
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self._key(key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in MISSING_OBJECT_ERROR_CODES:
+                return None
+            raise
+        return response["Body"].read()
+
+    def put(self, key: str, body: bytes) -> None:
+        self.s3_client.put_object(Bucket=self.bucket, Key=self._key(key), Body=body, ContentType="application/json")
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+
+    def delete(self, key: str) -> None:
+        self.s3_client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def evict(self, max_bytes: int) -> int:
+        """
+        Remove the oldest cache objects until the prefix fits in max_bytes.
+
+        Returns:
+            Number of objects removed
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        objects = [
+            (obj["LastModified"], obj["Size"], obj["Key"])
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{self.prefix}/")
+            for obj in page.get("Contents", [])
+        ]
+
+        total = sum(size for _, size, _ in objects)
+        doomed = []
+        for _, size, key in sorted(objects):
+            if total <= max_bytes:
+                break
+            doomed.append(key)
+            total -= size
+
+        # S3 DeleteObjects accepts at most 1000 keys per request
+        for start in range(0, len(doomed), 1000):
+            batch = doomed[start : start + 1000]
+            self.s3_client.delete_objects(
+                Bucket=self.bucket, Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+            )
+
+        if doomed:
+            logger.info(f"[S3CacheBackend][evict] Evicted {len(doomed)} objects from s3://{self.bucket}/{self.prefix}/")
+        return len(doomed)
+
+
+class ResponseCache:
+    """
+    Cache of decoded FRED API responses keyed on the request, with HTTP revalidation.
+
+    Entries younger than ttl_seconds are served without a request. Older entries that carry an
+    ETag or Last-Modified validator are revalidated with If-None-Match / If-Modified-Since, and a
+    304 renews them; older entries without validators are dropped.
+    """
+
+    DEFAULT_TTL_SECONDS = DEFAULT_TTL_SECONDS
+
+    def __init__(
+        self,
+        backend,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            backend: DiskCacheBackend or S3CacheBackend
+            ttl_seconds: Seconds an entry is served without revalidation (default: one day)
+            clock: Wall clock in epoch seconds, injectable for tests
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidations": 0, "stores": 0}
+
+    @property
+    def stats(self) -> dict:
+        """Snapshot of hit, miss, revalidation and store counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _record(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def lookup(self, url: str, params: Mapping) -> Optional[dict]:
+        """
+        Find the cached entry for a request.
+
+        Args:
+            url: Request URL
+            params: Query parameters, including api_key
+
+        Returns:
+            Entry with body, stored_at and validators, or None on a miss
+        """
+        key = cache_key(url, params)
+        raw = self.backend.get(key)
+        if raw is None:
+            self._record("misses")
+            return None
+
+        try:
+            entry = json.loads(raw)
+        except ValueError:
+            logger.warning(f"[ResponseCache][lookup] Dropping unreadable cache entry {key}")
+            self.backend.delete(key)
+            self._record("misses")
+            return None
+
+        if self.is_fresh(entry):
+            self._record("hits")
+            return entry
+
+        if not self.revalidation_headers(entry):
+            self.backend.delete(key)
+            self._record("misses")
+            return None
+
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        """Whether the entry can be served without asking FRED."""
+        return self._clock() - entry["stored_at"] < self.ttl_seconds
+
+    @staticmethod
+    def revalidation_headers(entry: dict) -> dict:
+        """Conditional request headers built from the validators stored with the entry."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, params: Mapping, body: dict, headers: Optional[Mapping] = None) -> dict:
+        """
+        Cache a response body with the validators from its headers.
+
+        Args:
+            url: Request URL
+            params: Query parameters, including api_key
+            body: Decoded JSON response
+            headers: Response headers (default: none)
+
+        Returns:
+            The stored entry
+        """
+        headers = headers or {}
+        entry = {
+            "url": url,
+            "params": {str(k): str(v) for k, v in params.items() if k not in STRIPPED_PARAMS},
+            "stored_at": self._clock(),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "body": body,
+        }
+        self.backend.put(cache_key(url, params), json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+        self._record("stores")
+        return entry
+
+    def renew(self, url: str, params: Mapping, entry: dict) -> dict:
+        """
+        Restart the TTL of an entry FRED confirmed unchanged with a 304.
+
+        Args:
+            url: Request URL
+            params: Query parameters, including api_key
+            entry: Entry returned by lookup
+
+        Returns:
+            The renewed entry
+        """
+        entry = {**entry, "stored_at": self._clock()}
+        self.backend.put(cache_key(url, params), json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+        self._record("revalidations")
+        return entry
@@ -0,0 +1,79 @@
+import logging
+from typing import Iterable
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# S3 rejects multipart parts smaller than 5 MiB (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+
+def upload_stream(
+    s3_client,
+    bucket: str,
+    key: str,
+    chunks: Iterable[bytes],
+    part_size: int = DEFAULT_PART_SIZE,
+    **put_kwargs,
+) -> dict:
+    """
+    Upload a stream of byte chunks to S3, holding at most about one part in memory.
+
+    Bodies smaller than part_size are sent with a single put_object; larger ones switch to a
+    multipart upload of fixed-size parts, which is aborted if anything fails.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket: Destination bucket
+        key: Destination object key
+        chunks: Iterable of body chunks
+        part_size: Multipart part size in bytes (default: 8 MiB, minimum: 5 MiB)
+        **put_kwargs: Extra object arguments such as ContentType and ContentEncoding
+
+    Returns:
+        put_object or complete_multipart_upload response
+
+    Raises:
+        ValueError: If part_size is below the S3 minimum
+        ClientError: If the upload fails
+    """
+    if part_size < MIN_PART_SIZE:
+        raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
+
+    buffer = bytearray()
+    upload_id = None
+    parts = []
+
+    def upload_part(body: bytes) -> None:
+        part_number = len(parts) + 1
+        response = s3_client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=body)
+        parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+    try:
+        for chunk in chunks:
+            buffer += chunk
+            while len(buffer) >= part_size:
+                if upload_id is None:
+                    upload_id = s3_client.create_multipart_upload(Bucket=bucket, Key=key, **put_kwargs)["UploadId"]
+                upload_part(bytes(buffer[:part_size]))
+                del buffer[:part_size]
+
+        if upload_id is None:
+            return s3_client.put_object(Bucket=bucket, Key=key, Body=bytes(buffer), **put_kwargs)
+
+        if buffer:
+            upload_part(bytes(buffer))
+            buffer.clear()
+
+        response = s3_client.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+        )
+        logger.info(f"[s3_upload][upload_stream] Uploaded s3://{bucket}/{key} in {len(parts)} parts")
+        return response
+
+    except Exception:
+        if upload_id is not None:
+            logger.error(f"[s3_upload][upload_stream] Aborting multipart upload for s3://{bucket}/{key}")
+            s3_client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
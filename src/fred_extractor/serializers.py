@@ -0,0 +1,322 @@
+import gzip
+import io
+import json
+import zlib
+from typing import Iterable, Iterator, Optional
+
+# FRED reports missing observations as "." rather than leaving the value out
+FRED_MISSING_VALUE = "."
+
+# Optional date columns of a Parquet object, restored by decode_response when set
+REALTIME_FIELDS = ("realtime_start", "realtime_end")
+
+# Serializers hand bytes to the uploader in pieces of roughly this size
+CHUNK_SIZE = 64 * 1024
+
+
+def _coalesce(pieces: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Join many small string pieces into UTF-8 chunks of about chunk_size bytes."""
+    buffer = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+class JsonSerializer:
+    """Serializes the raw FRED API response as indented JSON."""
+
+    FORMAT = "json"
+    EXTENSION = "json"
+    CONTENT_TYPE = "application/json"
+    CONTENT_ENCODING: Optional[str] = None
+    ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+    def iter_chunks(self, api_response: dict) -> Iterator[bytes]:
+        """
+        Serialize an API response incrementally.
+
+        Args:
+            api_response: FRED API response containing observations
+
+        Returns:
+            Iterator of body chunks; memory use is bounded by CHUNK_SIZE, not the payload size
+        """
+        return _coalesce(self.ENCODER.iterencode(api_response))
+
+    def serialize(self, api_response: dict) -> bytes:
+        """
+        Serialize an API response.
+
+        Args:
+            api_response: FRED API response containing observations
+
+        Returns:
+            Serialized object body
+        """
+        return b"".join(self.iter_chunks(api_response))
+
+
+class CompactJsonSerializer(JsonSerializer):
+    """Serializes the raw FRED API response as JSON without whitespace."""
+
+    FORMAT = "json-compact"
+    ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+class NdjsonSerializer(JsonSerializer):
+    """Serializes FRED observations as newline-delimited JSON, one observation per line."""
+
+    FORMAT = "ndjson"
+    EXTENSION = "ndjson"
+    CONTENT_TYPE = "application/x-ndjson"
+    ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+    def iter_chunks(self, api_response: dict) -> Iterator[bytes]:
+        lines = (self.ENCODER.encode(o) + "\n" for o in api_response.get("observations", []))
+        return _coalesce(lines)
+
+
+class ParquetSerializer:
+    """
+    Serializes FRED observations as a typed Parquet table.
+
+    Columns: date (date32), value (float64, null where FRED reports "."),
+    realtime_start (date32) and realtime_end (date32).
+    """
+
+    FORMAT = "parquet"
+    EXTENSION = "parquet"
+    CONTENT_TYPE = "application/vnd.apache.parquet"
+    CONTENT_ENCODING: Optional[str] = None
+    COMPRESSION = "snappy"
+
+    @staticmethod
+    def parse_value(value: Optional[str]) -> Optional[float]:
+        """Convert a FRED observation value to float, mapping the missing marker to None."""
+        if value is None or value == FRED_MISSING_VALUE:
+            return None
+        return float(value)
+
+    @staticmethod
+    def schema():
+        import pyarrow as pa
+
+        return pa.schema(
+            [
+                pa.field("date", pa.date32(), nullable=False),
+                pa.field("value", pa.float64()),
+                pa.field("realtime_start", pa.date32()),
+                pa.field("realtime_end", pa.date32()),
+            ]
+        )
+
+    def to_table(self, api_response: dict):
+        """
+        Build a pyarrow Table from an API response.
+
+        Args:
+            api_response: FRED API response containing observations
+
+        Returns:
+            pyarrow.Table with the typed observation columns
+        """
+        import datetime
+
+        import pyarrow as pa
+
+        observations = api_response.get("observations", [])
+
+        def dates(field):
+            return [datetime.date.fromisoformat(o[field]) if o.get(field) else None for o in observations]
+
+        return pa.table(
+            {
+                "date": dates("date"),
+                "value": [self.parse_value(o.get("value")) for o in observations],
+                "realtime_start": dates("realtime_start"),
+                "realtime_end": dates("realtime_end"),
+            },
+            schema=self.schema(),
+        )
+
+    def serialize(self, api_response: dict) -> bytes:
+        """
+        Serialize an API response.
+
+        Args:
+            api_response: FRED API response containing observations
+
+        Returns:
+            Serialized object body
+        """
+        # pyarrow is imported lazily so the JSON path does not pay its import cost
+        import pyarrow.parquet as pq
+
+        buffer = io.BytesIO()
+        pq.write_table(self.to_table(api_response), buffer, compression=self.COMPRESSION)
+        return buffer.getvalue()
+
+    def iter_chunks(self, api_response: dict) -> Iterator[bytes]:
+        # Parquet needs the whole table to write its footer, so it is produced in one piece
+        yield self.serialize(api_response)
+
+
+def _zstd_compressobj():
+    """Streaming zstd compressor from the standard library (3.14+) or the zstandard package."""
+    try:
+        from compression import zstd
+
+        return zstd.ZstdCompressor()
+    except ImportError:
+        pass
+
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd compression requires Python 3.14+ or the 'zstandard' package") from None
+    return zstandard.ZstdCompressor().compressobj()
+
+
+def zstd_decompress(data: bytes) -> bytes:
+    """Decompress a zstd frame with the standard library (3.14+) or the zstandard package."""
+    try:
+        from compression import zstd
+
+        return zstd.decompress(data)
+    except ImportError:
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+class CompressedSerializer:
+    """Wraps a serializer and compresses its output as it is produced."""
+
+    CODECS = {
+        "gzip": ("gz", lambda: zlib.compressobj(wbits=31)),
+        "zstd": ("zst", _zstd_compressobj),
+    }
+
+    def __init__(self, serializer, compression: str) -> None:
+        """
+        Initialize the compressing serializer.
+
+        Args:
+            serializer: Serializer whose output is compressed
+            compression: Codec name, one of CODECS
+
+        Raises:
+            ValueError: If the codec is unknown or cannot wrap the serializer
+        """
+        if compression not in self.CODECS:
+            raise ValueError(
+                f"Unsupported compression '{compression}', expected one of: {', '.join(sorted(self.CODECS))}"
+            )
+        if isinstance(serializer, ParquetSerializer):
+            raise ValueError("Parquet output is compressed internally and cannot be wrapped")
+
+        suffix, self._compressobj = self.CODECS[compression]
+        self.serializer = serializer
+        self.FORMAT = serializer.FORMAT
+        self.EXTENSION = f"{serializer.EXTENSION}.{suffix}"
+        self.CONTENT_TYPE = serializer.CONTENT_TYPE
+        self.CONTENT_ENCODING = compression
+
+    def iter_chunks(self, api_response: dict) -> Iterator[bytes]:
+        compressor = self._compressobj()
+        for chunk in self.serializer.iter_chunks(api_response):
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    def serialize(self, api_response: dict) -> bytes:
+        return b"".join(self.iter_chunks(api_response))
+
+
+SERIALIZERS = {
+    serializer.FORMAT: serializer
+    for serializer in (JsonSerializer, CompactJsonSerializer, NdjsonSerializer, ParquetSerializer)
+}
+
+
+def get_serializer(output_format: str, compression: Optional[str] = None):
+    """
+    Return a serializer instance for the output format.
+
+    Args:
+        output_format: One of the keys of SERIALIZERS
+        compression: Optional codec applied to the output, "gzip" or "zstd"
+
+    Returns:
+        Serializer instance
+
+    Raises:
+        ValueError: If the output format or compression is not supported
+    """
+    try:
+        serializer = SERIALIZERS[output_format]()
+    except KeyError:
+        raise ValueError(
+            f"Unsupported output format '{output_format}', expected one of: {', '.join(sorted(SERIALIZERS))}"
+        ) from None
+
+    return CompressedSerializer(serializer, compression) if compression else serializer
+
+
+def object_extensions() -> list:
+    """
+    Every extension get_serializer can give a stored object, e.g. json, ndjson.gz, parquet.
+
+    Returns:
+        Sorted list of extensions without the leading dot
+    """
+    extensions = set()
+    for serializer in SERIALIZERS.values():
+        extensions.add(serializer.EXTENSION)
+        if serializer is not ParquetSerializer:
+            extensions.update(f"{serializer.EXTENSION}.{suffix}" for suffix, _ in CompressedSerializer.CODECS.values())
+    return sorted(extensions)
+
+
+def decode_response(key: str, body: bytes) -> dict:
+    """
+    Decode a stored object back into a FRED API response.
+
+    NDJSON and Parquet objects only hold observations, so their response has no other fields.
+
+    Args:
+        key: Object key; its extension selects the format and compression
+        body: Object body
+
+    Returns:
+        API response dictionary with 'observations'
+    """
+    if key.endswith(".gz"):
+        body, key = gzip.decompress(body), key[:-3]
+    elif key.endswith(".zst"):
+        body, key = zstd_decompress(body), key[:-4]
+
+    if key.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        observations = []
+        for row in pq.read_table(io.BytesIO(body)).to_pylist():
+            observation = {
+                "date": row["date"].isoformat(),
+                "value": FRED_MISSING_VALUE if row["value"] is None else row["value"],
+            }
+            # Realtime columns are kept when present so a compacted object keeps them too
+            observation.update((field, row[field].isoformat()) for field in REALTIME_FIELDS if row.get(field))
+            observations.append(observation)
+        return {"observations": observations}
+    if key.endswith(".ndjson"):
+        return {"observations": [json.loads(line) for line in body.splitlines() if line.strip()]}
+    return json.loads(body)
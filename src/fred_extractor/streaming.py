@@ -0,0 +1,163 @@
+import codecs
+import json
+from typing import Iterable, Iterator
+
+# Observations handed to the storage stage at a time in streaming mode
+DEFAULT_CHUNK_SIZE = 10000
+# Bytes requested from the HTTP response per read
+READ_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+
+
+class ObservationStream:
+    """
+    Incrementally parses a FRED observations response from a stream of byte chunks.
+
+    Observations are yielded one at a time (or in lists with `chunks`) while the body is still
+    being read, so memory holds one read buffer and the current chunk rather than the whole body
+    and a dict of every observation. Top-level fields other than "observations" are collected in
+    `metadata`; FRED sends them before the observations, but any that follow are added once the
+    stream is exhausted.
+    """
+
+    def __init__(self, byte_chunks: Iterable[bytes]) -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            byte_chunks: Response body chunks, e.g. response.iter_content(READ_SIZE)
+        """
+        self.metadata: dict = {}
+        self.has_observations = False
+        self._chunks = iter(byte_chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._started = False
+
+    def _read(self) -> bool:
+        """Append the next chunk to the buffer; False once the stream is exhausted."""
+        if self._eof:
+            return False
+        # Drop consumed text so the buffer only ever holds unparsed input
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._eof = True
+        return False
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, without consuming it ('' at end of stream)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                return ""
+
+    def _expect(self, characters: str) -> str:
+        character = self._peek()
+        if not character or character not in characters:
+            raise ValueError(f"Invalid JSON in API response: expected one of {characters!r}, got {character!r}")
+        self._pos += 1
+        return character
+
+    def _value(self):
+        """Decode the next complete JSON value."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise ValueError(f"Invalid JSON in API response: {e}") from e
+            self._read()
+
+    def _array(self) -> Iterator:
+        """Yield the elements of the JSON array at the current position one by one."""
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(",]") == "]":
+                return
+
+    def __iter__(self) -> Iterator[dict]:
+        if self._started:
+            raise RuntimeError("ObservationStream can only be iterated once")
+        self._started = True
+
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise ValueError("Invalid JSON in API response: object keys must be strings")
+            self._expect(":")
+
+            if key == "observations":
+                self.has_observations = True
+                yield from self._array()
+            else:
+                self.metadata[key] = self._value()
+
+            if self._expect(",}") == "}":
+                break
+
+        if self._peek():
+            raise ValueError("Invalid JSON in API response: unexpected data after the response object")
+
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list]:
+        """
+        Yield observations in lists of at most chunk_size.
+
+        Args:
+            chunk_size: Observations per list (default: 10000)
+
+        Returns:
+            Iterator of observation lists
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        chunk = []
+        for observation in self:
+            chunk.append(observation)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def validate_observations(observations: list, first_index: int = 0) -> None:
+    """
+    Validate one chunk of observations from a streamed response.
+
+    Args:
+        observations: Observation dictionaries
+        first_index: Position of the first observation in the response, for error messages
+
+    Raises:
+        ValueError: If an observation is not an object with a date
+    """
+    for index, observation in enumerate(observations, start=first_index):
+        if not isinstance(observation, dict) or not isinstance(observation.get("date"), str):
+            raise ValueError(f"API response observation {index} must be an object with a 'date'")
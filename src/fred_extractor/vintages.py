@@ -0,0 +1,324 @@
+import datetime
+import io
+import json
+import logging
+from collections import defaultdict
+from itertools import groupby
+from typing import Iterable, Optional
+
+from botocore.exceptions import ClientError
+
+from .dates import DateLike, to_date
+from .watermark import MISSING_OBJECT_ERROR_CODES, WATERMARK_PREFIX
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+VINTAGE_PREFIX = "fred-vintages"
+# ALFRED's bounds for "every vintage" and "still current"
+EARLIEST_REALTIME = "1776-07-04"
+LATEST_REALTIME = "9999-12-31"
+# Vintages replayed on top of a checkpoint at most; bounds the work of one as_of call
+DEFAULT_CHECKPOINT_INTERVAL = 50
+COMPRESSION = "zstd"
+
+
+def vintage_index_key(series_id: str) -> str:
+    """
+    S3 key of the vintage index for a series.
+
+    Example:
+        fred-state/GDP/vintages.json
+    """
+    return f"{WATERMARK_PREFIX}/{series_id}/vintages.json"
+
+
+def _day_after(value: str) -> str:
+    return (datetime.date.fromisoformat(value) + datetime.timedelta(days=1)).isoformat()
+
+
+def _day_before(value: str) -> str:
+    return (datetime.date.fromisoformat(value) - datetime.timedelta(days=1)).isoformat()
+
+
+def _value_periods(date: str, rows: list, after: Optional[str]) -> list:
+    """(realtime_start, date, value, realtime_end) of one date's values, with None while it was absent."""
+    periods = []
+    previous_end = None
+    for row in sorted(rows, key=lambda r: r["realtime_start"]):
+        start, end = row["realtime_start"], row["realtime_end"]
+        if after is not None and start <= after:
+            if end <= after:
+                # Superseded before the stored vintages end; already reflected in the state
+                continue
+            start = _day_after(after)
+        if previous_end is not None and start > _day_after(previous_end):
+            periods.append((_day_after(previous_end), date, None, _day_before(start)))
+        periods.append((start, date, row["value"], end))
+        previous_end = end
+    if previous_end is not None and previous_end != LATEST_REALTIME:
+        periods.append((_day_after(previous_end), date, None, LATEST_REALTIME))
+    return periods
+
+
+def revision_deltas(observations: Iterable[dict], state: Optional[dict] = None, after: Optional[str] = None) -> list:
+    """
+    Turn ALFRED real-time periods into revision deltas.
+
+    Each observation row holds one value of one date and the real-time period it was current
+    (output_type=1). A delta is emitted whenever a date's value changes: when it first appears,
+    when it is revised, and (with a null new_value) when it is withdrawn.
+
+    Args:
+        observations: Rows with date, value, realtime_start and realtime_end
+        state: Values as of `after`, which the first deltas are compared with (default: empty)
+        after: Last vintage already stored; earlier real-time periods count from the day after
+
+    Returns:
+        Deltas with date, old_value, new_value, realtime_start and realtime_end (when the new
+        value stopped being current, as known now), sorted by realtime_start then date
+    """
+    by_date = defaultdict(list)
+    for observation in observations:
+        by_date[observation["date"]].append(observation)
+
+    events = [event for date, rows in by_date.items() for event in _value_periods(date, rows, after)]
+    values = dict(state or {})
+    deltas = []
+    for realtime_start, date, value, realtime_end in sorted(events, key=lambda event: event[:2]):
+        old_value = values.get(date)
+        if old_value == value:
+            continue
+        if value is None:
+            values.pop(date)
+        else:
+            values[date] = value
+        deltas.append(
+            {
+                "date": date,
+                "old_value": old_value,
+                "new_value": value,
+                "realtime_start": realtime_start,
+                "realtime_end": realtime_end,
+            }
+        )
+    return deltas
+
+
+def apply_deltas(state: dict, deltas: Iterable[dict]) -> dict:
+    """Apply deltas in order to a date -> value dictionary, in place."""
+    for delta in deltas:
+        if delta["new_value"] is None:
+            state.pop(delta["date"], None)
+        else:
+            state[delta["date"]] = delta["new_value"]
+    return state
+
+
+class VintageStore:
+    """
+    Point-in-time storage of a series as checkpoints plus revision deltas.
+
+    The first vintage is stored as a full snapshot (checkpoint); later vintages are stored only
+    as the values they changed. Every checkpoint_interval vintages a new checkpoint starts a new
+    delta segment, so rebuilding any vintage reads one checkpoint and replays at most one segment.
+    Objects live under fred-vintages/{series_id}/; the segment list is kept in
+    fred-state/{series_id}/vintages.json.
+    """
+
+    def __init__(self, s3_client, bucket: str, checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL) -> None:
+        """
+        Initialize the vintage store.
+
+        Args:
+            s3_client: boto3 S3 client
+            bucket: Bucket holding the vintage objects
+            checkpoint_interval: Vintages per delta segment (default: 50)
+
+        Raises:
+            ValueError: If checkpoint_interval is less than 1
+        """
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be at least 1")
+
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.checkpoint_interval = checkpoint_interval
+
+    @staticmethod
+    def checkpoint_schema():
+        import pyarrow as pa
+
+        return pa.schema([pa.field("date", pa.date32(), nullable=False), pa.field("value", pa.string())])
+
+    @staticmethod
+    def delta_schema():
+        import pyarrow as pa
+
+        return pa.schema(
+            [
+                pa.field("date", pa.date32(), nullable=False),
+                pa.field("old_value", pa.string()),
+                pa.field("new_value", pa.string()),
+                pa.field("realtime_start", pa.date32(), nullable=False),
+                pa.field("realtime_end", pa.date32(), nullable=False),
+            ]
+        )
+
+    def load_index(self, series_id: str) -> Optional[dict]:
+        """
+        Read the vintage index of a series.
+
+        Returns:
+            Dictionary with last_vintage and segments, or None if no vintages are stored
+
+        Raises:
+            ClientError: If the index exists but cannot be read
+        """
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=vintage_index_key(series_id))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in MISSING_OBJECT_ERROR_CODES:
+                return None
+            raise
+        return json.loads(response["Body"].read())
+
+    def _write_table(self, key: str, columns: dict, schema) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        buffer = io.BytesIO()
+        pq.write_table(pa.table(columns, schema=schema), buffer, compression=COMPRESSION)
+        self.s3_client.put_object(
+            Bucket=self.bucket, Key=key, Body=buffer.getvalue(), ContentType="application/vnd.apache.parquet"
+        )
+
+    def _read_rows(self, key: str) -> list:
+        import pyarrow.parquet as pq
+
+        body = self.s3_client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+        rows = pq.read_table(io.BytesIO(body)).to_pylist()
+        for row in rows:
+            for field, value in row.items():
+                if isinstance(value, datetime.date):
+                    row[field] = value.isoformat()
+        return rows
+
+    def _write_checkpoint(self, key: str, state: dict) -> None:
+        dates = sorted(state)
+        columns = {"date": [datetime.date.fromisoformat(d) for d in dates], "value": [state[d] for d in dates]}
+        self._write_table(key, columns, self.checkpoint_schema())
+
+    def _write_deltas(self, key: str, deltas: list) -> None:
+        columns = {field.name: [delta[field.name] for delta in deltas] for field in self.delta_schema()}
+        for field in ("date", "realtime_start", "realtime_end"):
+            columns[field] = [datetime.date.fromisoformat(value) for value in columns[field]]
+        self._write_table(key, columns, self.delta_schema())
+
+    def _read_segment(self, segment: dict) -> tuple:
+        """(checkpoint state, deltas) of a segment."""
+        state = {row["date"]: row["value"] for row in self._read_rows(segment["checkpoint_key"])}
+        deltas = self._read_rows(segment["deltas_key"]) if segment["deltas"] else []
+        return state, deltas
+
+    def _new_segment(self, series_id: str, vintage: str) -> dict:
+        return {
+            "vintage": vintage,
+            "checkpoint_key": f"{VINTAGE_PREFIX}/{series_id}/checkpoint-{vintage}.parquet",
+            "deltas_key": f"{VINTAGE_PREFIX}/{series_id}/deltas-{vintage}.parquet",
+            "vintages": 0,
+            "deltas": 0,
+        }
+
+    def update(self, series_id: str, observations: Iterable[dict]) -> dict:
+        """
+        Store the vintages in observations that are newer than the stored ones.
+
+        Args:
+            series_id: FRED series identifier
+            observations: ALFRED real-time period rows, e.g. from FredExtractor.request_vintages
+
+        Returns:
+            Dictionary with the vintages and deltas added, checkpoints written and the last vintage
+
+        Raises:
+            ClientError: If S3 fails
+        """
+        index = self.load_index(series_id) or {"series_id": series_id, "last_vintage": None, "segments": []}
+        segment = index["segments"][-1] if index["segments"] else None
+        state, segment_deltas = self._read_segment(segment) if segment else ({}, [])
+        apply_deltas(state, segment_deltas)
+
+        deltas = revision_deltas(observations, state, after=index["last_vintage"])
+        summary = {"Vintages": 0, "Deltas": len(deltas), "Checkpoints": 0}
+        dirty = False
+
+        for vintage, group in groupby(deltas, key=lambda delta: delta["realtime_start"]):
+            group = list(group)
+            apply_deltas(state, group)
+            if segment is None or segment["vintages"] >= self.checkpoint_interval:
+                if dirty:
+                    self._write_deltas(segment["deltas_key"], segment_deltas)
+                segment = self._new_segment(series_id, vintage)
+                index["segments"].append(segment)
+                self._write_checkpoint(segment["checkpoint_key"], state)
+                segment_deltas, dirty = [], False
+                summary["Checkpoints"] += 1
+            else:
+                segment_deltas.extend(group)
+                segment["vintages"] += 1
+                segment["deltas"] += len(group)
+                dirty = True
+            index["last_vintage"] = vintage
+            summary["Vintages"] += 1
+
+        if dirty:
+            self._write_deltas(segment["deltas_key"], segment_deltas)
+        if summary["Vintages"]:
+            # Written last: readers never see segments whose objects are not all in place
+            self.s3_client.put_object(
+                Bucket=self.bucket,
+                Key=vintage_index_key(series_id),
+                Body=json.dumps(index, separators=(",", ":")).encode("utf-8"),
+                ContentType="application/json",
+            )
+
+        logger.info(
+            f"[VintageStore][update] {series_id}: {summary['Vintages']} new vintages, {summary['Deltas']} deltas, "
+            f"{summary['Checkpoints']} checkpoints"
+        )
+        return {**summary, "LastVintage": index["last_vintage"]}
+
+    def as_of(self, series_id: str, realtime: DateLike) -> dict:
+        """
+        Rebuild a series as it was published on a given date.
+
+        Args:
+            series_id: FRED series identifier
+            realtime: Real-time date (vintage) to rebuild
+
+        Returns:
+            FRED-style response with realtime_start/realtime_end set to the date and the
+            observations current on it (empty before the first stored vintage)
+
+        Raises:
+            ClientError: If S3 fails
+        """
+        realtime = to_date(realtime).isoformat()
+        index = self.load_index(series_id) or {"segments": []}
+        segments = [segment for segment in index["segments"] if segment["vintage"] <= realtime]
+
+        state = {}
+        if segments:
+            state, deltas = self._read_segment(segments[-1])
+            apply_deltas(state, (delta for delta in deltas if delta["realtime_start"] <= realtime))
+
+        return {
+            "realtime_start": realtime,
+            "realtime_end": realtime,
+            "count": len(state),
+            "observations": [
+                {"realtime_start": realtime, "realtime_end": realtime, "date": date, "value": state[date]}
+                for date in sorted(state)
+            ],
+        }
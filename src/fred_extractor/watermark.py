@@ -0,0 +1,79 @@
+import json
+import logging
+from typing import Optional
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Kept outside the fred/ prefix so state objects never show up in data scans
+WATERMARK_PREFIX = "fred-state"
+MISSING_OBJECT_ERROR_CODES = frozenset({"NoSuchKey", "404"})
+
+
+def watermark_key(series_id: str) -> str:
+    """
+    S3 key of the watermark object for a series.
+
+    Example:
+        fred-state/SP500/watermark.json
+    """
+    return f"{WATERMARK_PREFIX}/{series_id}/watermark.json"
+
+
+def load_watermark(s3_client, bucket: str, series_id: str) -> Optional[dict]:
+    """
+    Read the watermark for a series.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket: Bucket holding the state object
+        series_id: FRED series identifier
+
+    Returns:
+        Dictionary with last_observation_date and last_updated, or None if no watermark exists
+
+    Raises:
+        ClientError: If the object exists but cannot be read
+    """
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=watermark_key(series_id))
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in MISSING_OBJECT_ERROR_CODES:
+            logger.info(f"[watermark][load_watermark] No watermark found for {series_id}")
+            return None
+        raise
+
+    return json.loads(response["Body"].read())
+
+
+def save_watermark(
+    s3_client, bucket: str, series_id: str, last_observation_date: Optional[str], last_updated: Optional[str]
+) -> dict:
+    """
+    Write the watermark for a series.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket: Bucket holding the state object
+        series_id: FRED series identifier
+        last_observation_date: Latest observation date stored, 'YYYY-MM-DD'
+        last_updated: FRED last_updated timestamp of the series when it was stored
+
+    Returns:
+        The watermark that was written
+    """
+    watermark = {
+        "series_id": series_id,
+        "last_observation_date": last_observation_date,
+        "last_updated": last_updated,
+    }
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=watermark_key(series_id),
+        Body=json.dumps(watermark).encode("utf-8"),
+        ContentType="application/json",
+    )
+    logger.info(f"[watermark][save_watermark] Saved watermark for {series_id}: {watermark}")
+    return watermark
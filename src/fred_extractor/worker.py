@@ -0,0 +1,383 @@
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+import boto3
+
+from . import aws_cache
+from .fred_client import FredClient
+from .fred_extractor import FredExtractor
+from .metrics import MetricsLogger
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+DEFAULT_VISIBILITY_TIMEOUT = 900
+# SQS returns at most 10 messages per receive and long-polls for at most 20 seconds
+MAX_RECEIVE_MESSAGES = 10
+DEFAULT_WAIT_SECONDS = 20
+# Receives after which a job that keeps failing is dropped instead of being redelivered forever
+DEFAULT_MAX_RECEIVES = 5
+
+
+class QueueMessage:
+    """A received job: its decoded body, the receipt handle that deletes it and how often it was received."""
+
+    def __init__(self, message_id: str, receipt_handle: str, body: dict, receive_count: int = 1) -> None:
+        self.message_id = message_id
+        self.receipt_handle = receipt_handle
+        self.body = body
+        self.receive_count = receive_count
+
+
+class SqsQueue:
+    """Job queue backed by an SQS queue."""
+
+    def __init__(self, sqs_client, queue_url: str) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            sqs_client: boto3 SQS client
+            queue_url: Queue URL
+        """
+        self.sqs_client = sqs_client
+        self.queue_url = queue_url
+
+    def send(self, body: dict) -> str:
+        return self.sqs_client.send_message(QueueUrl=self.queue_url, MessageBody=json.dumps(body))["MessageId"]
+
+    def receive(self, max_messages: int, visibility_timeout: int, wait_seconds: float) -> list:
+        response = self.sqs_client.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=min(max_messages, MAX_RECEIVE_MESSAGES),
+            VisibilityTimeout=visibility_timeout,
+            WaitTimeSeconds=int(min(wait_seconds, DEFAULT_WAIT_SECONDS)),
+            MessageSystemAttributeNames=["ApproximateReceiveCount"],
+        )
+        return [
+            QueueMessage(
+                m["MessageId"],
+                m["ReceiptHandle"],
+                json.loads(m["Body"]),
+                int(m.get("Attributes", {}).get("ApproximateReceiveCount", 1)),
+            )
+            for m in response.get("Messages", [])
+        ]
+
+    def delete(self, message: QueueMessage) -> None:
+        self.sqs_client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=message.receipt_handle)
+
+    def change_visibility(self, message: QueueMessage, visibility_timeout: int) -> None:
+        self.sqs_client.change_message_visibility(
+            QueueUrl=self.queue_url, ReceiptHandle=message.receipt_handle, VisibilityTimeout=visibility_timeout
+        )
+
+
+class LocalQueue:
+    """
+    In-process job queue with SQS visibility-timeout semantics, for tests and local runs.
+
+    Received messages stay in the queue, hidden until their visibility timeout expires, and are
+    only removed by delete with the receipt handle of the latest receive. With a path the queue
+    is kept in a JSON file, so jobs survive a restart of the worker.
+    """
+
+    def __init__(self, path: Optional[str] = None, clock: Callable[[], float] = time.time) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            path: JSON file the queue is kept in (default: memory only)
+            clock: Wall clock in epoch seconds, injectable for tests
+        """
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._messages = []
+        if path and os.path.exists(path):
+            with open(path) as file:
+                self._messages = json.load(file)
+
+    def _save(self) -> None:
+        if self.path:
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w") as file:
+                json.dump(self._messages, file)
+            os.replace(temporary, self.path)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._messages)
+
+    def send(self, body: dict) -> str:
+        message_id = str(uuid.uuid4())
+        with self._lock:
+            self._messages.append({"id": message_id, "body": body, "visible_at": 0, "receipt": None})
+            self._save()
+        return message_id
+
+    def receive(self, max_messages: int, visibility_timeout: int, wait_seconds: float = 0) -> list:
+        deadline = self._clock() + wait_seconds
+        while True:
+            received = []
+            with self._lock:
+                now = self._clock()
+                for message in self._messages:
+                    if len(received) >= min(max_messages, MAX_RECEIVE_MESSAGES):
+                        break
+                    if message["visible_at"] <= now:
+                        message["visible_at"] = now + visibility_timeout
+                        message["receipt"] = str(uuid.uuid4())
+                        message["receives"] = message.get("receives", 0) + 1
+                        received.append(
+                            QueueMessage(message["id"], message["receipt"], message["body"], message["receives"])
+                        )
+                if received:
+                    self._save()
+            if received or self._clock() >= deadline:
+                return received
+            time.sleep(min(0.05, max(0.0, deadline - self._clock())))
+
+    def delete(self, message: QueueMessage) -> None:
+        with self._lock:
+            # A stale receipt (the message was received again after its timeout) deletes nothing, as in SQS
+            self._messages = [m for m in self._messages if m["receipt"] != message.receipt_handle]
+            self._save()
+
+    def change_visibility(self, message: QueueMessage, visibility_timeout: int) -> None:
+        with self._lock:
+            for m in self._messages:
+                if m["receipt"] == message.receipt_handle:
+                    m["visible_at"] = self._clock() + visibility_timeout
+            self._save()
+
+
+class Worker:
+    """
+    Long-running process that drains (series, date range) backfill jobs from a queue.
+
+    Jobs are processed on a thread pool with one FRED client, API key and S3 client shared by all
+    of them, so a large backfill pays for one process start rather than one Lambda invocation per
+    job. Each job runs the same FredExtractor.backfill as the Lambda handler. A job's message is
+    deleted only after it succeeds; the visibility of in-flight messages is extended while they
+    run, including during shutdown, and failed jobs reappear once their visibility timeout expires.
+    A job received more than max_receives times is logged and dropped rather than run again.
+
+    Job body: {"series_id": "SP500", "start": "2000-01-01", "end": "2000-12-31"} (end defaults to
+    the day before the job is processed).
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(
+        self,
+        queue,
+        session: boto3.Session,
+        bucket: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        visibility_timeout: int = DEFAULT_VISIBILITY_TIMEOUT,
+        wait_seconds: float = DEFAULT_WAIT_SECONDS,
+        max_receives: int = DEFAULT_MAX_RECEIVES,
+        fred_client: Optional[FredClient] = None,
+        metrics: Optional[MetricsLogger] = None,
+        clock: Callable[[], float] = time.monotonic,
+        **extractor_options,
+    ) -> None:
+        """
+        Initialize the worker.
+
+        Args:
+            queue: SqsQueue, LocalQueue or another object with receive, delete and change_visibility
+            session: Boto3 session for AWS service access
+            bucket: S3 bucket name for data storage
+            max_workers: Jobs processed at once (default: 8)
+            visibility_timeout: Seconds a received job stays hidden, extended while it runs (default: 900)
+            wait_seconds: Long-poll wait of an empty receive (default: 20)
+            max_receives: Receives of one job before it is dropped as poison (default: 5)
+            fred_client: Shared FRED HTTP client (default: a new client sized to max_workers)
+            metrics: EMF metrics logger shared by every extractor (default: one writing to stdout)
+            clock: Monotonic clock for throughput, injectable for tests
+            **extractor_options: Further FredExtractor arguments, e.g. output_format or compression
+
+        Raises:
+            ValueError: If max_workers, visibility_timeout or max_receives is not positive
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if visibility_timeout < 1:
+            raise ValueError("visibility_timeout must be at least 1 second")
+        if max_receives < 1:
+            raise ValueError("max_receives must be at least 1")
+
+        self.queue = queue
+        self.session = session
+        self.bucket = bucket
+        self.max_workers = max_workers
+        self.visibility_timeout = visibility_timeout
+        self.wait_seconds = wait_seconds
+        self.max_receives = max_receives
+        self.fred_client = fred_client or FredClient(pool_size=max_workers)
+        self.metrics = metrics or MetricsLogger()
+        self.extractor_options = extractor_options
+        self._clock = clock
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {"succeeded": 0, "failed": 0, "dropped": 0, "objects_written": 0}
+        self._started_at: Optional[float] = None
+
+    @property
+    def stats(self) -> dict:
+        """Jobs succeeded, failed and dropped, objects written, and jobs per second since run started."""
+        with self._lock:
+            stats = dict(self._stats)
+        elapsed = self._clock() - self._started_at if self._started_at is not None else 0.0
+        stats["elapsed_seconds"] = elapsed
+        stats["jobs_per_second"] = (stats["succeeded"] + stats["failed"]) / elapsed if elapsed > 0 else 0.0
+        return stats
+
+    def stop(self) -> None:
+        """Stop receiving jobs; run returns once the jobs in flight have finished."""
+        self._stop.set()
+
+    @staticmethod
+    def _event() -> dict:
+        # Backfills without an end stop the day before the job runs, as for a scheduled invocation
+        return {"time": datetime.datetime.now(datetime.timezone.utc).isoformat()}
+
+    def _extractor(self, series_id: str, api_key: str, s3_client) -> FredExtractor:
+        return FredExtractor(
+            self._event(),
+            None,
+            self.session,
+            bucket=self.bucket,
+            series_id=series_id,
+            api_key=api_key,
+            fred_client=self.fred_client,
+            s3_client=s3_client,
+            metrics=self.metrics,
+            **self.extractor_options,
+        )
+
+    def process(self, message: QueueMessage, api_key: str, s3_client) -> dict:
+        """
+        Run one job and delete its message when it succeeds.
+
+        Returns:
+            The backfill response
+
+        Raises:
+            Exception: If the job fails; its message is left to reappear after the visibility timeout
+        """
+        body = message.body
+        try:
+            extractor = self._extractor(body["series_id"], api_key, s3_client)
+            response = extractor.backfill(body["start"], body.get("end"))
+        except Exception as e:
+            with self._lock:
+                self._stats["failed"] += 1
+            logger.error(f"[Worker][process] Job {message.message_id} {body} failed: {str(e)}")
+            raise
+
+        self.queue.delete(message)
+        with self._lock:
+            self._stats["succeeded"] += 1
+            self._stats["objects_written"] += response.get("ObjectsWritten", 0)
+        return response
+
+    def _drop(self, message: QueueMessage) -> None:
+        """Delete a job that has failed on every one of its max_receives deliveries."""
+        logger.error(
+            f"[Worker][run] Dropping job {message.message_id} {message.body} after "
+            f"{message.receive_count} receives (limit {self.max_receives})"
+        )
+        self.queue.delete(message)
+        with self._lock:
+            self._stats["dropped"] += 1
+
+    def _extend_visibility(self, in_flight: dict) -> None:
+        for message in list(in_flight.values()):
+            try:
+                self.queue.change_visibility(message, self.visibility_timeout)
+            except Exception as e:
+                logger.warning(f"[Worker][run] Could not extend visibility of {message.message_id}: {str(e)}")
+
+    def _wait_and_heartbeat(self, in_flight: dict, timeout: float, last_heartbeat: float, heartbeat: float) -> float:
+        """Wait up to timeout for a job in flight to finish, then extend the rest when a heartbeat is due."""
+        if in_flight:
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.pop(future)
+        if self._clock() - last_heartbeat < heartbeat:
+            return last_heartbeat
+        self._extend_visibility(in_flight)
+        return self._clock()
+
+    def run(self, max_idle_receives: Optional[int] = None) -> dict:
+        """
+        Receive and process jobs until stopped.
+
+        Args:
+            max_idle_receives: Return after this many consecutive empty receives with nothing in
+                flight, e.g. 1 to drain the queue and exit (default: run until stop())
+
+        Returns:
+            Final stats
+        """
+        api_key = FredExtractor(
+            self._event(), None, self.session, self.bucket, fred_client=self.fred_client
+        ).retrieve_api_key()
+        s3_client = aws_cache.get_client(self.session, "s3")
+        self._started_at = self._clock()
+        # Extend well before the timeout runs out
+        heartbeat = self.visibility_timeout / 2
+        last_heartbeat = self._clock()
+        idle = 0
+        in_flight = {}
+
+        logger.info(f"[Worker][run] Started with {self.max_workers} workers")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while not self._stop.is_set():
+                free = self.max_workers - len(in_flight)
+                if free > 0:
+                    wait_seconds = 0 if in_flight else self.wait_seconds
+                    messages = self.queue.receive(free, self.visibility_timeout, wait_seconds)
+                    for message in messages:
+                        if message.receive_count > self.max_receives:
+                            self._drop(message)
+                            continue
+                        in_flight[executor.submit(self.process, message, api_key, s3_client)] = message
+                    idle = 0 if messages or in_flight else idle + 1
+                    if max_idle_receives is not None and idle >= max_idle_receives:
+                        break
+
+                timeout = 1 if free > 0 else heartbeat
+                last_heartbeat = self._wait_and_heartbeat(in_flight, timeout, last_heartbeat, heartbeat)
+
+            # Graceful shutdown: finish the jobs in flight, take no new ones, and keep them hidden meanwhile
+            while in_flight:
+                last_heartbeat = self._wait_and_heartbeat(in_flight, heartbeat, last_heartbeat, heartbeat)
+
+        stats = self.stats
+        logger.info(
+            f"[Worker][run] Stopped: {stats['succeeded']} jobs succeeded, {stats['failed']} failed, "
+            f"{stats['dropped']} dropped, "
+            f"{stats['objects_written']} objects written, {stats['jobs_per_second']:.2f} jobs/s"
+        )
+        self.metrics.emit(
+            "*",
+            "worker",
+            {
+                "Jobs": stats["succeeded"] + stats["failed"],
+                "Errors": stats["failed"],
+                "ObjectsWritten": stats["objects_written"],
+                "JobsPerSecond": stats["jobs_per_second"],
+            },
+        )
+        return stats
@@ -1,19 +1,112 @@
 import logging
 import os
-from typing import Any
+import tempfile
+from typing import TYPE_CHECKING, Any
 
 import boto3
 
+from fred_extractor import aws_cache
+from fred_extractor.dates import previous_month
+from fred_extractor.fred_client import FredClient
 from fred_extractor.fred_extractor import FredExtractor
+from fred_extractor.metrics import MetricsLogger
+
+# The catalog, compaction, multi-series and response cache modules are imported by the handler
+# branches that use them, so every other mode's cold start does not pay for them
+if TYPE_CHECKING:
+    from fred_extractor.catalog import SeriesCatalog
+    from fred_extractor.response_cache import ResponseCache
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 FRED_BUCKET_NAME = os.getenv("FRED_BUCKET_NAME")
 FRED_SERIES_ID = os.getenv("FRED_SERIES_ID", "SP500")
+FRED_SERIES_IDS = os.getenv("FRED_SERIES_IDS", "")
+FRED_OUTPUT_FORMAT = os.getenv("FRED_OUTPUT_FORMAT", FredExtractor.DEFAULT_OUTPUT_FORMAT)
+FRED_COMPRESSION = os.getenv("FRED_COMPRESSION") or None
+FRED_INCREMENTAL = os.getenv("FRED_INCREMENTAL", "false").lower() == "true"
+# Defaults to MultiSeriesExtractor.DEFAULT_MAX_WORKERS, spelled out to keep that module off the import path
+FRED_MAX_WORKERS = int(os.getenv("FRED_MAX_WORKERS", "16"))
+# Share of the per-key FRED rate limit for this function; an event's requests_per_minute overrides it,
+# e.g. for fan-out batches that run concurrently
+FRED_REQUESTS_PER_MINUTE = float(os.getenv("FRED_REQUESTS_PER_MINUTE", FredClient.DEFAULT_REQUESTS_PER_MINUTE))
+# "s3" shares cached responses across execution environments, "disk" keeps them in /tmp
+FRED_RESPONSE_CACHE = (os.getenv("FRED_RESPONSE_CACHE") or "").lower() or None
+# Seconds a cached response is served without revalidation; unset uses ResponseCache.DEFAULT_TTL_SECONDS
+FRED_RESPONSE_CACHE_TTL = float(os.getenv("FRED_RESPONSE_CACHE_TTL") or 0) or None
+# Seconds after its crawl a catalog's last_updated is trusted; defaults to
+# MultiSeriesExtractor.DEFAULT_CATALOG_MAX_AGE_SECONDS, older catalogs only select series
+FRED_CATALOG_MAX_AGE = float(os.getenv("FRED_CATALOG_MAX_AGE", "86400"))
+FRED_METRICS = os.getenv("FRED_METRICS", "true").lower() == "true"
+# Observations per chunk when parsing responses incrementally; unset parses whole responses
+FRED_STREAM_CHUNK_SIZE = int(os.getenv("FRED_STREAM_CHUNK_SIZE") or 0) or None
+# Comma-separated rollup frequencies kept under fred-agg/, e.g. "W,M,Q"; unset writes no rollups
+FRED_AGGREGATES = [f.strip().upper() for f in os.getenv("FRED_AGGREGATES", "").split(",") if f.strip()]
+# Event fields selecting what catalog_handler crawls, named like CatalogCrawler.crawl's arguments
+CATALOG_EVENT_FIELDS = ("release_ids", "category_ids", "series_ids")
 
 
 session = boto3.Session()
+# Module scope so warm invocations reuse pooled connections and the shared rate limiter
+fred_client = FredClient(
+    requests_per_minute=FRED_REQUESTS_PER_MINUTE, pool_size=max(FRED_MAX_WORKERS, FredClient.DEFAULT_POOL_SIZE)
+)
+
+
+def _build_response_cache() -> "ResponseCache | None":
+    """Response cache selected by FRED_RESPONSE_CACHE, or None when caching is off."""
+    if FRED_RESPONSE_CACHE is None:
+        return None
+
+    from fred_extractor.response_cache import DiskCacheBackend, ResponseCache, S3CacheBackend
+
+    if FRED_RESPONSE_CACHE == "s3":
+        backend = S3CacheBackend(aws_cache.get_client(session, "s3"), FRED_BUCKET_NAME)
+    elif FRED_RESPONSE_CACHE == "disk":
+        backend = DiskCacheBackend(os.path.join(tempfile.gettempdir(), "fred-cache"))
+    else:
+        raise ValueError(f"Unsupported FRED_RESPONSE_CACHE '{FRED_RESPONSE_CACHE}', expected 's3' or 'disk'")
+    return ResponseCache(backend, ttl_seconds=FRED_RESPONSE_CACHE_TTL or ResponseCache.DEFAULT_TTL_SECONDS)
+
+
+response_cache = _build_response_cache()
+# Per-stage EMF records on stdout become CloudWatch metrics without PutMetricData calls
+metrics = MetricsLogger(enabled=FRED_METRICS)
+
+
+def _requested_series_ids(event: dict[str, Any]) -> list[str]:
+    """Series list from the event, falling back to the comma-separated FRED_SERIES_IDS variable."""
+    series_ids = event.get("series_ids") if isinstance(event, dict) else None
+    if series_ids:
+        return list(series_ids)
+    return [series_id for series_id in FRED_SERIES_IDS.split(",") if series_id.strip()]
+
+
+def _select_from_catalog(query: dict[str, Any]) -> tuple[list[str], "SeriesCatalog"]:
+    """Series matching an event's series_query, e.g. {"frequency": "D", "release_id": 51}."""
+    from fred_extractor.catalog import SeriesCatalog
+
+    catalog = SeriesCatalog.load(aws_cache.get_client(session, "s3"), FRED_BUCKET_NAME)
+    if catalog is None:
+        raise ValueError("series_query needs a series catalog; run the catalog crawler first")
+    series_ids = catalog.select(**query)
+    logger.info(f"Series query {query} matched {len(series_ids)} series")
+    return series_ids, catalog
+
+
+def _extractor_options() -> dict[str, Any]:
+    """Keyword arguments shared by every extractor built in this execution environment."""
+    return {
+        "bucket": FRED_BUCKET_NAME,
+        "fred_client": fred_client,
+        "output_format": FRED_OUTPUT_FORMAT,
+        "compression": FRED_COMPRESSION,
+        "response_cache": response_cache,
+        "metrics": metrics,
+        "stream_chunk_size": FRED_STREAM_CHUNK_SIZE,
+        "aggregate_frequencies": FRED_AGGREGATES,
+    }
 
 
 def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
@@ -23,11 +116,130 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         raise ValueError("FRED_BUCKET_NAME environment variable is not set")
 
     try:
-        fred = FredExtractor(event, context, session, bucket=FRED_BUCKET_NAME, series_id=FRED_SERIES_ID)
-        response = fred.execute()
+        requests_per_minute = event.get("requests_per_minute") if isinstance(event, dict) else None
+        # The client outlives the invocation, so a warm start must undo an earlier event's override
+        fred_client.set_requests_per_minute(float(requests_per_minute or FRED_REQUESTS_PER_MINUTE))
+
+        backfill = event.get("backfill") if isinstance(event, dict) else None
+        if backfill:
+            fred = FredExtractor(event, context, session, series_id=FRED_SERIES_ID, **_extractor_options())
+            response = fred.backfill(backfill["start"], backfill.get("end"))
+            logger.info("Successfully executed FRED backfill")
+            return response
+
+        repair = event.get("repair") if isinstance(event, dict) else None
+        if repair:
+            fred = FredExtractor(event, context, session, series_id=FRED_SERIES_ID, **_extractor_options())
+            response = fred.repair_gaps(repair["start"], repair.get("end"), repair.get("holidays", ()))
+            logger.info("Successfully executed FRED gap repair")
+            return response
+
+        if isinstance(event, dict) and event.get("vintages"):
+            fred = FredExtractor(event, context, session, series_id=FRED_SERIES_ID, **_extractor_options())
+            response = fred.execute_vintages()
+            logger.info("Successfully executed FRED vintage extraction")
+            return response
+
+        incremental = event.get("incremental", FRED_INCREMENTAL) if isinstance(event, dict) else FRED_INCREMENTAL
+        series_query = event.get("series_query") if isinstance(event, dict) else None
+        catalog = None
+        if series_query:
+            series_ids, catalog = _select_from_catalog(series_query)
+            if not series_ids:
+                return {"HTTPStatusCode": FredExtractor.HTTP_NOT_FOUND, "Series": {}}
+        else:
+            series_ids = _requested_series_ids(event)
+        if series_ids:
+            from fred_extractor.multi_series_extractor import MultiSeriesExtractor
+
+            fred = MultiSeriesExtractor(
+                event,
+                context,
+                session,
+                series_ids=series_ids,
+                max_workers=FRED_MAX_WORKERS,
+                incremental=incremental,
+                catalog=catalog,
+                catalog_max_age=FRED_CATALOG_MAX_AGE,
+                fail_on_error=isinstance(event, dict) and bool(event.get("fail_on_error", False)),
+                **_extractor_options(),
+            )
+            response = fred.execute()
+        else:
+            fred = FredExtractor(event, context, session, series_id=FRED_SERIES_ID, **_extractor_options())
+            response = fred.execute_incremental() if incremental else fred.execute()
         logger.info("Successfully executed FRED extraction")
         return response
 
     except Exception as err:
         logger.error(f"Error during FRED extraction: {err}")
         raise err
+
+
+def compaction_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """
+    Lambda handler that compacts monthly partitions.
+
+    Compacts event["year"]/event["month"], or the month before the event time, for the
+    event's series_ids (falling back to FRED_SERIES_IDS, then FRED_SERIES_ID). Compacted objects
+    are written in FRED_OUTPUT_FORMAT/FRED_COMPRESSION, like the dailies they replace.
+    """
+
+    if not FRED_BUCKET_NAME:
+        raise ValueError("FRED_BUCKET_NAME environment variable is not set")
+
+    from fred_extractor.compaction import MonthlyCompactor
+
+    try:
+        if "year" in event and "month" in event:
+            year, month = int(event["year"]), int(event["month"])
+        else:
+            year, month = previous_month(event["time"])
+
+        series_ids = _requested_series_ids(event) or [FRED_SERIES_ID]
+        compactor = MonthlyCompactor(
+            aws_cache.get_client(session, "s3"),
+            FRED_BUCKET_NAME,
+            delete_daily=bool(event.get("delete_daily", False)),
+            max_workers=FRED_MAX_WORKERS,
+            output_format=FRED_OUTPUT_FORMAT,
+            compression=FRED_COMPRESSION,
+        )
+        response = compactor.compact_many((series_id, year, month) for series_id in series_ids)
+        logger.info(f"Successfully compacted {len(response)} partitions for {year:04d}-{month:02d}")
+        return response
+
+    except Exception as err:
+        logger.error(f"Error during FRED compaction: {err}")
+        raise err
+
+
+def catalog_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """
+    Lambda handler that crawls FRED series metadata into the series catalog.
+
+    Crawls event["release_ids"], event["category_ids"] and event["series_ids"]; at least one is
+    required. A crawl of every release outlasts the Lambda timeout and runs with crawl_catalog.py.
+    """
+
+    if not FRED_BUCKET_NAME:
+        raise ValueError("FRED_BUCKET_NAME environment variable is not set")
+
+    if not any(event.get(field) for field in CATALOG_EVENT_FIELDS):
+        raise ValueError(
+            f"Catalog crawl needs {', '.join(CATALOG_EVENT_FIELDS)}; crawl every release with crawl_catalog.py"
+        )
+
+    from fred_extractor.catalog import CatalogCrawler
+
+    try:
+        api_key = FredExtractor(event, context, session, FRED_BUCKET_NAME, fred_client=fred_client).retrieve_api_key()
+        crawler = CatalogCrawler(api_key, fred_client=fred_client, max_workers=FRED_MAX_WORKERS)
+        catalog = crawler.crawl(**{field: event.get(field) for field in CATALOG_EVENT_FIELDS})
+        response = catalog.save(aws_cache.get_client(session, "s3"), FRED_BUCKET_NAME)
+        logger.info(f"Successfully catalogued {response['Series']} series")
+        return response
+
+    except Exception as err:
+        logger.error(f"Error during FRED catalog crawl: {err}")
+        raise err
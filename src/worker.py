@@ -0,0 +1,63 @@
+"""
+Long-running worker entry point: drains backfill jobs from a queue with the handler's configuration.
+
+Run from the src directory with `python worker.py`. Jobs come from the SQS queue in
+FRED_WORKER_QUEUE_URL or, for local runs, the JSON file in FRED_WORKER_QUEUE_FILE. SIGTERM and
+SIGINT stop the worker after the jobs in flight have finished.
+"""
+
+import logging
+import os
+import signal
+import sys
+
+from fred_extractor import aws_cache
+from fred_extractor.worker import DEFAULT_MAX_RECEIVES, DEFAULT_VISIBILITY_TIMEOUT, LocalQueue, SqsQueue, Worker
+from index import FRED_BUCKET_NAME, FRED_MAX_WORKERS, _extractor_options, session
+
+logger = logging.getLogger()
+
+FRED_WORKER_QUEUE_URL = os.getenv("FRED_WORKER_QUEUE_URL")
+FRED_WORKER_QUEUE_FILE = os.getenv("FRED_WORKER_QUEUE_FILE")
+FRED_WORKER_VISIBILITY_TIMEOUT = int(os.getenv("FRED_WORKER_VISIBILITY_TIMEOUT", DEFAULT_VISIBILITY_TIMEOUT))
+# Jobs received this many times without succeeding are logged and dropped
+FRED_WORKER_MAX_RECEIVES = int(os.getenv("FRED_WORKER_MAX_RECEIVES", DEFAULT_MAX_RECEIVES))
+# Exit once the queue has been empty for this many receives instead of waiting for more jobs
+FRED_WORKER_MAX_IDLE_RECEIVES = int(os.getenv("FRED_WORKER_MAX_IDLE_RECEIVES") or 0) or None
+
+
+def _build_queue():
+    if FRED_WORKER_QUEUE_URL:
+        return SqsQueue(aws_cache.get_client(session, "sqs"), FRED_WORKER_QUEUE_URL)
+    if FRED_WORKER_QUEUE_FILE:
+        return LocalQueue(FRED_WORKER_QUEUE_FILE)
+    raise ValueError("Set FRED_WORKER_QUEUE_URL or FRED_WORKER_QUEUE_FILE")
+
+
+def main() -> int:
+    if not FRED_BUCKET_NAME:
+        raise ValueError("FRED_BUCKET_NAME environment variable is not set")
+
+    logging.basicConfig()
+    worker = Worker(
+        _build_queue(),
+        session,
+        max_workers=FRED_MAX_WORKERS,
+        visibility_timeout=FRED_WORKER_VISIBILITY_TIMEOUT,
+        max_receives=FRED_WORKER_MAX_RECEIVES,
+        **_extractor_options(),
+    )
+
+    def shutdown(signum, frame):
+        logger.info(f"Received signal {signum}, finishing jobs in flight")
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    stats = worker.run(max_idle_receives=FRED_WORKER_MAX_IDLE_RECEIVES)
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
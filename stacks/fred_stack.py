@@ -4,6 +4,7 @@ from constructs import Construct
 from stacks.lambda_.lambda_ import LambdaConstruct
 from stacks.s3.s3_construct import S3Construct
 
+# from stacks.glue.glue_construct import FredGlueConstruct
 # from stacks.scheduler.scheduler import FredSchedulerConstruct
 
 
@@ -28,4 +29,7 @@ class FredStack(Stack):
 
         LambdaConstruct(self, "LambdaConstruct", bucket, self.env.account, self.env.region).python_lambda_generator()
 
+        # Queryable once the function writes FRED_OUTPUT_FORMAT=parquet (or ndjson)
+        # FredGlueConstruct(self, "FredGlueConstruct").create_table(bucket, data_format="parquet")
+
         # FredSchedulerConstruct(self, "FredSchedulerConstruct", lambda_).apply_schedule("cron(0 8 ? * TUE-SAT *)")
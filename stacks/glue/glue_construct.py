@@ -0,0 +1,124 @@
+from aws_cdk import Stack
+from aws_cdk import aws_glue as glue
+from aws_cdk import aws_s3 as s3
+from constructs import Construct
+
+
+class FredGlueConstruct(Construct):
+    """Construct for the Glue table that makes the fred/ objects queryable from Athena."""
+
+    DATABASE_NAME = "fred"
+    TABLE_NAME = "observations"
+    DATA_PREFIX = "fred"
+    # Projected year range; queries filtering outside it simply find no partitions
+    MIN_YEAR = 1900
+    MAX_YEAR = 2100
+
+    # Only formats with one record per row: the default JSON objects hold a whole API response
+    FORMATS = {
+        "parquet": {
+            "classification": "parquet",
+            "input_format": "org.apache.hadoop.hive.ql.io.parquet.MapredParquetInputFormat",
+            "output_format": "org.apache.hadoop.hive.ql.io.parquet.MapredParquetOutputFormat",
+            "serialization_library": "org.apache.hadoop.hive.ql.io.parquet.serde.ParquetHiveSerDe",
+            "columns": [("date", "date"), ("value", "double"), ("realtime_start", "date"), ("realtime_end", "date")],
+        },
+        "ndjson": {
+            "classification": "json",
+            "input_format": "org.apache.hadoop.mapred.TextInputFormat",
+            "output_format": "org.apache.hadoop.hive.ql.io.HiveIgnoreKeyTextOutputFormat",
+            "serialization_library": "org.openx.data.jsonserde.JsonSerDe",
+            # FRED reports values as strings and "." when missing
+            "columns": [(name, "string") for name in ("date", "value", "realtime_start", "realtime_end")],
+        },
+    }
+
+    def __init__(self, scope: Construct, id: str):
+        super().__init__(scope, id)
+
+    def create_table(self, bucket: s3.IBucket, data_format: str = "parquet") -> glue.CfnTable:
+        """
+        Creates the Glue database and an observations table with Athena partition projection.
+
+        Partitions are computed from the fred/{series_id}/year=/month=/ key scheme at query time,
+        so new series and months are queryable immediately, without a crawler, MSCK REPAIR or any
+        metastore lookup. series_id is injected: queries must filter on it, e.g.
+        WHERE series_id = 'SP500' AND year = 2024.
+
+        MonthlyCompactor writes its monthly objects into the same partitions in the same format, so
+        compaction must run with delete_daily set: otherwise every compacted date is read twice.
+
+        Args:
+            bucket: Bucket holding the fred/ data
+            data_format: Object format written by the extractor, "parquet" or "ndjson" (default: parquet)
+
+        Returns:
+            glue.CfnTable: The created table
+
+        Raises:
+            ValueError: If the format does not store one record per row
+        """
+        if data_format not in self.FORMATS:
+            raise ValueError(f"Unsupported table format '{data_format}', expected one of {', '.join(self.FORMATS)}")
+        table_format = self.FORMATS[data_format]
+        account = Stack.of(self).account
+
+        database = glue.CfnDatabase(
+            self,
+            "glue-database",
+            catalog_id=account,
+            database_input=glue.CfnDatabase.DatabaseInputProperty(
+                name=self.DATABASE_NAME, description="FRED observations extracted to S3"
+            ),
+        )
+
+        table = glue.CfnTable(
+            self,
+            "glue-table",
+            catalog_id=account,
+            database_name=self.DATABASE_NAME,
+            table_input=glue.CfnTable.TableInputProperty(
+                name=self.TABLE_NAME,
+                description="Daily FRED observations, one row per observation",
+                table_type="EXTERNAL_TABLE",
+                partition_keys=[
+                    glue.CfnTable.ColumnProperty(name="series_id", type="string"),
+                    glue.CfnTable.ColumnProperty(name="year", type="int"),
+                    glue.CfnTable.ColumnProperty(name="month", type="int"),
+                ],
+                parameters={
+                    "classification": table_format["classification"],
+                    **self._projection_parameters(bucket),
+                },
+                storage_descriptor=glue.CfnTable.StorageDescriptorProperty(
+                    location=f"s3://{bucket.bucket_name}/{self.DATA_PREFIX}/",
+                    input_format=table_format["input_format"],
+                    output_format=table_format["output_format"],
+                    serde_info=glue.CfnTable.SerdeInfoProperty(
+                        serialization_library=table_format["serialization_library"]
+                    ),
+                    columns=[
+                        glue.CfnTable.ColumnProperty(name=name, type=column_type)
+                        for name, column_type in table_format["columns"]
+                    ],
+                ),
+            ),
+        )
+        table.add_dependency(database)
+        return table
+
+    def _projection_parameters(self, bucket: s3.IBucket) -> dict:
+        """Athena partition projection matching FredExtractor.build_s3_object_key."""
+        return {
+            "projection.enabled": "true",
+            "projection.series_id.type": "injected",
+            "projection.year.type": "integer",
+            "projection.year.range": f"{self.MIN_YEAR},{self.MAX_YEAR}",
+            "projection.year.digits": "4",
+            "projection.month.type": "integer",
+            "projection.month.range": "1,12",
+            "projection.month.digits": "2",
+            "storage.location.template": (
+                f"s3://{bucket.bucket_name}/{self.DATA_PREFIX}/${{series_id}}/year=${{year}}/month=${{month}}/"
+            ),
+        }
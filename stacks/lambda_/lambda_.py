@@ -14,12 +14,33 @@ class LambdaConstruct(Construct):
     LAMBDA_FUNCTION_NAME = "fred-extractor"
     LAMBDA_ROLE_NAME = "fred-extractor-execution-role"
     LAYER_NAME = "fred-dependencies-layer"
+    # Lambda rejects functions whose code and layers exceed this size unzipped
+    MAX_UNZIPPED_BYTES = 262_144_000
+    # botocore service models the handler actually creates clients for; the rest is ~20 MB of JSON
+    BOTOCORE_SERVICES = ("s3", "secretsmanager", "sqs", "sts")
 
-    def __init__(self, scope: Construct, id: str, bucket: s3.Bucket, account_id: str, region: str = "us-east-1"):
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        bucket: s3.Bucket,
+        account_id: str,
+        region: str = "us-east-1",
+        architecture: lambda_.Architecture = lambda_.Architecture.X86_64,
+        slim_layer: bool = False,
+    ):
+        """
+        Args:
+            architecture: Instruction set of the function and its layer, e.g. ARM_64 (default: X86_64)
+            slim_layer: Build the layer with precompiled bytecode and without tests, packaging
+                metadata and unused botocore service models (default: plain pip install)
+        """
         super().__init__(scope, id)
         self.bucket = bucket
         self.account_id = account_id
         self.region = region
+        self.architecture = architecture
+        self.slim_layer = slim_layer
 
     def python_lambda_generator(self):
         """Creates the main Lambda function with proper configuration and dependencies."""
@@ -31,6 +52,7 @@ class LambdaConstruct(Construct):
             code=lambda_.Code.from_asset("./src"),
             handler="index.handler",
             role=self.python_lambda_role(),
+            architecture=self.architecture,
             layers=[self.python_lambda_layer()],
             environment={
                 "FRED_BUCKET_NAME": self.bucket.bucket_name,
@@ -55,8 +77,15 @@ class LambdaConstruct(Construct):
             description="Execution role for FRED data extractor Lambda",
         )
 
+        # ListBucket lets a missing state object surface as 404 instead of 403
+        s3_list_policy = iam.PolicyStatement(
+            actions=["s3:ListBucket"],
+            effect=iam.Effect.ALLOW,
+            resources=[self.bucket.bucket_arn],
+        )
+
         s3_policy = iam.PolicyStatement(
-            actions=["s3:PutObject", "s3:GetObject"],
+            actions=["s3:PutObject", "s3:GetObject", "s3:DeleteObject", "s3:AbortMultipartUpload"],
             effect=iam.Effect.ALLOW,
             resources=[
                 self.bucket.bucket_arn,
@@ -74,7 +103,7 @@ class LambdaConstruct(Construct):
             self,
             "lambda-writer-policy",
             policy_name="fred-extractor-execution-policy",
-            statements=[s3_policy, secrets_policy],
+            statements=[s3_policy, s3_list_policy, secrets_policy],
         )
         lambda_role.attach_inline_policy(policy)
         return lambda_role
@@ -89,21 +118,56 @@ class LambdaConstruct(Construct):
                 "./src",
                 bundling=BundlingOptions(
                     image=self._get_build_image(),
-                    command=[
-                        "bash",
-                        "-c",
-                        "pip install --target /asset-output/python -r requirements.txt --upgrade --no-cache-dir",
-                    ],
+                    command=["bash", "-c", self._layer_build_script()],
                     user="root",
                     working_directory="/asset-input",
+                    platform=self._docker_platform(),
                 ),
             ),
-            compatible_architectures=[lambda_.Architecture.X86_64],
+            compatible_architectures=[self.architecture],
             compatible_runtimes=[self.PYTHON_RUNTIME],
             description="Python dependencies for FRED data extractor (requests, etc.)",
         )
         return lambda_layer
 
+    def _layer_build_script(self) -> str:
+        """
+        Shell script that installs the layer dependencies into /asset-output/python.
+
+        Every build reports the layer's unzipped size and fails above Lambda's limit. The opt-in slim
+        build also precompiles bytecode with the runtime's own interpreter, so imports on a cold start
+        load .pyc files instead of compiling, and prunes what the function never loads.
+        """
+        install = "pip install --target /asset-output/python -r requirements.txt --upgrade --no-cache-dir"
+        size_check = [
+            "size=$(du -sb /asset-output | cut -f1)",
+            'echo "Layer unzipped size: ${size} bytes"',
+            f"test $size -le {self.MAX_UNZIPPED_BYTES}",
+        ]
+        if not self.slim_layer:
+            return " && ".join([install, *size_check])
+
+        keep = " ".join(f"! -name {service}" for service in self.BOTOCORE_SERVICES)
+        return " && ".join(
+            [
+                f"{install} --no-compile",
+                "cd /asset-output/python",
+                "find . -depth -type d \\( -name tests -o -name test -o -name __pycache__ \\) -exec rm -rf {} +",
+                "find . -type f \\( -name '*.pyi' -o -name '*.pxd' -o -name '*.pyx' \\) -delete",
+                "find . -path '*.dist-info/*' \\( -name RECORD -o -name INSTALLER -o -name REQUESTED "
+                "-o -name direct_url.json \\) -delete",
+                "rm -rf bin pyarrow/include numpy/_core/include",
+                f"find botocore/data -mindepth 1 -maxdepth 1 -type d {keep} -exec rm -rf {{}} +",
+                # Unchecked hashes: the zip's timestamps must not make Lambda recompile the bytecode
+                "python -m compileall -q -j 0 --invalidation-mode unchecked-hash .",
+                *size_check,
+            ]
+        )
+
+    def _docker_platform(self) -> str:
+        """Docker platform matching the architecture, so native wheels are built for the right CPU."""
+        return "linux/arm64" if self.architecture.name == lambda_.Architecture.ARM_64.name else "linux/amd64"
+
     def _get_build_image(self) -> DockerImage:
         """Returns the appropriate SAM build image based on the Python runtime version."""
         runtime_version = self.PYTHON_RUNTIME.name.lower().replace("_", "")
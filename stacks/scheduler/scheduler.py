@@ -1,4 +1,7 @@
+from typing import Optional, Sequence
+
 from aws_cdk import Duration
+from aws_cdk import aws_s3 as s3
 from aws_cdk import aws_stepfunctions as sfn
 from aws_cdk import aws_stepfunctions_tasks as sfn_tasks
 from aws_cdk.aws_events import Rule, Schedule
@@ -7,6 +10,18 @@ from constructs import Construct
 
 
 class FredSchedulerConstruct(Construct):
+    """Construct for the Step Functions workflows that run the FRED extractor on a schedule."""
+
+    # FRED allows 120 requests per minute per API key; concurrent batches share that budget
+    FRED_REQUESTS_PER_MINUTE = 120
+    DEFAULT_MAX_CONCURRENCY = 4
+    # An incremental run requests series metadata and then observations for every series in a batch
+    REQUESTS_PER_SERIES = 2
+    # Lambda's timeout for functions that do not set one
+    DEFAULT_FUNCTION_TIMEOUT_SECONDS = 3
+    TIMEOUT_ERRORS = ["Timeout", "ConnectTimeout", "ReadTimeout"]
+    FAN_OUT_RESULTS_PREFIX = "fred-state/fan-out-results"
+
     def __init__(self, scope: Construct, id: str, lambda_function, **kwargs):
         super().__init__(scope, id)
         self.lambda_function = lambda_function
@@ -15,7 +30,7 @@ class FredSchedulerConstruct(Construct):
         lambda_invoke = sfn_tasks.LambdaInvoke(self, "sfn-lambda-invocation", lambda_function=self.lambda_function)
 
         lambda_invoke.add_retry(
-            errors=["Timeout", "ConnectTimeout", "ReadTimeout"],
+            errors=self.TIMEOUT_ERRORS,
             interval=Duration.seconds(5),
             max_attempts=3,
             backoff_rate=2.0,
@@ -29,10 +44,178 @@ class FredSchedulerConstruct(Construct):
         )
         return state_machine
 
-    def apply_schedule(self, cron_expression: str) -> None:
+    def requests_per_minute(self, max_concurrency: int) -> int:
+        """Share of the per-key FRED rate limit each of max_concurrency concurrent batches gets."""
+        return max(1, self.FRED_REQUESTS_PER_MINUTE // max_concurrency)
+
+    def max_batch_size(self, max_concurrency: int) -> int:
+        """
+        Most series one batch can extract within the function timeout at its share of the rate limit.
+
+        The client's burst allowance is left out, so the bound holds once the burst is spent.
+
+        Args:
+            max_concurrency: Batches running at once
+
+        Returns:
+            Series per batch, 0 if not even one series fits
+        """
+        timeout = self.lambda_function.timeout
+        timeout_seconds = timeout.to_seconds() if timeout else self.DEFAULT_FUNCTION_TIMEOUT_SECONDS
+        requests = self.requests_per_minute(max_concurrency) * timeout_seconds / 60
+        return int(requests // self.REQUESTS_PER_SERIES)
+
+    def _batch_invocation(self, id: str, payload: dict, max_concurrency: int) -> sfn.IChainable:
+        """
+        Lambda invocation for one batch, retried per batch and caught so one batch cannot fail the run.
+
+        The payload asks the extractor to fail when any series in the batch fails, so the retry
+        runs the batch again, and to stay within the batch's share of the FRED rate limit. The
+        rate travels with the payload: the function also serves other modes, which keep the full rate.
+        """
+        invoke = sfn_tasks.LambdaInvoke(
+            self,
+            id,
+            lambda_function=self.lambda_function,
+            payload=sfn.TaskInput.from_object(
+                {
+                    **payload,
+                    "requests_per_minute": self.requests_per_minute(max_concurrency),
+                    "fail_on_error": True,
+                }
+            ),
+            payload_response_only=True,
+        )
+        invoke.add_retry(errors=self.TIMEOUT_ERRORS, interval=Duration.seconds(5), max_attempts=3, backoff_rate=2.0)
+        invoke.add_retry(
+            errors=["States.TaskFailed"],
+            interval=Duration.seconds(10),
+            max_attempts=2,
+            backoff_rate=2.0,
+            jitter_strategy=sfn.JitterType.FULL,
+        )
+        invoke.add_catch(sfn.Pass(self, f"{id}-failed"), errors=["States.ALL"], result_path="$.error")
+        return invoke
+
+    def fan_out_workflow(
+        self,
+        series_ids: Optional[Sequence[str]] = None,
+        series_list_bucket: Optional[s3.IBucket] = None,
+        series_list_key: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> sfn.StateMachine:
+        """
+        Creates a state machine that shards a series list into batches and extracts them through a Map state.
+
+        The series list comes from series_ids (fixed at synth time), from a JSON array object in S3
+        (series_list_bucket/series_list_key, read by a distributed Map), or from the execution input's
+        series_ids. Each batch is one extractor invocation that fails when any of its series fails
+        and is then retried; batches that still fail are recorded in the results instead of failing
+        the run. Each batch is given a FRED request rate such that max_concurrency batches together
+        stay within the per-key rate limit, and batches are sized so that one finishes within the
+        function timeout at that rate (see max_batch_size).
+
+        Args:
+            series_ids: Series to extract (default: read from S3 or the execution input)
+            series_list_bucket: Bucket holding a JSON array of series IDs
+            series_list_key: Key of that JSON array
+            batch_size: Series per extractor invocation (default: max_batch_size)
+            max_concurrency: Batches running at once (default: 4)
+
+        Returns:
+            sfn.StateMachine: The fan-out state machine
+
+        Raises:
+            ValueError: If the batch settings are invalid, a batch cannot finish within the function
+                timeout, or only one of bucket/key is given
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if (series_list_bucket is None) != (series_list_key is None):
+            raise ValueError("series_list_bucket and series_list_key must be given together")
+
+        # A batch that outlives the timeout is retried, then caught, and its series are silently dropped
+        max_batch_size = self.max_batch_size(max_concurrency)
+        if batch_size is None:
+            batch_size = max_batch_size
+        if batch_size < 1 or batch_size > max_batch_size:
+            raise ValueError(
+                f"batch_size must be between 1 and {max_batch_size}: at {self.requests_per_minute(max_concurrency)} "
+                f"requests/min per batch, larger batches cannot finish within the function timeout"
+            )
+
+        if series_list_bucket is not None:
+            # Distributed Map reads and batches the list itself, so it can be larger than the state payload limit
+            fan_out = sfn.DistributedMap(
+                self,
+                "fan-out-series",
+                item_reader=sfn.S3JsonItemReader(bucket=series_list_bucket, key=series_list_key),
+                item_batcher=sfn.ItemBatcher(
+                    max_items_per_batch=batch_size,
+                    batch_input={"time": sfn.JsonPath.string_at("$.time")},
+                ),
+                max_concurrency=max_concurrency,
+                result_writer_v2=sfn.ResultWriterV2(bucket=series_list_bucket, prefix=self.FAN_OUT_RESULTS_PREFIX),
+                result_path="$.results",
+            )
+            fan_out.item_processor(
+                self._batch_invocation(
+                    "extract-batch-from-s3",
+                    {
+                        "time": sfn.JsonPath.string_at("$.BatchInput.time"),
+                        "series_ids": sfn.JsonPath.list_at("$.Items"),
+                    },
+                    max_concurrency,
+                )
+            )
+            definition = fan_out
+        else:
+            shard = sfn.Pass(
+                self,
+                "shard-series",
+                parameters={
+                    "time": sfn.JsonPath.string_at("$.time"),
+                    "batches": sfn.JsonPath.array_partition(sfn.JsonPath.list_at("$.series_ids"), batch_size),
+                },
+            )
+            fan_out = sfn.Map(
+                self,
+                "fan-out-series",
+                items_path="$.batches",
+                item_selector={
+                    "time": sfn.JsonPath.string_at("$.time"),
+                    "series_ids": sfn.JsonPath.string_at("$$.Map.Item.Value"),
+                },
+                max_concurrency=max_concurrency,
+                result_path="$.results",
+            )
+            fan_out.item_processor(
+                self._batch_invocation(
+                    "extract-batch",
+                    {"time": sfn.JsonPath.string_at("$.time"), "series_ids": sfn.JsonPath.list_at("$.series_ids")},
+                    max_concurrency,
+                )
+            )
+            start = sfn.Chain.start(shard)
+            if series_ids:
+                series_list = sfn.Pass(
+                    self, "series-list", result=sfn.Result.from_array(list(series_ids)), result_path="$.series_ids"
+                )
+                start = series_list.next(shard)
+            definition = start.next(fan_out)
+
+        return sfn.StateMachine(
+            self,
+            "fan-out-state-machine",
+            state_machine_name="fred-fan-out-state-machine",
+            definition_body=sfn.DefinitionBody.from_chainable(definition),
+        )
+
+    def apply_schedule(self, cron_expression: str, state_machine: Optional[sfn.StateMachine] = None) -> None:
         Rule(
             self,
             "fred-scheduler",
             schedule=Schedule.expression(cron_expression),
-            targets=[SfnStateMachine(self.workflow())],
+            targets=[SfnStateMachine(state_machine or self.workflow())],
         )
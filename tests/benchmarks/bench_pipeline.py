@@ -0,0 +1,261 @@
+"""
+Benchmarks for the extraction pipeline against a local fake FRED server and moto S3/Secrets Manager.
+
+Run from the project root with `python -m tests.benchmarks` (or `tox -e bench`). Results are
+compared with tests/benchmarks/baseline.json and the run fails when a metric regresses by more
+than --threshold; refresh the baseline with --update-baseline and commit it with the change.
+
+Timings differ between machines, so the baseline stores them relative to a calibration run: a
+fixed serialize/hash/parse workload timed on the same host just before the benchmarks. Memory
+peaks and request counts do not depend on CPU speed and are stored as measured.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+
+from src.fred_extractor import aws_cache
+from src.fred_extractor.fred_client import FredClient
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.metrics import MetricsLogger
+from src.fred_extractor.multi_series_extractor import MultiSeriesExtractor
+from src.fred_extractor.serializers import get_serializer
+
+from .fake_fred import FakeFredServer
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+BUCKET = "fred-benchmark-bucket"
+DEFAULT_THRESHOLD = 0.25
+# Metrics where a larger value is an improvement; every other metric is lower-is-better
+HIGHER_IS_BETTER = ("_per_second",)
+# Metrics measured in time; they are stored as ratios to the calibration run
+TIMED = ("_ms", "_per_second")
+CALIBRATION_OBSERVATIONS = 20000
+CALIBRATION_ROUNDS = 11
+# EMF records would otherwise be written to stdout and timed along with the pipeline
+METRICS = MetricsLogger(enabled=False)
+
+
+def _percentile(samples: list, percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percentile / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _latency_metrics(name: str, samples: list, units: int) -> dict:
+    total = sum(samples)
+    return {
+        f"{name}.p50_ms": _percentile(samples, 50) * 1000,
+        f"{name}.p95_ms": _percentile(samples, 95) * 1000,
+        f"{name}.items_per_second": units / total if total else 0.0,
+    }
+
+
+def _event(day: int = 22) -> dict:
+    return {"time": f"2022-07-{day:02d}T00:00:00Z"}
+
+
+def calibrate(rounds: int = CALIBRATION_ROUNDS) -> float:
+    """
+    Median milliseconds of a fixed CPU workload resembling the pipeline's per-object work.
+
+    The workload only uses the standard library, so changes to the extractor never move it.
+    """
+    payload = {"observations": FakeFredServer.observations("CALIBRATION", "1900-01-01", "2100-12-31")}
+    payload["observations"] = payload["observations"][:CALIBRATION_OBSERVATIONS]
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        body = json.dumps(payload, indent=2).encode("utf-8")
+        hashlib.sha256(body).hexdigest()
+        json.loads(body)
+        samples.append(time.perf_counter() - started)
+    return _percentile(samples, 50) * 1000
+
+
+def normalize(results: dict, calibration_ms: float) -> dict:
+    """
+    Express the timed metrics in units of the calibration run.
+
+    Latencies become multiples of the calibration time and throughputs become items per
+    calibration run; every other metric is returned unchanged.
+
+    Args:
+        results: Metrics as measured by run()
+        calibration_ms: Result of calibrate() on the same host
+
+    Returns:
+        Dictionary with the same metric names
+    """
+    normalized = {}
+    for metric, value in results.items():
+        if metric.endswith("_ms"):
+            value = value / calibration_ms
+        elif metric.endswith("_per_second"):
+            value = value * calibration_ms / 1000
+        normalized[metric] = value
+    return normalized
+
+
+def bench_single_day(session, fred_client, iterations: int) -> dict:
+    samples = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        FredExtractor(_event(18 + i % 5), None, session, BUCKET, fred_client=fred_client, metrics=METRICS).execute()
+        samples.append(time.perf_counter() - started)
+    return _latency_metrics("single_day", samples, iterations)
+
+
+def bench_multi_series(session, fred_client, iterations: int, series_count: int) -> dict:
+    series_ids = [f"SERIES{i:03d}" for i in range(series_count)]
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        results = MultiSeriesExtractor(
+            _event(), None, session, BUCKET, series_ids, fred_client=fred_client, metrics=METRICS
+        ).execute()
+        samples.append(time.perf_counter() - started)
+        failed = [s for s, r in results.items() if "Error" in r]
+        if failed:
+            raise RuntimeError(f"multi_series benchmark failed for {failed}")
+    return _latency_metrics("multi_series", samples, iterations * series_count)
+
+
+def bench_backfill(session, fred_client, iterations: int, years: int) -> dict:
+    samples, written = [], 0
+    for i in range(iterations):
+        fred = FredExtractor(
+            _event(), None, session, BUCKET, series_id=f"BACKFILL{i}", fred_client=fred_client, metrics=METRICS
+        )
+        started = time.perf_counter()
+        written += fred.backfill(f"{2022 - years}-01-01", "2021-12-31")["ObjectsWritten"]
+        samples.append(time.perf_counter() - started)
+    return _latency_metrics("backfill", samples, written)
+
+
+def bench_serialization_memory(observation_count: int) -> dict:
+    payload = {"observations": FakeFredServer.observations("SP500", "1900-01-01", "2100-12-31")[:observation_count]}
+    metrics = {}
+    for output_format, compression in (("json", None), ("ndjson", "gzip"), ("parquet", None)):
+        serializer = get_serializer(output_format, compression)
+        tracemalloc.start()
+        for _ in serializer.iter_chunks(payload):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        metrics[f"serialize.{serializer.EXTENSION}.peak_mib"] = peak / (1024 * 1024)
+    return metrics
+
+
+def run(args) -> dict:
+    with FakeFredServer(latency=args.latency, throttle_rate=args.throttle_rate) as server, mock_aws():
+        session = boto3.Session(region_name="us-east-1")
+        session.client("s3").create_bucket(Bucket=BUCKET)
+        session.client("secretsmanager").create_secret(
+            Name=FredExtractor.SECRET_NAME, SecretString=json.dumps({FredExtractor.SECRET_KEY: "benchmark-key"})
+        )
+        aws_cache.clear()
+        # High enough that the token bucket never throttles; the fake server injects 429s instead
+        fred_client = FredClient(requests_per_minute=600000, burst=1000, pool_size=32)
+
+        with (
+            patch.object(FredExtractor, "API_URL", f"{server.url}/fred/series/observations"),
+            patch.object(FredExtractor, "SERIES_URL", f"{server.url}/fred/series"),
+        ):
+            results = {}
+            results.update(bench_single_day(session, fred_client, args.iterations))
+            results.update(bench_multi_series(session, fred_client, max(1, args.iterations // 4), args.series))
+            results.update(bench_backfill(session, fred_client, 1, args.years))
+
+        results["fake_fred.requests"] = server.stats["requests"]
+        results["fake_fred.throttled"] = server.stats["throttled"]
+
+    results.update(bench_serialization_memory(args.observations))
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Metrics that regressed beyond threshold relative to the baseline.
+
+    Both sides must be normalized against their own host's calibration run.
+
+    Returns:
+        List of (metric, baseline, current) tuples
+    """
+    regressions = []
+    for metric, expected in baseline.items():
+        current = results.get(metric)
+        if current is None or metric.startswith("fake_fred.") or not expected:
+            continue
+        if metric.endswith(HIGHER_IS_BETTER):
+            regressed = current < expected * (1 - threshold)
+        else:
+            regressed = current > expected * (1 + threshold)
+        if regressed:
+            regressions.append((metric, expected, current))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20, help="single-day runs (default: 20)")
+    parser.add_argument("--series", type=int, default=20, help="series per multi-series run (default: 20)")
+    parser.add_argument("--years", type=int, default=2, help="years of daily data to backfill (default: 2)")
+    parser.add_argument("--observations", type=int, default=200000, help="observations serialized (default: 200000)")
+    parser.add_argument("--latency", type=float, default=0.02, help="fake FRED latency in seconds (default: 0.02)")
+    parser.add_argument("--throttle-rate", type=float, default=0.05, help="fraction of 429 responses (default: 0.05)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed regression (default: 0.25)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file to compare with")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    calibration_ms = calibrate()
+    results = run(args)
+    normalized = normalize(results, calibration_ms)
+
+    width = max(len(metric) for metric in results)
+    print(f"{'calibration_ms':<{width}}  {calibration_ms:12.2f}")
+    for metric, value in results.items():
+        relative = f"  {normalized[metric]:10.3f}x" if metric.endswith(TIMED) else ""
+        print(f"{metric:<{width}}  {value:12.2f}{relative}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"calibration_ms": calibration_ms, "results": results}, file, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump({"calibration_ms": calibration_ms, "normalized": normalized}, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)["normalized"]
+
+    regressions = compare(normalized, baseline, args.threshold)
+    for metric, expected, current in regressions:
+        print(f"REGRESSION {metric}: {expected:.3f} -> {current:.3f} (threshold {args.threshold:.0%})")
+    if regressions:
+        return 1
+
+    print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import datetime
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeFredServer:
+    """
+    Local stand-in for the FRED API serving synthetic weekday observations.
+
+    Serves /fred/series/observations (with limit/offset paging) and /fred/series, sleeps
+    `latency` seconds per request and answers a `throttle_rate` fraction of requests with
+    429 and Retry-After: 0 so client retries are exercised without slowing the run down.
+    """
+
+    def __init__(self, latency: float = 0.0, throttle_rate: float = 0.0, seed: int = 0) -> None:
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "throttled": 0}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeFredServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _should_throttle(self) -> bool:
+        with self._lock:
+            self.stats["requests"] += 1
+            throttled = self._random.random() < self.throttle_rate
+            if throttled:
+                self.stats["throttled"] += 1
+            return throttled
+
+    @staticmethod
+    def observations(series_id: str, start: str, end: str) -> list:
+        day = datetime.date.fromisoformat(start)
+        last = datetime.date.fromisoformat(end)
+        observations = []
+        while day <= last:
+            if day.weekday() < 5:
+                # Deterministic per series and date so reruns produce identical payloads
+                value = 1000 + zlib.crc32(f"{series_id}{day}".encode("utf-8")) % 300000 / 100
+                observations.append(
+                    {"realtime_start": end, "realtime_end": end, "date": day.isoformat(), "value": f"{value:.2f}"}
+                )
+            day += datetime.timedelta(days=1)
+        return observations
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, payload: dict, headers: dict = None) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:  # noqa: N802
+                if server.latency:
+                    time.sleep(server.latency)
+                if server._should_throttle():
+                    self._send(429, {"error_code": 429, "error_message": "Too Many Requests"}, {"Retry-After": "0"})
+                    return
+
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                series_id = query.get("series_id", "SP500")
+
+                if parsed.path.endswith("/series/observations"):
+                    observations = server.observations(
+                        series_id,
+                        query.get("observation_start", "2022-01-03"),
+                        query.get("observation_end", "2022-01-03"),
+                    )
+                    offset, limit = int(query.get("offset", 0)), int(query.get("limit", 100000))
+                    self._send(
+                        200,
+                        {
+                            "observation_start": query.get("observation_start"),
+                            "observation_end": query.get("observation_end"),
+                            "units": "lin",
+                            "count": len(observations),
+                            "offset": offset,
+                            "limit": limit,
+                            "observations": observations[offset : offset + limit],
+                        },
+                    )
+                elif parsed.path.endswith("/series"):
+                    self._send(
+                        200,
+                        {
+                            "seriess": [
+                                {
+                                    "id": series_id,
+                                    "observation_end": datetime.date.today().isoformat(),
+                                    "last_updated": f"{datetime.date.today().isoformat()} 08:00:00-05",
+                                }
+                            ]
+                        },
+                    )
+                else:
+                    self._send(404, {"error_code": 404, "error_message": "Not Found"})
+
+        return Handler
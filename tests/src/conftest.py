@@ -1,7 +1,27 @@
 import json
+import boto3
 import pytest
 import datetime
 from dateutil.tz import tzlocal
+from moto import mock_aws
+
+# Bucket created by the s3_client fixture
+BUCKET = "test-bucket"
+
+
+class FakeClock:
+    """Manually advanced clock; sleep() moves it forward and records the wait."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
 
 
 @pytest.fixture
@@ -41,3 +61,37 @@ def secret_response_fixture():
             'RetryAttempts': 0
         }
     }
+
+
+@pytest.fixture(autouse=True)
+def clear_aws_cache():
+    # The secret and client caches are process-wide; keep tests independent
+    from src.fred_extractor import aws_cache
+    aws_cache.clear()
+    yield
+    aws_cache.clear()
+
+
+@pytest.fixture
+def s3_client_mock():
+    # Stand-in S3 client where uploads succeed and every GET (manifest, watermark) finds no object
+    from unittest.mock import Mock
+    from botocore.exceptions import ClientError
+    client = Mock()
+    client.put_object.return_value = {"ResponseMetadata": {"HTTPStatusCode": 200}}
+    client.get_object.side_effect = ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+    return client
+
+
+@pytest.fixture
+def s3_client():
+    # moto S3 client with BUCKET created
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
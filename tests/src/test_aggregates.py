@@ -0,0 +1,136 @@
+import datetime
+import io
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+
+from src.fred_extractor.aggregates import RollupWriter, aggregate_key, period_start, resample
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.metrics import MetricsLogger
+from tests.src.conftest import BUCKET
+
+
+def _business_days(start, end):
+    day, days = datetime.date.fromisoformat(start), []
+    while day <= datetime.date.fromisoformat(end):
+        if day.weekday() < 5:
+            days.append(day.isoformat())
+        day += datetime.timedelta(days=1)
+    return days
+
+
+def _response(dates, value=lambda i: 100.0 + i):
+    response = Mock(status_code=200)
+    response.json.return_value = {
+        "count": len(dates),
+        "observations": [{"date": d, "value": str(value(i))} for i, d in enumerate(dates)],
+    }
+    return response
+
+
+def _extractor(s3_client, time="2024-04-02T21:00:00Z", frequencies=("W", "M", "Q")):
+    return FredExtractor(
+        {"time": time},
+        None,
+        None,
+        BUCKET,
+        series_id="SP500",
+        api_key="key",
+        s3_client=s3_client,
+        metrics=MetricsLogger(enabled=False),
+        aggregate_frequencies=frequencies,
+    )
+
+
+def _rollup(s3_client, frequency):
+    body = s3_client.get_object(Bucket=BUCKET, Key=aggregate_key("SP500", frequency))["Body"].read()
+    return pq.read_table(io.BytesIO(body)).to_pydict()
+
+
+class TestResample:
+    def test_period_starts(self):
+        dates = np.array(["2024-01-01", "2024-01-07", "2024-01-08", "2024-05-31", "2024-12-31"], dtype="datetime64[D]")
+
+        assert period_start(dates, "W").astype(str).tolist() == [
+            "2024-01-01",
+            "2024-01-01",
+            "2024-01-08",
+            "2024-05-27",
+            "2024-12-30",
+        ]
+        assert period_start(dates, "M").astype(str).tolist()[3:] == ["2024-05-01", "2024-12-01"]
+        assert period_start(dates, "Q").astype(str).tolist()[3:] == ["2024-04-01", "2024-10-01"]
+
+    def test_reductions_skip_missing_values(self):
+        dates = np.array(["2024-02-29", "2024-02-01", "2024-03-04", "2024-03-05", "2024-03-06"], dtype="datetime64[D]")
+        values = np.array([4.0, 2.0, np.nan, 9.0, 3.0])
+
+        periods = resample(dates, values, "M")
+
+        assert periods["period_start"].astype(str).tolist() == ["2024-02-01", "2024-03-01"]
+        assert periods["period_end"].astype(str).tolist() == ["2024-02-29", "2024-03-31"]
+        assert periods["last"].tolist() == [4.0, 3.0]
+        assert periods["mean"].tolist() == [3.0, 6.0]
+        assert (periods["min"].tolist(), periods["max"].tolist()) == ([2.0, 3.0], [4.0, 9.0])
+        assert periods["count"].tolist() == [2, 2]
+
+    def test_empty_input(self):
+        periods = resample(np.array([], dtype="datetime64[D]"), np.array([]), "Q")
+
+        assert all(len(array) == 0 for array in periods.values())
+
+    def test_rejects_unknown_frequency(self):
+        with pytest.raises(ValueError, match="frequencies"):
+            RollupWriter(Mock(), BUCKET, frequencies=("D",))
+
+
+class TestRollups:
+    def test_backfill_writes_rollups_with_pct_change(self, s3_client):
+        dates = _business_days("2024-01-01", "2024-03-31")
+        fred = _extractor(s3_client)
+
+        with patch("requests.Session.get", return_value=_response(dates)):
+            response = fred.backfill("2024-01-01", "2024-03-31")
+
+        monthly = _rollup(s3_client, "M")
+        assert response["PeriodsUpdated"] == {"W": 13, "M": 3, "Q": 1}
+        assert [d.isoformat() for d in monthly["period_start"]] == ["2024-01-01", "2024-02-01", "2024-03-01"]
+        assert monthly["count"] == [23, 21, 21]
+        assert monthly["last"] == [122.0, 143.0, 164.0]
+        assert monthly["pct_change"][0] is None or np.isnan(monthly["pct_change"][0])
+        assert monthly["pct_change"][1:] == pytest.approx([143.0 / 122.0 - 1, 164.0 / 143.0 - 1])
+        assert _rollup(s3_client, "Q")["mean"] == [pytest.approx(np.mean([100.0 + i for i in range(len(dates))]))]
+
+    def test_daily_run_updates_only_the_changed_periods(self, s3_client):
+        with patch("requests.Session.get", return_value=_response(_business_days("2024-01-01", "2024-03-29"))):
+            _extractor(s3_client).backfill("2024-01-01", "2024-03-29")
+        before = _rollup(s3_client, "M")
+
+        with patch("requests.Session.get", return_value=_response(["2024-04-01"], value=lambda i: 200.0)) as get:
+            response = _extractor(s3_client, time="2024-04-02T21:00:00Z").execute()
+
+        monthly = _rollup(s3_client, "M")
+        assert response["PeriodsUpdated"] == {"W": 1, "M": 1, "Q": 1}
+        assert get.call_count == 1
+        # NaN never compares equal, so the first pct_change is left out
+        assert {k: v[1:3] for k, v in monthly.items()} == {k: v[1:] for k, v in before.items()}
+        assert (monthly["last"][3], monthly["count"][3]) == (200.0, 1)
+        assert monthly["pct_change"][3] == pytest.approx(200.0 / before["last"][2] - 1)
+
+    def test_unchanged_daily_run_skips_rollups(self, s3_client):
+        with patch("requests.Session.get", return_value=_response(["2024-04-01"])):
+            _extractor(s3_client).execute()
+            with patch.object(RollupWriter, "update") as update:
+                response = _extractor(s3_client).execute()
+
+        assert response["ObjectsSkipped"] == 1
+        update.assert_not_called()
+
+    def test_no_frequencies_writes_no_rollups(self, s3_client):
+        with patch("requests.Session.get", return_value=_response(["2024-04-01"])):
+            response = _extractor(s3_client, frequencies=None).execute()
+
+        assert "PeriodsUpdated" not in response
+        assert "Contents" not in s3_client.list_objects_v2(Bucket=BUCKET, Prefix="fred-agg/")
@@ -0,0 +1,72 @@
+from unittest.mock import Mock
+
+from src.fred_extractor import aws_cache
+from src.fred_extractor.aws_cache import TTLCache
+
+
+class TestTTLCache:
+
+    def test_get_or_load_caches_until_ttl_expires(self, clock):
+        cache = TTLCache(ttl_seconds=10, clock=clock)
+        loader = Mock(side_effect=["first", "second"])
+
+        assert cache.get_or_load("key", loader) == "first"
+        clock.now = 9.9
+        assert cache.get_or_load("key", loader) == "first"
+        clock.now = 10.0
+        assert cache.get_or_load("key", loader) == "second"
+        assert loader.call_count == 2
+
+    def test_invalidate_drops_single_key(self):
+        cache = TTLCache(ttl_seconds=10)
+        cache.get_or_load("a", lambda: 1)
+        cache.get_or_load("b", lambda: 2)
+
+        cache.invalidate("a")
+
+        assert "a" not in cache
+        assert "b" in cache
+
+    def test_loader_errors_are_not_cached(self):
+        cache = TTLCache(ttl_seconds=10)
+        loader = Mock(side_effect=[RuntimeError("boom"), "value"])
+
+        try:
+            cache.get_or_load("key", loader)
+        except RuntimeError:
+            pass
+
+        assert cache.get_or_load("key", loader) == "value"
+
+
+class TestAwsCache:
+
+    def test_get_client_reuses_client_per_session_and_service(self):
+        session = Mock()
+
+        first = aws_cache.get_client(session, "s3")
+        second = aws_cache.get_client(session, "s3")
+
+        assert first is second
+        session.client.assert_called_once_with(service_name="s3")
+
+    def test_get_secret_string_fetches_once_across_calls(self):
+        session = Mock()
+        session.client.return_value.get_secret_value.return_value = {"SecretString": "secret"}
+
+        assert aws_cache.get_secret_string(session, "my/secret") == "secret"
+        assert aws_cache.get_secret_string(Mock(), "my/secret") == "secret"
+
+        session.client.return_value.get_secret_value.assert_called_once_with(SecretId="my/secret")
+
+    def test_invalidate_secret_forces_refetch(self):
+        session = Mock()
+        session.client.return_value.get_secret_value.side_effect = [
+            {"SecretString": "old"},
+            {"SecretString": "new"},
+        ]
+
+        aws_cache.get_secret_string(session, "my/secret")
+        aws_cache.invalidate_secret("my/secret")
+
+        assert aws_cache.get_secret_string(session, "my/secret") == "new"
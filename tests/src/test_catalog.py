@@ -0,0 +1,193 @@
+import datetime
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.fred_extractor.catalog import CATALOG_KEY, PAGE_LIMIT, CatalogCrawler, SeriesCatalog
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.multi_series_extractor import MultiSeriesExtractor
+from src.fred_extractor.watermark import save_watermark
+from tests.src.conftest import BUCKET
+
+
+def _series(series_id, frequency="D", title=None, last_updated="2022-07-21 07:01:22-05"):
+    return {
+        "id": series_id,
+        "title": title or f"{series_id} title",
+        "frequency_short": frequency,
+        "units": "Percent",
+        "last_updated": last_updated,
+        "observation_end": "2022-07-21",
+    }
+
+
+class FakeFred:
+    """Serves paged release, category and series listings like the FRED API."""
+
+    def __init__(self, releases, categories=None, children=None):
+        self.releases = releases
+        self.categories = categories or {}
+        self.children = children or {}
+        self.requests = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _page(field, items, params):
+        offset, limit = params.get("offset", 0), params.get("limit", PAGE_LIMIT)
+        return {"count": len(items), field: items[offset : offset + limit]}
+
+    def get(self, url, params, timeout):
+        path = url.rsplit("/fred/", 1)[1]
+        with self._lock:
+            self.requests.append((path, params))
+        if path == "releases":
+            payload = self._page("releases", [{"id": r} for r in self.releases], params)
+        elif path == "release/series":
+            payload = self._page("seriess", self.releases[params["release_id"]], params)
+        elif path == "category/children":
+            payload = {"categories": [{"id": c} for c in self.children.get(params["category_id"], [])]}
+        elif path == "category/series":
+            payload = self._page("seriess", self.categories.get(params["category_id"], []), params)
+        else:
+            payload = {"seriess": [_series(params["series_id"], frequency="M")]}
+        response = Mock(status_code=200)
+        response.json.return_value = payload
+        return response
+
+
+def _catalog(crawled_at=None):
+    return SeriesCatalog.from_records(
+        [
+            {
+                "series_id": "SP500",
+                "title": "S&P 500",
+                "frequency": "D",
+                "units": "Index",
+                "release_id": 321,
+                "last_updated": "2022-07-21 19:11:03-05",
+                "observation_end": "2022-07-21",
+                "category_ids": [32255],
+            },
+            {
+                "series_id": "DGS10",
+                "title": "10-Year Treasury Rate",
+                "frequency": "D",
+                "units": "Percent",
+                "release_id": 18,
+                "last_updated": "2022-07-19 15:18:02-05",
+                "observation_end": "2022-07-19",
+            },
+            {
+                "series_id": "UNRATE",
+                "title": "Unemployment Rate",
+                "frequency": "M",
+                "units": "Percent",
+                "release_id": 50,
+                "last_updated": "2022-07-08 07:44:02-05",
+                "observation_end": "2022-06-01",
+            },
+        ],
+        crawled_at=crawled_at,
+    )
+
+
+class TestCatalogCrawler:
+    def test_crawl_pages_every_release(self):
+        fred = FakeFred({18: [_series(f"S{i:04d}") for i in range(2500)], 50: [_series("UNRATE", "M")]})
+
+        catalog = CatalogCrawler("key", fred_client=fred, max_workers=4).crawl()
+
+        assert len(catalog) == 2501
+        assert catalog.select(release_id=18)[:2] == ["S0000", "S0001"]
+        offsets = sorted(p["offset"] for path, p in fred.requests if p.get("release_id") == 18)
+        assert offsets == [0, PAGE_LIMIT, 2 * PAGE_LIMIT]
+        assert all(p["api_key"] == "key" and p["limit"] == PAGE_LIMIT for path, p in fred.requests if path != "series")
+
+    def test_crawl_walks_category_tree_and_looks_up_series(self):
+        fred = FakeFred(
+            {},
+            categories={32255: [_series("SP500")], 33: [_series("SP500"), _series("DGS10")]},
+            children={1: [33], 33: [32255]},
+        )
+
+        catalog = CatalogCrawler("key", fred_client=fred).crawl(category_ids=[1], series_ids=["UNRATE"])
+
+        assert catalog.select(category_id=33) == ["DGS10", "SP500"]
+        assert catalog.select(category_id=32255) == ["SP500"]
+        assert catalog.metadata("UNRATE")["frequency_short"] == "M"
+        assert not any(path == "releases" for path, _ in fred.requests)
+
+    def test_init_rejects_non_positive_workers(self):
+        with pytest.raises(ValueError, match="max_workers"):
+            CatalogCrawler("key", fred_client=Mock(), max_workers=0)
+
+
+class TestSeriesCatalog:
+    def test_select_combines_filters(self):
+        catalog = _catalog()
+
+        assert catalog.select(frequency="D") == ["DGS10", "SP500"]
+        assert catalog.select(frequency="D", release_id=18) == ["DGS10"]
+        assert catalog.select(units="Percent", title="rate") == ["DGS10", "UNRATE"]
+        assert catalog.select(updated_since="2022-07-19T20:00:00Z") == ["DGS10", "SP500"]
+        assert catalog.select(frequency="W") == []
+
+    def test_save_and_load_round_trip(self, s3_client):
+        response = _catalog().save(s3_client, BUCKET)
+
+        catalog = SeriesCatalog.load(s3_client, BUCKET)
+
+        assert response["Key"] == CATALOG_KEY and response["Series"] == 3
+        assert "SP500" in catalog and "GDP" not in catalog
+        assert catalog.metadata("SP500") == {
+            "id": "SP500",
+            "title": "S&P 500",
+            "frequency_short": "D",
+            "units": "Index",
+            "last_updated": "2022-07-21 19:11:03-05",
+            "observation_end": "2022-07-21",
+        }
+
+    def test_load_returns_none_without_catalog(self, s3_client):
+        assert SeriesCatalog.load(s3_client, BUCKET) is None
+
+    def test_incremental_uses_catalog_metadata_instead_of_series_request(self, event_fixture, s3_client):
+        save_watermark(s3_client, BUCKET, "SP500", "2022-07-21", "2022-07-21 19:11:03-05")
+        fred = FredExtractor(event_fixture, None, None, BUCKET, api_key="key", s3_client=s3_client)
+
+        with patch("requests.Session.get") as get:
+            result = fred.execute_incremental(_catalog().metadata("SP500"))
+
+        assert result["HTTPStatusCode"] == 204
+        get.assert_not_called()
+
+    def test_crawl_time_survives_save_and_load(self, s3_client):
+        crawled_at = datetime.datetime(2022, 7, 21, 6, 0, tzinfo=datetime.timezone.utc)
+        _catalog(crawled_at).save(s3_client, BUCKET)
+
+        catalog = SeriesCatalog.load(s3_client, BUCKET)
+
+        assert catalog.crawled_at == crawled_at
+        assert not catalog.is_stale(3600, now=crawled_at + datetime.timedelta(minutes=59))
+        assert catalog.is_stale(3600, now=crawled_at + datetime.timedelta(minutes=61))
+
+    def test_catalog_without_crawl_time_is_stale(self):
+        catalog = SeriesCatalog(_catalog().table.replace_schema_metadata(None))
+
+        assert catalog.crawled_at is None
+        assert catalog.is_stale(3600)
+
+    @pytest.mark.parametrize("age_hours,uses_catalog", [(1, True), (48, False)])
+    def test_incremental_only_trusts_a_recent_catalog(self, event_fixture, age_hours, uses_catalog):
+        crawled_at = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=age_hours)
+        fred = MultiSeriesExtractor(
+            event_fixture, None, Mock(), BUCKET, series_ids=["SP500"], incremental=True, catalog=_catalog(crawled_at)
+        )
+
+        with patch.object(FredExtractor, "retrieve_api_key", return_value="key"), \
+                patch.object(FredExtractor, "execute_incremental", return_value={"HTTPStatusCode": 204}) as run:
+            fred.execute()
+
+        # A stale catalog only selected the series; its metadata is requested from FRED again
+        run.assert_called_once_with(_catalog().metadata("SP500") if uses_catalog else None)
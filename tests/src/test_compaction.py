@@ -0,0 +1,175 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from src.fred_extractor.compaction import MonthlyCompactor, compacted_object_key, merge_observations
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.serializers import decode_response
+from tests.src.conftest import BUCKET
+
+
+def _put_daily(s3_client, series_id, date, value):
+    year, month, _ = date.split("-")
+    payload = {"units": "lin", "observations": [{"date": date, "value": value}]}
+    key = f"fred/{series_id}/year={year}/month={month}/{series_id}-{date}.json"
+    s3_client.put_object(Bucket=BUCKET, Key=key, Body=json.dumps(payload))
+    return key
+
+
+def _keys(s3_client, prefix):
+    return sorted(o["Key"] for o in s3_client.list_objects_v2(Bucket=BUCKET, Prefix=prefix).get("Contents", []))
+
+
+def _read(s3_client, key):
+    return json.loads(s3_client.get_object(Bucket=BUCKET, Key=key)["Body"].read())
+
+
+class TestCompaction:
+
+    def test_merge_observations_sorts_dedupes_and_prefers_compacted(self):
+        compacted = {"observations": [{"date": "2022-07-01", "value": "compacted"}]}
+        dailies = [
+            {"observations": [{"date": "2022-07-05", "value": "5"}]},
+            {"observations": [{"date": "2022-07-01", "value": "daily"}]},
+        ]
+
+        assert merge_observations(compacted, dailies) == [
+            {"date": "2022-07-01", "value": "compacted"},
+            {"date": "2022-07-05", "value": "5"},
+        ]
+
+    def test_compact_merges_month_into_single_sorted_object(self, s3_client):
+        for date, value in [("2022-07-21", "3"), ("2022-07-19", "1"), ("2022-07-20", "2")]:
+            _put_daily(s3_client, "SP500", date, value)
+        _put_daily(s3_client, "SP500", "2022-08-01", "other-month")
+
+        result = MonthlyCompactor(s3_client, BUCKET).compact("SP500", 2022, 7)
+
+        compacted = _read(s3_client, compacted_object_key("SP500", 2022, 7))
+        assert [o["date"] for o in compacted["observations"]] == ["2022-07-19", "2022-07-20", "2022-07-21"]
+        assert (compacted["observation_start"], compacted["observation_end"]) == ("2022-07-19", "2022-07-21")
+        assert compacted["units"] == "lin"
+        assert result["DailyObjectsMerged"] == 3
+
+    def test_compact_is_idempotent_and_deletes_dailies_when_asked(self, s3_client):
+        daily_keys = [_put_daily(s3_client, "SP500", d, "1") for d in ("2022-07-19", "2022-07-20")]
+        compactor = MonthlyCompactor(s3_client, BUCKET, delete_daily=True)
+
+        first = compactor.compact("SP500", 2022, 7)
+        snapshot = _read(s3_client, compacted_object_key("SP500", 2022, 7))
+        second = compactor.compact("SP500", 2022, 7)
+
+        assert first["DailyObjectsDeleted"] == 2
+        assert second["DailyObjectsMerged"] == 0
+        assert _keys(s3_client, "fred/SP500/") == [compacted_object_key("SP500", 2022, 7)]
+        assert _read(s3_client, compacted_object_key("SP500", 2022, 7)) == snapshot
+        assert not set(daily_keys) & set(_keys(s3_client, "fred/"))
+
+    def test_compact_folds_late_dailies_into_existing_compacted_object(self, s3_client):
+        _put_daily(s3_client, "SP500", "2022-07-19", "1")
+        compactor = MonthlyCompactor(s3_client, BUCKET, delete_daily=True)
+        compactor.compact("SP500", 2022, 7)
+
+        _put_daily(s3_client, "SP500", "2022-07-20", "2")
+        compactor.compact("SP500", 2022, 7)
+
+        compacted = _read(s3_client, compacted_object_key("SP500", 2022, 7))
+        assert [o["date"] for o in compacted["observations"]] == ["2022-07-19", "2022-07-20"]
+
+    def test_merge_observations_prefers_revised_dailies(self):
+        compacted = {"observations": [{"date": "2022-07-01", "value": "compacted"}]}
+        revised = [{"observations": [{"date": "2022-07-01", "value": "revised"}]}]
+
+        assert merge_observations(compacted, [], revised) == [{"date": "2022-07-01", "value": "revised"}]
+
+    def test_daily_revised_after_compaction_survives_recompaction(self, s3_client):
+        _put_daily(s3_client, "SP500", "2022-07-19", "1")
+        _put_daily(s3_client, "SP500", "2022-07-20", "2")
+        compactor = MonthlyCompactor(s3_client, BUCKET, delete_daily=True)
+        compactor.compact("SP500", 2022, 7)
+
+        _put_daily(s3_client, "SP500", "2022-07-20", "revised")
+        compactor.compact("SP500", 2022, 7)
+
+        compacted = _read(s3_client, compacted_object_key("SP500", 2022, 7))
+        assert compacted["observations"] == [
+            {"date": "2022-07-19", "value": "1"},
+            {"date": "2022-07-20", "value": "revised"},
+        ]
+        assert _keys(s3_client, "fred/SP500/") == [compacted_object_key("SP500", 2022, 7)]
+
+    @pytest.mark.parametrize(
+        "output_format,compression", [("ndjson", None), ("parquet", None), ("json", "zstd"), ("ndjson", "gzip")]
+    )
+    def test_compact_merges_dailies_of_every_output_format(self, s3_client, output_format, compression):
+        fred = FredExtractor(
+            {"time": "2022-08-01T00:00:00Z"}, None, None, BUCKET, api_key="key", s3_client=s3_client,
+            output_format=output_format, compression=compression,
+        )
+        fred.request_fred_data_range = Mock(
+            return_value={"observations": [{"date": "2022-07-19", "value": "1.5"}, {"date": "2022-07-20", "value": "2.5"}]}
+        )
+        fred.backfill("2022-07-19", "2022-07-20")
+
+        compactor = MonthlyCompactor(
+            s3_client, BUCKET, delete_daily=True, output_format=output_format, compression=compression
+        )
+        result = compactor.compact("SP500", 2022, 7)
+
+        key = compacted_object_key("SP500", 2022, 7, fred.serializer.EXTENSION)
+        body = s3_client.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+        assert [(o["date"], float(o["value"])) for o in decode_response(key, body)["observations"]] == [
+            ("2022-07-19", 1.5), ("2022-07-20", 2.5)
+        ]
+        assert (result["Key"], result["DailyObjectsMerged"], result["DailyObjectsDeleted"]) == (key, 2, 2)
+        assert _keys(s3_client, "fred/SP500/") == [key]
+
+    def test_compacted_object_in_previous_format_is_merged_and_replaced(self, s3_client):
+        _put_daily(s3_client, "SP500", "2022-07-19", "1")
+        MonthlyCompactor(s3_client, BUCKET, delete_daily=True).compact("SP500", 2022, 7)
+        _put_daily(s3_client, "SP500", "2022-07-20", "2")
+
+        result = MonthlyCompactor(s3_client, BUCKET, delete_daily=True, output_format="ndjson").compact("SP500", 2022, 7)
+
+        key = compacted_object_key("SP500", 2022, 7, "ndjson")
+        body = s3_client.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+        assert decode_response(key, body)["observations"] == [
+            {"date": "2022-07-19", "value": "1"},
+            {"date": "2022-07-20", "value": "2"},
+        ]
+        assert result["Key"] == key
+        assert _keys(s3_client, "fred/SP500/") == [key]
+
+    def test_compact_logs_objects_in_unknown_formats(self, s3_client, caplog):
+        _put_daily(s3_client, "SP500", "2022-07-19", "1")
+        stray = "fred/SP500/year=2022/month=07/SP500-2022-07-20.csv"
+        s3_client.put_object(Bucket=BUCKET, Key=stray, Body=b"date,value")
+
+        with caplog.at_level("WARNING"):
+            result = MonthlyCompactor(s3_client, BUCKET, delete_daily=True).compact("SP500", 2022, 7)
+
+        assert result["DailyObjectsMerged"] == 1
+        assert stray in caplog.text
+        assert stray in _keys(s3_client, "fred/SP500/")
+
+    def test_compact_many_processes_partitions_in_parallel(self, s3_client):
+        for series_id in ("SP500", "DGS10", "T10Y2Y"):
+            _put_daily(s3_client, series_id, "2022-07-19", "1")
+
+        results = MonthlyCompactor(s3_client, BUCKET, max_workers=3).compact_many(
+            [("SP500", 2022, 7), ("DGS10", 2022, 7), ("T10Y2Y", 2022, 7), ("SP500", 2022, 7)]
+        )
+
+        assert sorted(results) == sorted(compacted_object_key(s, 2022, 7) for s in ("SP500", "DGS10", "T10Y2Y"))
+        assert all(result["DailyObjectsMerged"] == 1 for result in results.values())
+
+    def test_compact_points_manifest_at_compacted_object(self, s3_client):
+        from src.fred_extractor.manifest import load_manifest
+        _put_daily(s3_client, "SP500", "2022-07-19", "1")
+        _put_daily(s3_client, "SP500", "2022-07-20", "2")
+
+        MonthlyCompactor(s3_client, BUCKET, delete_daily=True).compact("SP500", 2022, 7)
+
+        manifest, _ = load_manifest(s3_client, BUCKET, "SP500")
+        assert {e["key"] for e in manifest["entries"].values()} == {compacted_object_key("SP500", 2022, 7)}
@@ -0,0 +1,267 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from unittest.mock import Mock, patch
+
+from src.fred_extractor.fred_client import ApiKeyPool, FredClient, TokenBucket
+
+
+def _response(status_code, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+class TestTokenBucket:
+
+    def test_init_raises_value_error_for_non_positive_rate(self):
+        with pytest.raises(ValueError, match="must be positive"):
+            TokenBucket(rate=0, capacity=1)
+
+    def test_acquire_allows_burst_then_waits_for_refill(self, clock):
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(5)]
+
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3:] == [pytest.approx(0.5), pytest.approx(0.5)]
+        assert clock.now == pytest.approx(1.0)
+
+    def test_acquire_is_shared_safely_across_threads(self):
+        bucket = TokenBucket(rate=1000, capacity=50)
+        acquired = []
+
+        def worker():
+            for _ in range(20):
+                bucket.acquire()
+                acquired.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(acquired) == 100
+
+
+class TestFredClient:
+
+    def test_get_returns_response_without_retry_on_success(self):
+        client = FredClient(sleep=Mock())
+
+        with patch('requests.Session.get', return_value=_response(200)) as mock_get:
+            response = client.get("https://example.com", params={"a": 1}, timeout=5)
+
+        assert response.status_code == 200
+        mock_get.assert_called_once_with(url="https://example.com", params={"a": 1}, timeout=5)
+        assert client.stats["retries"] == 0
+
+    @pytest.mark.parametrize("status_code", [429, 500, 503])
+    def test_get_retries_throttled_and_server_errors(self, status_code):
+        sleep = Mock()
+        client = FredClient(sleep=sleep)
+
+        with patch('requests.Session.get', side_effect=[_response(status_code), _response(200)]) as mock_get:
+            response = client.get("https://example.com", params={}, timeout=5)
+
+        assert response.status_code == 200
+        assert mock_get.call_count == 2
+        assert client.stats["retries"] == 1
+        sleep.assert_called_once()
+
+    def test_get_gives_up_after_max_retries(self):
+        client = FredClient(max_retries=2, sleep=Mock())
+
+        with patch('requests.Session.get', return_value=_response(503)) as mock_get:
+            response = client.get("https://example.com", params={}, timeout=5)
+
+        assert response.status_code == 503
+        assert mock_get.call_count == 3
+        assert client.stats["retries"] == 2
+
+    def test_get_does_not_retry_client_errors(self):
+        client = FredClient(sleep=Mock())
+
+        with patch('requests.Session.get', return_value=_response(400)) as mock_get:
+            client.get("https://example.com", params={}, timeout=5)
+
+        mock_get.assert_called_once()
+
+    def test_get_honours_retry_after_header(self):
+        sleep = Mock()
+        client = FredClient(sleep=sleep)
+
+        with patch('requests.Session.get', side_effect=[_response(429, {"Retry-After": "7"}), _response(200)]):
+            client.get("https://example.com", params={}, timeout=5)
+
+        sleep.assert_called_once_with(7.0)
+
+    def test_backoff_is_jittered_and_capped(self):
+        client = FredClient()
+        delays = [client._backoff(attempt, None) for attempt in range(20)]
+
+        assert all(0 <= delay <= FredClient.BACKOFF_CAP for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_get_counts_throttle_waits(self, clock):
+        bucket = TokenBucket(rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+        client = FredClient(rate_limiter=bucket, sleep=clock.sleep)
+
+        with patch('requests.Session.get', return_value=_response(200)):
+            for _ in range(3):
+                client.get("https://example.com", params={}, timeout=5)
+
+        stats = client.stats
+        assert stats["requests"] == 3
+        assert stats["throttle_waits"] == 2
+        assert stats["throttle_wait_seconds"] == pytest.approx(2.0)
+
+
+class FakeFredServer:
+    """Local FRED stand-in that enforces a per-key rate limit and rejects unknown keys."""
+
+    def __init__(self, keys, requests_per_second, burst=1, throttled=()):
+        self.keys = set(keys)
+        self.throttled = set(throttled)
+        self.buckets = {key: TokenBucket(rate=requests_per_second, capacity=burst) for key in self.keys}
+        self.hits = {}
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                key = parse_qs(urlparse(self.path).query).get("api_key", [""])[0]
+                with server.lock:
+                    server.hits[key] = server.hits.get(key, 0) + 1
+                if key not in server.keys:
+                    status, body = 400, {"error_code": 400, "error_message": "Bad Request. The value for variable api_key is not registered."}
+                elif key in server.throttled or server.buckets[key].try_acquire() > 0:
+                    status, body = 429, {"error_code": 429, "error_message": "Too Many Requests."}
+                else:
+                    status, body = 200, {"count": 0, "observations": []}
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/fred/series/observations"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def fake_fred():
+    servers = []
+
+    def start(*args, **kwargs):
+        servers.append(FakeFredServer(*args, **kwargs))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def _fetch_all(client, url, count, key, max_workers=8):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda _: client.get(url, params={"api_key": key}, timeout=5).status_code, range(count)))
+
+
+class TestApiKeyPool:
+
+    def test_acquire_round_robins_across_keys(self, clock):
+        pool = ApiKeyPool(["a", "b", "c"], requests_per_minute=60, burst=2, clock=clock, sleep=clock.sleep)
+
+        assert [pool.acquire()[0] for _ in range(6)] == ["a", "b", "c", "a", "b", "c"]
+        assert clock.now == 0.0
+
+    def test_benched_key_is_skipped_until_bench_ends(self, clock):
+        pool = ApiKeyPool(["a", "b"], requests_per_minute=6000, burst=10, clock=clock, sleep=clock.sleep)
+
+        pool.bench("a", 30)
+
+        assert [pool.acquire()[0] for _ in range(3)] == ["b", "b", "b"]
+        assert pool.available() == 1
+        clock.now += 30
+        assert {pool.acquire()[0] for _ in range(2)} == {"a", "b"}
+
+    def test_acquire_waits_for_the_first_key_with_a_token(self, clock):
+        pool = ApiKeyPool(["a", "b"], requests_per_minute=60, burst=1, clock=clock, sleep=clock.sleep)
+
+        waits = [pool.acquire()[1] for _ in range(4)]
+
+        assert waits == [0.0, 0.0, pytest.approx(1.0), 0.0]
+
+    def test_use_api_keys_keeps_pool_for_same_keys_and_drops_it_for_one(self):
+        client = FredClient()
+        client.use_api_keys(["a", "b"])
+        pool = client.key_pool
+
+        client.use_api_keys(["a", "b", "a"])
+        assert client.key_pool is pool
+        client.use_api_keys(["a"])
+        assert client.key_pool is None
+
+    def test_set_requests_per_minute_rebuilds_budgets_only_when_the_rate_changes(self):
+        client = FredClient(requests_per_minute=120)
+        client.use_api_keys(["a", "b"])
+        limiter, pool = client.rate_limiter, client.key_pool
+
+        client.set_requests_per_minute(120)
+        assert (client.rate_limiter, client.key_pool) == (limiter, pool)
+
+        client.set_requests_per_minute(30)
+        assert client.rate_limiter.rate == pytest.approx(0.5)
+        assert client.key_pool is not pool and client.key_pool.keys == ("a", "b")
+        assert client.requests_per_minute == 30
+
+
+class TestApiKeyPoolAgainstFakeFred:
+
+    def test_throughput_grows_with_the_number_of_keys(self, fake_fred):
+        keys = ["k1", "k2", "k3", "k4"]
+        # A little server-side burst absorbs scheduling jitter between client and server clocks
+        server = fake_fred(keys, requests_per_second=10, burst=3)
+
+        def timed(client_keys):
+            client = FredClient(requests_per_minute=600, burst=1)
+            client.use_api_keys(client_keys)
+            started = time.monotonic()
+            statuses = _fetch_all(client, server.url, 12, client_keys[0])
+            return time.monotonic() - started, statuses
+
+        single, single_statuses = timed(["k1"])
+        pooled, pooled_statuses = timed(keys)
+
+        assert set(single_statuses) == set(pooled_statuses) == {200}
+        assert pooled * 2.5 < single
+        assert [server.hits[key] for key in keys[1:]] == [3, 3, 3]
+
+    def test_throttled_and_rejected_keys_are_benched(self, fake_fred):
+        server = fake_fred(["hot", "good"], requests_per_second=1000, burst=100, throttled=["hot"])
+        client = FredClient(requests_per_minute=60000, burst=100)
+        client.use_api_keys(["bad", "hot", "good"])
+
+        # One request at a time, so each bad key is benched before it could be handed out again
+        statuses = _fetch_all(client, server.url, 10, "bad", max_workers=1)
+
+        assert statuses == [200] * 10
+        assert (server.hits["bad"], server.hits["hot"], server.hits["good"]) == (1, 1, 10)
+        assert client.stats["keys_benched"] == 2
+        assert client.key_pool.available() == 1
@@ -7,6 +7,7 @@ from requests import HTTPError
 from botocore.stub import Stubber
 from botocore.exceptions import ClientError
 from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.fred_client import FredClient
 
 
 class TestFredExtractor:
@@ -42,7 +43,7 @@ class TestFredExtractor:
             "bucket",
         )
 
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_response = Mock()
             mock_response.json.return_value = api_response_fixture
             mock_get.return_value = mock_response
@@ -54,7 +55,7 @@ class TestFredExtractor:
     def test_request_fred_data_calls_api_with_correct_parameters(self, event_fixture):
         fred = FredExtractor(event_fixture, None, None, "bucket")
 
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_response = Mock()
             mock_response.json.return_value = {"observations": []}
             mock_get.return_value = mock_response
@@ -64,8 +65,8 @@ class TestFredExtractor:
             mock_get.assert_called_once_with(url=FredExtractor.API_URL, timeout=FredExtractor.API_TIMEOUT, params={
                 "series_id": fred.series_id,
                 "frequency": "d",
-                "observation_start": fred.observation_date.format("YYYY-MM-DD"),
-                "observation_end": fred.observation_date.format("YYYY-MM-DD"),
+                "observation_start": "2022-07-21",
+                "observation_end": "2022-07-21",
                 "api_key": "test-api-key",
                 "file_type": "json",
             })
@@ -73,7 +74,7 @@ class TestFredExtractor:
     def test_request_fred_data_uses_custom_series_id(self, event_fixture):
         fred = FredExtractor(event_fixture, None, None, "bucket", series_id="DGS10")
 
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_response = Mock()
             mock_response.json.return_value = {"observations": []}
             mock_get.return_value = mock_response
@@ -85,7 +86,7 @@ class TestFredExtractor:
     def test_request_fred_data_raises_http_error_on_4xx(self, event_fixture):
         fred = FredExtractor(event_fixture, None, None, "bucket")
 
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_response = Mock()
             mock_response.raise_for_status.side_effect = HTTPError(response=Mock(status_code=400))
             mock_get.return_value = mock_response
@@ -164,6 +165,52 @@ class TestFredExtractor:
                 with pytest.raises(ValueError, match="missing required key: 'fred-api-key'"):
                     fred.retrieve_api_key()
 
+    def test_retrieve_api_key_spreads_requests_across_listed_keys(self, event_fixture):
+        session = boto3.session.Session(region_name='us-east-1')
+        fred_client = FredClient()
+        fred = FredExtractor(event_fixture, None, session, "bucket", fred_client=fred_client)
+        client = session.client('secretsmanager')
+
+        with Stubber(client) as stubber:
+            stubber.add_response(
+                'get_secret_value',
+                {
+                    'SecretString': '{"fred-api-key": "key-1", "fred-api-keys": ["key-2", "key-3"]}',
+                    'VersionId': 'a1b2c3d4-5678-90ab-cdef-1234567890ab',
+                    'ARN': 'arn:aws:secretsmanager:us-east-1:123456789012:secret:test'
+                },
+                {'SecretId': 'dev/FredExtractor/APIKey'}
+            )
+
+            with patch.object(session, 'client', return_value=client):
+                assert fred.retrieve_api_key() == "key-1"
+
+        assert fred_client.key_pool.keys == ("key-1", "key-2", "key-3")
+
+    @pytest.mark.parametrize("listed_keys", ['"key-2"', '["key-2", ""]', '["key-2", 3]', '{"key": "key-2"}'])
+    def test_retrieve_api_key_rejects_listed_keys_that_are_not_strings(self, event_fixture, listed_keys):
+        session = boto3.session.Session(region_name='us-east-1')
+        fred_client = FredClient()
+        fred = FredExtractor(event_fixture, None, session, "bucket", fred_client=fred_client)
+        client = session.client('secretsmanager')
+
+        with Stubber(client) as stubber:
+            stubber.add_response(
+                'get_secret_value',
+                {
+                    'SecretString': f'{{"fred-api-key": "key-1", "fred-api-keys": {listed_keys}}}',
+                    'VersionId': 'a1b2c3d4-5678-90ab-cdef-1234567890ab',
+                    'ARN': 'arn:aws:secretsmanager:us-east-1:123456789012:secret:test'
+                },
+                {'SecretId': 'dev/FredExtractor/APIKey'}
+            )
+
+            with patch.object(session, 'client', return_value=client):
+                with pytest.raises(ValueError, match="'fred-api-keys' must be a list of non-empty strings"):
+                    fred.retrieve_api_key()
+
+        assert fred_client.key_pool is None
+
     def test_retrieve_api_key_raises_value_error_for_invalid_json(self, event_fixture):
         session = boto3.session.Session(region_name='us-east-1')
         fred = FredExtractor(event_fixture, None, session, "bucket")
@@ -226,3 +273,116 @@ class TestFredExtractor:
         key = fred.generate_s3_object_key()
         assert key == "fred/SP500/year=2022/month=07/SP500-2022-07-21.json"
 
+
+    def test_generate_s3_object_key_uses_given_date(self, event_fixture):
+        fred = FredExtractor(event_fixture, None, None, "bucket")
+        key = fred.generate_s3_object_key(pendulum.parse("2021-12-31"))
+        assert key == "fred/SP500/year=2021/month=12/SP500-2021-12-31.json"
+
+    def test_request_fred_data_range_pages_with_limit_and_offset(self, event_fixture):
+        fred = FredExtractor(event_fixture, None, None, "bucket")
+        fred.API_PAGE_LIMIT = 2
+        pages = [
+            {"count": 5, "offset": 0, "observations": [{"date": "2022-01-03"}, {"date": "2022-01-04"}]},
+            {"count": 5, "offset": 2, "observations": [{"date": "2022-01-05"}, {"date": "2022-01-06"}]},
+            {"count": 5, "offset": 4, "observations": [{"date": "2022-01-07"}]},
+        ]
+
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value.json.side_effect = pages
+            result = fred.request_fred_data_range("key", pendulum.parse("2022-01-01"), pendulum.parse("2022-01-31"))
+
+        assert [o["date"] for o in result["observations"]] == [
+            "2022-01-03", "2022-01-04", "2022-01-05", "2022-01-06", "2022-01-07"
+        ]
+        assert [c.kwargs["params"]["offset"] for c in mock_get.call_args_list] == [0, 2, 4]
+        assert mock_get.call_args.kwargs["params"]["observation_start"] == "2022-01-01"
+        assert mock_get.call_args.kwargs["params"]["observation_end"] == "2022-01-31"
+
+    def test_split_observations_by_date_returns_single_day_responses(self):
+        api_response = {
+            "units": "lin",
+            "observation_start": "2022-01-01",
+            "observation_end": "2022-01-31",
+            "count": 2,
+            "observations": [
+                {"date": "2022-01-03", "value": "1.0"},
+                {"date": "2022-01-04", "value": "2.0"},
+            ],
+        }
+
+        result = FredExtractor.split_observations_by_date(api_response)
+
+        assert result["2022-01-04"] == {
+            "units": "lin",
+            "observation_start": "2022-01-04",
+            "observation_end": "2022-01-04",
+            "count": 1,
+            "offset": 0,
+            "observations": [{"date": "2022-01-04", "value": "2.0"}],
+        }
+
+    def test_backfill_makes_one_api_call_and_writes_daily_objects(self, event_fixture, s3_client_mock):
+        s3_client = s3_client_mock
+        fred = FredExtractor(event_fixture, None, None, "bucket", api_key="key", s3_client=s3_client)
+        api_response = {
+            "count": 3,
+            "observations": [
+                {"date": "2021-12-31", "value": "1.0"},
+                {"date": "2022-01-03", "value": "2.0"},
+                {"date": "2022-01-04", "value": "."},
+            ],
+        }
+
+        with patch('requests.Session.get') as mock_get:
+            mock_get.return_value.json.return_value = api_response
+            result = fred.backfill("2021-12-30", "2022-01-04")
+
+        assert result == {
+            "HTTPStatusCode": 200, "ObjectsWritten": 3, "ObjectsSkipped": 0, "LastObservationDate": "2022-01-04"
+        }
+        mock_get.assert_called_once()
+        assert sorted(c.kwargs["Key"] for c in s3_client.put_object.call_args_list) == [
+            "fred-state/SP500/manifest.json",
+            "fred/SP500/year=2021/month=12/SP500-2021-12-31.json",
+            "fred/SP500/year=2022/month=01/SP500-2022-01-03.json",
+            "fred/SP500/year=2022/month=01/SP500-2022-01-04.json",
+        ]
+
+    def test_backfill_raises_value_error_when_start_after_end(self, event_fixture):
+        fred = FredExtractor(event_fixture, None, None, "bucket", api_key="key")
+        with pytest.raises(ValueError, match="is after end"):
+            fred.backfill("2022-02-01", "2022-01-01")
+
+    def test_retrieve_api_key_is_shared_across_extractor_instances(self, event_fixture):
+        session = Mock()
+        session.client.return_value.get_secret_value.return_value = {"SecretString": '{"fred-api-key": "shared"}'}
+
+        first = FredExtractor(event_fixture, None, session, "bucket").retrieve_api_key()
+        second = FredExtractor(event_fixture, None, session, "bucket").retrieve_api_key()
+
+        assert first == second == "shared"
+        session.client.return_value.get_secret_value.assert_called_once()
+
+    def test_request_fred_data_refreshes_rotated_api_key_and_retries(self, event_fixture, api_response_fixture):
+        session = Mock()
+        session.client.return_value.get_secret_value.side_effect = [
+            {"SecretString": '{"fred-api-key": "old-key"}'},
+            {"SecretString": '{"fred-api-key": "new-key"}'},
+        ]
+        fred = FredExtractor(event_fixture, None, session, "bucket")
+
+        rejected = Mock(status_code=400)
+        rejected.json.return_value = {
+            "error_code": 400,
+            "error_message": "Bad Request.  The value for variable api_key is not registered.",
+        }
+        accepted = Mock(status_code=200)
+        accepted.json.return_value = api_response_fixture
+
+        with patch('requests.Session.get', side_effect=[rejected, accepted]) as mock_get:
+            result = fred.request_fred_data(fred.retrieve_api_key())
+
+        assert result == api_response_fixture
+        assert [c.kwargs["params"]["api_key"] for c in mock_get.call_args_list] == ["old-key", "new-key"]
+        assert fred.retrieve_api_key() == "new-key"
@@ -0,0 +1,171 @@
+import datetime
+from unittest.mock import Mock, patch
+
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.gaps import GapScanner, business_days, coalesce
+from src.fred_extractor.manifest import update_manifest
+from src.fred_extractor.metrics import MetricsLogger
+from tests.src.conftest import BUCKET
+
+
+def _extractor(s3_client):
+    return FredExtractor(
+        {"time": "2024-01-01T21:00:00Z"},
+        None,
+        None,
+        BUCKET,
+        series_id="SP500",
+        api_key="key",
+        s3_client=s3_client,
+        metrics=MetricsLogger(enabled=False),
+    )
+
+
+def _fred_range(skipped=()):
+    """Mock FRED: every business day in the requested range but the skipped ones has an observation."""
+
+    def get(**kwargs):
+        params = kwargs["params"]
+        dates = [d for d in business_days(params["observation_start"], params["observation_end"]) if d not in skipped]
+        response = Mock(status_code=200)
+        response.json.return_value = {
+            "count": len(dates),
+            "observations": [{"date": d, "value": "1.0"} for d in dates],
+        }
+        return response
+
+    return get
+
+
+def _store(s3_client, dates):
+    entries = [
+        {
+            "date": d,
+            "key": FredExtractor.build_s3_object_key("SP500", datetime.date.fromisoformat(d)),
+            "size": 1,
+            "sha256": "x",
+        }
+        for d in dates
+    ]
+    update_manifest(s3_client, BUCKET, "SP500", entries)
+
+
+class TestCoalesce:
+    def test_weekend_does_not_split_a_gap(self):
+        expected = business_days("2024-01-01", "2024-01-31")
+
+        assert coalesce(["2024-01-05", "2024-01-08", "2024-01-09"], expected, max_bridge=0) == [
+            ("2024-01-05", "2024-01-09")
+        ]
+
+    def test_bridges_short_runs_of_present_days(self):
+        expected = business_days("2024-01-01", "2024-01-31")
+        missing = ["2024-01-02", "2024-01-05", "2024-01-29"]
+
+        assert coalesce(missing, expected, max_bridge=2) == [("2024-01-02", "2024-01-05"), ("2024-01-29", "2024-01-29")]
+        assert coalesce(missing, expected, max_bridge=20) == [("2024-01-02", "2024-01-29")]
+
+    def test_business_days_skip_holidays(self):
+        assert business_days("2023-12-29", "2024-01-02", holidays=["2024-01-01"]) == ["2023-12-29", "2024-01-02"]
+
+
+class TestGapScanner:
+    def test_scans_the_manifest_without_reading_objects(self, s3_client):
+        expected = business_days("2023-01-01", "2023-12-31")
+        _store(s3_client, [d for d in expected if d not in {"2023-03-15", "2023-03-16"}])
+        scanner = GapScanner(s3_client, BUCKET)
+
+        with patch.object(s3_client, "get_object", wraps=s3_client.get_object) as get_object:
+            gaps = scanner.scan("SP500", "2023-01-01", "2023-12-31")
+
+        assert gaps == {"missing": ["2023-03-15", "2023-03-16"], "ranges": [("2023-03-15", "2023-03-16")]}
+        assert get_object.call_count == 1
+
+    def test_falls_back_to_listing_without_a_manifest(self, s3_client):
+        for key in (
+            FredExtractor.build_s3_object_key("SP500", datetime.date(2022, 7, 18)),
+            FredExtractor.build_s3_object_key("SP500", datetime.date(2022, 7, 20), "json.gz"),
+            "fred/SP500/year=2022/month=06/SP500-2022-06.json",
+        ):
+            s3_client.put_object(Bucket=BUCKET, Key=key, Body=b"{}")
+
+        gaps = GapScanner(s3_client, BUCKET).scan("SP500", "2022-06-27", "2022-07-22", max_bridge=0)
+
+        assert gaps["missing"] == ["2022-07-01", "2022-07-04", "2022-07-05", "2022-07-06", "2022-07-07"] + [
+            "2022-07-08",
+            "2022-07-11",
+            "2022-07-12",
+            "2022-07-13",
+            "2022-07-14",
+            "2022-07-15",
+            "2022-07-19",
+            "2022-07-21",
+            "2022-07-22",
+        ]
+        assert gaps["ranges"] == [
+            ("2022-07-01", "2022-07-15"),
+            ("2022-07-19", "2022-07-19"),
+            ("2022-07-21", "2022-07-22"),
+        ]
+
+    def test_merges_the_manifest_with_objects_written_before_it(self, s3_client):
+        for day in business_days("2022-07-01", "2022-07-21"):
+            key = FredExtractor.build_s3_object_key("SP500", datetime.date.fromisoformat(day))
+            s3_client.put_object(Bucket=BUCKET, Key=key, Body=b"{}")
+        # The first write after the upgrade creates a manifest holding only its own date
+        _store(s3_client, ["2022-07-22"])
+
+        with patch("requests.Session.get") as get:
+            response = _extractor(s3_client).repair_gaps("2022-07-01", "2022-07-22")
+
+        assert GapScanner(s3_client, BUCKET).scan("SP500", "2022-07-01", "2022-07-22")["missing"] == []
+        assert response["HTTPStatusCode"] == 204
+        get.assert_not_called()
+
+
+class TestRepairGaps:
+    def test_repairs_scattered_gaps_in_a_handful_of_calls(self, s3_client):
+        expected = business_days("2023-01-01", "2023-12-31")
+        missing = expected[3::6][:40]
+        # A backfill during an outage left 40 scattered days unwritten
+        with patch("requests.Session.get", side_effect=_fred_range(skipped=set(missing))):
+            _extractor(s3_client).backfill("2023-01-01", "2023-12-31")
+
+        with patch("requests.Session.get", side_effect=_fred_range()) as get:
+            response = _extractor(s3_client).repair_gaps("2023-01-01", "2023-12-31")
+
+        assert (response["HTTPStatusCode"], response["Gaps"]) == (200, 40)
+        assert get.call_count == len(response["Ranges"]) <= 3
+        assert response["ObjectsWritten"] == 40
+        assert GapScanner(s3_client, BUCKET).scan("SP500", "2023-01-01", "2023-12-31")["missing"] == []
+
+    def test_nothing_missing_makes_no_requests(self, s3_client):
+        _store(s3_client, business_days("2023-12-01", "2023-12-29"))
+
+        with patch("requests.Session.get") as get:
+            response = _extractor(s3_client).repair_gaps("2023-12-01", "2023-12-29")
+
+        assert response["HTTPStatusCode"] == 204
+        get.assert_not_called()
+
+    def test_second_repair_does_not_refetch_confirmed_holidays(self, s3_client):
+        holidays = {"2023-07-04", "2023-09-04"}
+        with patch("requests.Session.get", side_effect=_fred_range(skipped=holidays)):
+            first = _extractor(s3_client).repair_gaps("2023-07-01", "2023-09-29")
+
+        with patch("requests.Session.get") as get:
+            second = _extractor(s3_client).repair_gaps("2023-07-01", "2023-09-29")
+
+        assert (first["Gaps"], first["EmptyDates"]) == (len(business_days("2023-07-01", "2023-09-29")), 2)
+        assert (second["HTTPStatusCode"], second["Gaps"]) == (204, 0)
+        get.assert_not_called()
+
+    def test_days_after_the_last_observation_are_not_marked_empty(self, s3_client):
+        _store(s3_client, business_days("2023-12-01", "2023-12-27"))
+        unpublished = {"2023-12-28", "2023-12-29"}
+
+        with patch("requests.Session.get", side_effect=_fred_range(skipped=unpublished)):
+            response = _extractor(s3_client).repair_gaps("2023-12-01", "2023-12-29")
+
+        assert (response["Gaps"], response["EmptyDates"]) == (2, 0)
+        assert GapScanner(s3_client, BUCKET).scan("SP500", "2023-12-01", "2023-12-29")["missing"] == sorted(unpublished)
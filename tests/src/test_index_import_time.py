@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "src")
+# Cumulative import time of the handler module, i.e. what every cold start pays before the first event.
+# Measured at about 190ms best-of-5, of which boto3 is about 150ms; the rest is margin for slower runners
+IMPORT_BUDGET_MS = float(os.getenv("FRED_IMPORT_BUDGET_MS", "400"))
+# Only needed by optional formats, readers, aggregation or a single handler mode; never on the extraction path
+LAZY_MODULES = (
+    "pendulum",
+    "toolz",
+    "pyarrow",
+    "numpy",
+    "pandas",
+    "zstandard",
+    "fred_extractor.catalog",
+    "fred_extractor.compaction",
+    "fred_extractor.multi_series_extractor",
+    "fred_extractor.response_cache",
+)
+
+
+# The multi-series mode needs the extractor itself, but a catalog or response cache only when configured
+MULTI_SERIES_LAZY_MODULES = ("fred_extractor.catalog", "fred_extractor.response_cache", "pyarrow")
+
+
+def _import_times(module: str = "index") -> dict:
+    env = {**os.environ, "FRED_BUCKET_NAME": "test-bucket", "AWS_DEFAULT_REGION": "us-east-1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times.setdefault(name.strip(), int(cumulative) / 1000)
+    return times
+
+
+class TestIndexImportTime:
+
+    # Wall-clock budget, so it depends on the runner; the module lists below are the deterministic check
+    @pytest.mark.slow
+    def test_handler_import_stays_within_budget(self):
+        _import_times()  # warm up bytecode caches so the measurement reflects a deployed package
+        best = min(_import_times()["index"] for _ in range(5))
+        assert best < IMPORT_BUDGET_MS, f"importing index took {best:.0f}ms, budget is {IMPORT_BUDGET_MS:.0f}ms"
+
+    def test_handler_import_does_not_load_heavy_optional_modules(self):
+        loaded = _import_times()
+        assert [module for module in LAZY_MODULES if module in loaded] == []
+
+    def test_multi_series_import_does_not_load_catalog_or_response_cache(self):
+        loaded = _import_times("fred_extractor.multi_series_extractor")
+        assert [module for module in MULTI_SERIES_LAZY_MODULES if module in loaded] == []
@@ -0,0 +1,187 @@
+import hashlib
+import pytest
+from unittest.mock import Mock
+from botocore.exceptions import ClientError
+
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.manifest import (
+    ManifestConflictError,
+    load_manifest,
+    manifest_dates,
+    manifest_key,
+    update_manifest,
+)
+from tests.src.conftest import BUCKET
+
+
+def _entry(date):
+    return {"date": date, "key": f"fred/SP500/{date}.json", "size": 10, "sha256": "abc"}
+
+
+class TestManifest:
+
+    def test_load_manifest_returns_empty_manifest_when_missing(self, s3_client):
+        manifest, etag = load_manifest(s3_client, BUCKET, "SP500")
+
+        assert manifest == {"series_id": "SP500", "version": 0, "entries": {}}
+        assert etag is None
+
+    def test_update_manifest_creates_and_extends_manifest(self, s3_client):
+        update_manifest(s3_client, BUCKET, "SP500", [_entry("2022-07-21")])
+        update_manifest(s3_client, BUCKET, "SP500", [_entry("2022-07-19"), _entry("2022-07-20")])
+
+        manifest, etag = load_manifest(s3_client, BUCKET, "SP500")
+        assert list(manifest["entries"]) == ["2022-07-19", "2022-07-20", "2022-07-21"]
+        assert manifest["version"] == 2
+        assert etag is not None
+
+    def test_update_manifest_retries_without_losing_concurrent_entries(self, s3_client):
+        update_manifest(s3_client, BUCKET, "SP500", [_entry("2022-07-19")])
+        real_put = s3_client.put_object
+        racing_client = Mock(wraps=s3_client)
+        raced = []
+
+        def put_after_competing_writer(**kwargs):
+            if not raced:
+                # Another writer slips in between our read and our conditional write
+                raced.append(True)
+                update_manifest(s3_client, BUCKET, "SP500", [_entry("2022-07-20")])
+            return real_put(**kwargs)
+
+        racing_client.put_object.side_effect = put_after_competing_writer
+        sleep = Mock()
+
+        update_manifest(racing_client, BUCKET, "SP500", [_entry("2022-07-21")], sleep=sleep)
+
+        manifest, _ = load_manifest(s3_client, BUCKET, "SP500")
+        assert list(manifest["entries"]) == ["2022-07-19", "2022-07-20", "2022-07-21"]
+        sleep.assert_called_once()
+
+    def test_update_manifest_raises_after_max_attempts(self):
+        s3_client = Mock()
+        s3_client.get_object.side_effect = ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        s3_client.put_object.side_effect = ClientError({"Error": {"Code": "PreconditionFailed"}}, "PutObject")
+
+        with pytest.raises(ManifestConflictError):
+            update_manifest(s3_client, BUCKET, "SP500", [_entry("2022-07-21")], max_attempts=3, sleep=Mock())
+
+        assert s3_client.put_object.call_count == 3
+
+    def test_manifest_dates_filters_inclusive_range(self):
+        manifest = {"entries": {d: {} for d in ("2022-07-18", "2022-07-19", "2022-07-20", "2022-07-21")}}
+        assert manifest_dates(manifest, "2022-07-19", "2022-07-20") == ["2022-07-19", "2022-07-20"]
+
+    def test_store_fred_data_in_s3_records_key_size_and_hash(self, event_fixture, api_response_fixture, s3_client):
+        fred = FredExtractor(event_fixture, None, None, BUCKET, s3_client=s3_client)
+
+        fred.store_fred_data_in_s3(api_response_fixture)
+
+        manifest, _ = load_manifest(s3_client, BUCKET, "SP500")
+        entry = manifest["entries"]["2022-07-21"]
+        body = s3_client.get_object(Bucket=BUCKET, Key=entry["key"])["Body"].read()
+        assert entry["key"] == "fred/SP500/year=2022/month=07/SP500-2022-07-21.json"
+        assert entry["size"] == len(body)
+        assert entry["sha256"] == hashlib.sha256(body).hexdigest()
+        assert manifest_key("SP500") in [o["Key"] for o in s3_client.list_objects_v2(Bucket=BUCKET)["Contents"]]
+
+    def test_store_fred_data_in_s3_reads_manifest_once(self, event_fixture, api_response_fixture, s3_client):
+        counting_client = Mock(wraps=s3_client)
+        fred = FredExtractor(event_fixture, None, None, BUCKET, s3_client=counting_client)
+
+        fred.store_fred_data_in_s3(api_response_fixture)
+
+        reads = [c for c in counting_client.get_object.call_args_list if c.kwargs["Key"] == manifest_key("SP500")]
+        assert len(reads) == 1
+        assert manifest_dates(load_manifest(s3_client, BUCKET, "SP500")[0]) == ["2022-07-21"]
+
+    def test_update_manifest_rereads_when_loaded_copy_is_stale(self, s3_client):
+        stale = load_manifest(s3_client, BUCKET, "SP500")
+        update_manifest(s3_client, BUCKET, "SP500", [_entry("2022-07-20")])
+
+        update_manifest(s3_client, BUCKET, "SP500", [_entry("2022-07-21")], sleep=lambda _: None, loaded=stale)
+
+        assert manifest_dates(load_manifest(s3_client, BUCKET, "SP500")[0]) == ["2022-07-20", "2022-07-21"]
+
+
+class TestSkipUnchanged:
+
+    @staticmethod
+    def _versions(s3_client, key):
+        return len(s3_client.list_object_versions(Bucket=BUCKET, Prefix=key).get("Versions", []))
+
+    def test_store_twice_writes_one_version(self, event_fixture, api_response_fixture, s3_client):
+        s3_client.put_bucket_versioning(Bucket=BUCKET, VersioningConfiguration={"Status": "Enabled"})
+        fred = FredExtractor(event_fixture, None, None, BUCKET, s3_client=s3_client)
+
+        fred.store_fred_data_in_s3(api_response_fixture)
+        # A retry sees the same data with a new realtime stamp
+        result = fred.store_fred_data_in_s3({**api_response_fixture, "realtime_start": "2022-07-23"})
+
+        key = "fred/SP500/year=2022/month=07/SP500-2022-07-21.json"
+        assert result == {"HTTPStatusCode": 200, "ObjectsSkipped": 1}
+        assert self._versions(s3_client, key) == 1
+        assert self._versions(s3_client, manifest_key("SP500")) == 1
+        head = s3_client.head_object(Bucket=BUCKET, Key=key)
+        assert head["Metadata"]["content-sha256"] == fred.content_hash(api_response_fixture)
+
+    def test_backfill_rewrites_only_changed_dates(self, event_fixture, s3_client):
+        fred = FredExtractor(event_fixture, None, None, BUCKET, api_key="key", s3_client=s3_client)
+        observations = [{"date": d, "value": "1.0"} for d in ("2022-07-18", "2022-07-19", "2022-07-20")]
+        fred.request_fred_data_range = Mock(return_value={"observations": observations})
+        fred.backfill("2022-07-18", "2022-07-20")
+
+        observations[1] = {"date": "2022-07-19", "value": "2.0"}
+        result = fred.backfill("2022-07-18", "2022-07-20")
+
+        assert (result["ObjectsWritten"], result["ObjectsSkipped"]) == (1, 2)
+        manifest, _ = load_manifest(s3_client, BUCKET, "SP500")
+        assert manifest["version"] == 2
+        assert manifest["entries"]["2022-07-19"]["content_sha256"] == fred.content_hash({"observations": [observations[1]]})
+
+    def test_backfill_records_successful_uploads_when_one_fails(self, event_fixture, s3_client):
+        fred = FredExtractor(event_fixture, None, None, BUCKET, api_key="key", s3_client=s3_client)
+        observations = [{"date": d, "value": "1.0"} for d in ("2022-07-18", "2022-07-19", "2022-07-20")]
+        fred.request_fred_data_range = Mock(return_value={"observations": observations})
+        put_object = fred._put_object
+
+        def failing_put(key, payload, stored=None):
+            if key.endswith("2022-07-19.json"):
+                raise ClientError({"Error": {"Code": "InternalError"}}, "PutObject")
+            return put_object(key, payload, stored)
+
+        fred._put_object = failing_put
+        with pytest.raises(ClientError):
+            fred.backfill("2022-07-18", "2022-07-20")
+
+        manifest, _ = load_manifest(s3_client, BUCKET, "SP500")
+        assert sorted(manifest["entries"]) == ["2022-07-18", "2022-07-20"]
+
+    def test_entry_without_content_hash_falls_back_to_head(self, event_fixture, api_response_fixture, s3_client):
+        fred = FredExtractor(event_fixture, None, None, BUCKET, s3_client=s3_client)
+        fred.store_fred_data_in_s3(api_response_fixture)
+        # Entries recorded before content hashes were kept
+        manifest, _ = load_manifest(s3_client, BUCKET, "SP500")
+        legacy = {k: v for k, v in manifest["entries"]["2022-07-21"].items() if k != "content_sha256"}
+        s3_client.put_object = Mock(wraps=s3_client.put_object)
+
+        _, entry = fred._put_object(legacy["key"], api_response_fixture, legacy)
+
+        assert entry == {**legacy, "content_sha256": fred.content_hash(api_response_fixture)}
+        s3_client.put_object.assert_not_called()
+
+    def test_content_hash_depends_on_output_format(self, event_fixture, api_response_fixture):
+        json_hash = FredExtractor(event_fixture, None, None, BUCKET).content_hash(api_response_fixture)
+        compact = FredExtractor(event_fixture, None, None, BUCKET, output_format="json-compact")
+
+        assert compact.content_hash(api_response_fixture) != json_hash
+
+
+class TestEmptyDates:
+
+    def test_empty_dates_are_kept_until_an_entry_is_recorded(self, s3_client):
+        update_manifest(s3_client, BUCKET, "SP500", [], empty_dates=["2022-07-04", "2022-09-05"])
+        update_manifest(s3_client, BUCKET, "SP500", [_entry("2022-07-04")])
+
+        manifest, _ = load_manifest(s3_client, BUCKET, "SP500")
+        assert manifest["empty_dates"] == ["2022-09-05"]
+        assert list(manifest["entries"]) == ["2022-07-04"]
@@ -0,0 +1,97 @@
+import io
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.metrics import MetricsLogger
+
+
+def _records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestMetricsLogger:
+    def test_emit_writes_one_emf_line(self):
+        stream = io.StringIO()
+        MetricsLogger(stream=stream, clock=lambda: 1658448000.5).emit(
+            "SP500", "request_fred_data", {"Duration": 12.5, "PayloadBytes": 10}
+        )
+
+        [record] = _records(stream)
+        assert record["_aws"]["Timestamp"] == 1658448000500
+        assert record["_aws"]["CloudWatchMetrics"] == [
+            {
+                "Namespace": "FredExtractor",
+                "Dimensions": [["SeriesId", "Stage"]],
+                "Metrics": [{"Name": "Duration", "Unit": "Milliseconds"}, {"Name": "PayloadBytes", "Unit": "Bytes"}],
+            }
+        ]
+        assert record["SeriesId"] == "SP500"
+        assert record["Stage"] == "request_fred_data"
+        assert record["Duration"] == 12.5
+
+    def test_disabled_logger_writes_nothing(self):
+        stream = io.StringIO()
+        MetricsLogger(stream=stream, enabled=False).emit("SP500", "stage", {"Duration": 1})
+        assert stream.getvalue() == ""
+
+    def test_stage_records_duration_and_errors(self):
+        stream = io.StringIO()
+        metrics = MetricsLogger(stream=stream)
+
+        with pytest.raises(RuntimeError):
+            with metrics.stage("SP500", "store_fred_data_in_s3") as stage:
+                stage["ObjectsWritten"] = 0
+                raise RuntimeError("boom")
+
+        [record] = _records(stream)
+        assert record["Errors"] == 1
+        assert record["Duration"] >= 0
+
+    def test_stage_writes_to_stdout_by_default(self, capsys):
+        with MetricsLogger().stage("SP500", "retrieve_api_key"):
+            pass
+        assert json.loads(capsys.readouterr().out)["Stage"] == "retrieve_api_key"
+
+
+class TestFredExtractorMetrics:
+    def test_execute_emits_a_record_per_stage(self, event_fixture, api_response_fixture, s3_client_mock):
+        stream = io.StringIO()
+        fred = FredExtractor(
+            event_fixture,
+            None,
+            None,
+            "bucket",
+            api_key="key",
+            s3_client=s3_client_mock,
+            metrics=MetricsLogger(stream=stream),
+        )
+
+        with patch("requests.Session.get") as mock_get:
+            mock_get.return_value = Mock(status_code=200, headers={})
+            mock_get.return_value.json.return_value = api_response_fixture
+            fred.execute()
+
+        records = {record["Stage"]: record for record in _records(stream)}
+        assert set(records) == {"request_fred_data", "store_fred_data_in_s3"}
+        assert records["request_fred_data"]["Observations"] == 1
+        assert records["request_fred_data"]["Retries"] == 0
+        assert records["store_fred_data_in_s3"]["PayloadBytes"] > 0
+        assert records["store_fred_data_in_s3"]["ObjectsWritten"] == 1
+        assert all(record["SeriesId"] == "SP500" for record in records.values())
+
+    def test_request_stage_counts_retries(self, event_fixture, api_response_fixture):
+        stream = io.StringIO()
+        fred = FredExtractor(event_fixture, None, None, "bucket", metrics=MetricsLogger(stream=stream))
+        fred.fred_client._sleep = lambda seconds: None
+        throttled = Mock(status_code=429, headers={"Retry-After": "0"})
+        ok = Mock(status_code=200, headers={})
+        ok.json.return_value = api_response_fixture
+
+        with patch("requests.Session.get", side_effect=[throttled, ok]):
+            fred.request_fred_data("key")
+
+        [record] = _records(stream)
+        assert record["Retries"] == 1
@@ -0,0 +1,122 @@
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from botocore.exceptions import ClientError
+
+from src.fred_extractor.fred_client import FredClient
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.multi_series_extractor import MultiSeriesExtractor, SeriesExtractionError
+
+
+def _mock_session():
+    session = Mock()
+    s3_client = Mock()
+    s3_client.put_object.return_value = {"ResponseMetadata": {"HTTPStatusCode": 200}}
+    s3_client.get_object.side_effect = ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+    secrets_client = Mock()
+    secrets_client.get_secret_value.return_value = {"SecretString": '{"fred-api-key": "key"}'}
+    session.client.side_effect = lambda *args, **kwargs: (
+        secrets_client if kwargs.get("service_name") == "secretsmanager" else s3_client
+    )
+    return session, s3_client
+
+
+def _observations_response(api_response_fixture):
+    response = Mock()
+    response.json.return_value = api_response_fixture
+    return response
+
+
+class TestMultiSeriesExtractor:
+
+    def test_init_raises_value_error_for_empty_series_list(self, event_fixture):
+        with pytest.raises(ValueError, match="At least one series ID is required"):
+            MultiSeriesExtractor(event_fixture, None, None, "bucket", series_ids=[" ", ""])
+
+    def test_init_deduplicates_series_ids_preserving_order(self, event_fixture):
+        fred = MultiSeriesExtractor(event_fixture, None, None, "bucket", series_ids=["DGS10", "SP500", "DGS10"])
+        assert fred.series_ids == ["DGS10", "SP500"]
+
+    def test_execute_returns_result_per_series(self, event_fixture, api_response_fixture):
+        session, s3_client = _mock_session()
+        fred = MultiSeriesExtractor(event_fixture, None, session, "bucket", series_ids=["SP500", "DGS10", "T10Y2Y"])
+
+        with patch("requests.Session.get", return_value=_observations_response(api_response_fixture)):
+            result = fred.execute()
+
+        assert list(result) == ["SP500", "DGS10", "T10Y2Y"]
+        assert all(r == {"HTTPStatusCode": 200} for r in result.values())
+        # One secret lookup and one S3 client shared by every series
+        assert session.client.call_count == 2
+        keys = sorted(c.kwargs["Key"] for c in s3_client.put_object.call_args_list if c.kwargs["Key"].startswith("fred/"))
+        assert keys == [
+            "fred/DGS10/year=2022/month=07/DGS10-2022-07-21.json",
+            "fred/SP500/year=2022/month=07/SP500-2022-07-21.json",
+            "fred/T10Y2Y/year=2022/month=07/T10Y2Y-2022-07-21.json",
+        ]
+
+    def test_execute_records_failures_without_stopping_other_series(self, event_fixture, api_response_fixture):
+        session, _ = _mock_session()
+        fred = MultiSeriesExtractor(event_fixture, None, session, "bucket", series_ids=["SP500", "BAD"])
+
+        def fake_get(url, params, timeout):
+            if params["series_id"] == "BAD":
+                raise ValueError("boom")
+            return _observations_response(api_response_fixture)
+
+        with patch.object(FredExtractor, "retrieve_api_key", return_value="key"), \
+                patch("requests.Session.get", side_effect=fake_get):
+            result = fred.execute()
+
+        assert result["SP500"] == {"HTTPStatusCode": 200}
+        assert result["BAD"] == {"HTTPStatusCode": 500, "Error": "boom"}
+
+    def test_execute_raises_after_every_series_ran_when_failing_on_error(self, event_fixture, api_response_fixture):
+        session, s3_client = _mock_session()
+        fred = MultiSeriesExtractor(
+            event_fixture, None, session, "bucket", series_ids=["SP500", "BAD"], fail_on_error=True
+        )
+
+        def fake_get(url, params, timeout):
+            if params["series_id"] == "BAD":
+                raise ValueError("boom")
+            return _observations_response(api_response_fixture)
+
+        with patch.object(FredExtractor, "retrieve_api_key", return_value="key"), \
+                patch("requests.Session.get", side_effect=fake_get), \
+                pytest.raises(SeriesExtractionError, match="1/2 series: BAD") as error:
+            fred.execute()
+
+        assert error.value.failed == ["BAD"]
+        assert error.value.results["SP500"] == {"HTTPStatusCode": 200}
+        assert any(c.kwargs["Key"].startswith("fred/SP500/") for c in s3_client.put_object.call_args_list)
+
+    def test_execute_bounds_concurrency_by_max_workers(self, event_fixture, api_response_fixture):
+        session, _ = _mock_session()
+        series_ids = [f"S{i}" for i in range(12)]
+        fred = MultiSeriesExtractor(event_fixture, None, session, "bucket", series_ids=series_ids, max_workers=4,
+                                    fred_client=FredClient(requests_per_minute=60000, burst=100))
+
+        lock = threading.Lock()
+        in_flight = {"current": 0, "peak": 0}
+
+        def slow_get(url, params, timeout):
+            with lock:
+                in_flight["current"] += 1
+                in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+            time.sleep(0.05)
+            with lock:
+                in_flight["current"] -= 1
+            return _observations_response(api_response_fixture)
+
+        with patch.object(FredExtractor, "retrieve_api_key", return_value="key"), \
+                patch("requests.Session.get", side_effect=slow_get):
+            started = time.perf_counter()
+            fred.execute()
+            elapsed = time.perf_counter() - started
+
+        assert in_flight["peak"] == 4
+        # 12 series in batches of 4 should take ~3 round trips, not 12
+        assert elapsed < 12 * 0.05
@@ -0,0 +1,133 @@
+import gzip
+import json
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from src.fred_extractor.compaction import MonthlyCompactor
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.reader import FredReader
+from src.fred_extractor.serializers import ParquetSerializer
+from tests.src.conftest import BUCKET
+
+
+def _backfill(s3_client, observations, **kwargs):
+    fred = FredExtractor(
+        {"time": "2022-08-01T00:00:00Z"}, None, None, BUCKET, api_key="key", s3_client=s3_client, **kwargs
+    )
+    fred.request_fred_data_range = Mock(return_value={"observations": observations})
+    fred.backfill("2022-07-01", "2022-07-31")
+
+
+@pytest.fixture
+def july_observations():
+    return [{"date": f"2022-07-{day:02d}", "value": str(day)} for day in (18, 19, 20, 21, 22)] + [
+        {"date": "2022-07-25", "value": "."}
+    ]
+
+
+class TestFredReader:
+    def test_keys_for_range_uses_manifest(self, s3_client, july_observations):
+        _backfill(s3_client, july_observations)
+
+        keys = FredReader(s3_client, BUCKET).keys_for_range("SP500", "2022-07-19", "2022-07-21")
+
+        assert keys == [f"fred/SP500/year=2022/month=07/SP500-2022-07-{day}.json" for day in (19, 20, 21)]
+
+    def test_keys_for_range_falls_back_to_key_scheme_on_weekdays(self, s3_client):
+        keys = FredReader(s3_client, BUCKET).keys_for_range("SP500", "2022-07-22", "2022-07-25")
+
+        assert keys == [
+            "fred/SP500/year=2022/month=07/SP500-2022-07-22.json",
+            "fred/SP500/year=2022/month=07/SP500-2022-07-25.json",
+            "fred/SP500/year=2022/month=07/SP500-2022-07.json",
+        ]
+
+    def test_load_returns_date_indexed_numpy_arrays(self, s3_client, july_observations):
+        _backfill(s3_client, july_observations)
+
+        dates, values = FredReader(s3_client, BUCKET).load("SP500", "2022-07-19", "2022-07-31")
+
+        assert dates.dtype == np.dtype("datetime64[D]")
+        assert dates.tolist()[0].isoformat() == "2022-07-19"
+        np.testing.assert_array_equal(values, [19.0, 20.0, 21.0, 22.0, np.nan])
+
+    def test_load_frame_returns_dataframe(self, s3_client, july_observations):
+        _backfill(s3_client, july_observations)
+
+        frame = FredReader(s3_client, BUCKET).load_frame("SP500", "2022-07-18", "2022-07-20")
+
+        assert list(frame.columns) == ["SP500"]
+        assert frame.index.name == "date"
+        assert frame["SP500"].tolist() == [18.0, 19.0, 20.0]
+
+    def test_load_reads_compacted_objects_without_double_counting(self, s3_client, july_observations):
+        _backfill(s3_client, july_observations)
+        MonthlyCompactor(s3_client, BUCKET).compact("SP500", 2022, 7)
+
+        dates, _ = FredReader(s3_client, BUCKET).load("SP500", "2022-07-01", "2022-07-31")
+
+        assert len(dates) == len(july_observations)
+
+    def test_load_prefers_daily_revised_after_compaction(self, s3_client, july_observations):
+        _backfill(s3_client, july_observations)
+        MonthlyCompactor(s3_client, BUCKET, delete_daily=True).compact("SP500", 2022, 7)
+
+        revised = [{**o, "value": "99"} if o["date"] == "2022-07-20" else o for o in july_observations]
+        _backfill(s3_client, revised)
+        _, values = FredReader(s3_client, BUCKET).load("SP500", "2022-07-19", "2022-07-21")
+
+        assert values.tolist() == [19.0, 99.0, 21.0]
+
+    def test_load_without_manifest_skips_missing_objects(self, s3_client):
+        payload = {"observations": [{"date": "2022-07-21", "value": "3998.95"}]}
+        s3_client.put_object(
+            Bucket=BUCKET, Key="fred/SP500/year=2022/month=07/SP500-2022-07-21.json", Body=json.dumps(payload)
+        )
+
+        dates, values = FredReader(s3_client, BUCKET).load("SP500", "2022-07-18", "2022-07-22")
+
+        assert values.tolist() == [3998.95]
+
+    def test_load_reads_objects_written_before_the_manifest(self, s3_client):
+        for day in (18, 19, 20, 21):
+            payload = {"observations": [{"date": f"2022-07-{day}", "value": str(day)}]}
+            s3_client.put_object(
+                Bucket=BUCKET, Key=f"fred/SP500/year=2022/month=07/SP500-2022-07-{day}.json", Body=json.dumps(payload)
+            )
+        # The first write after the upgrade creates a manifest holding only its own date
+        fred = FredExtractor({"time": "2022-07-23T00:00:00Z"}, None, None, BUCKET, s3_client=s3_client)
+        fred.store_fred_data_in_s3({"observations": [{"date": "2022-07-22", "value": "22"}]})
+
+        _, values = FredReader(s3_client, BUCKET).load("SP500", "2022-07-18", "2022-07-22")
+
+        assert values.tolist() == [18.0, 19.0, 20.0, 21.0, 22.0]
+
+    def test_fetch_uses_etag_cache_for_unchanged_objects(self, s3_client, tmp_path, july_observations):
+        _backfill(s3_client, july_observations)
+        counting_client = Mock(wraps=s3_client)
+        reader = FredReader(counting_client, BUCKET, cache_dir=str(tmp_path))
+        key = "fred/SP500/year=2022/month=07/SP500-2022-07-21.json"
+
+        first = reader.fetch(key)
+        second = reader.fetch(key)
+
+        assert first == second
+        assert "IfNoneMatch" in counting_client.get_object.call_args.kwargs
+
+    @pytest.mark.parametrize("output_format,compression", [("ndjson", "gzip"), ("parquet", None)])
+    def test_load_decodes_other_output_formats(self, s3_client, july_observations, output_format, compression):
+        _backfill(s3_client, july_observations, output_format=output_format, compression=compression)
+
+        dates, values = FredReader(s3_client, BUCKET).load("SP500", "2022-07-20", "2022-07-21")
+
+        assert values.tolist() == [20.0, 21.0]
+
+    def test_decode_handles_gzip_json(self):
+        body = gzip.compress(json.dumps({"observations": [{"date": "2022-07-21", "value": "1"}]}).encode())
+        assert FredReader.decode("x.json.gz", body) == [{"date": "2022-07-21", "value": "1"}]
+
+    def test_decode_parquet_maps_null_to_missing_marker(self):
+        body = ParquetSerializer().serialize({"observations": [{"date": "2022-07-21", "value": "."}]})
+        assert FredReader.decode("x.parquet", body) == [{"date": "2022-07-21", "value": "."}]
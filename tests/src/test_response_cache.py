@@ -0,0 +1,156 @@
+import os
+from unittest.mock import Mock, patch
+
+import pendulum
+import pytest
+
+from src.fred_extractor.fred_client import FredClient
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.response_cache import DiskCacheBackend, ResponseCache, S3CacheBackend, cache_key
+from tests.src.conftest import BUCKET
+
+URL = FredExtractor.API_URL
+PARAMS = {"series_id": "SP500", "observation_start": "2022-07-21", "limit": 10, "api_key": "secret"}
+
+
+def _response(status_code=200, body=None, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = body
+    response.headers = headers or {}
+    return response
+
+
+class TestCacheKey:
+    def test_cache_key_ignores_api_key(self):
+        assert cache_key(URL, PARAMS) == cache_key(URL, {**PARAMS, "api_key": "rotated"})
+
+    def test_cache_key_normalizes_parameter_order_and_types(self):
+        reordered = dict(reversed(list({**PARAMS, "limit": "10"}.items())))
+        assert cache_key(URL, PARAMS) == cache_key(URL, reordered)
+
+    def test_cache_key_differs_per_window(self):
+        assert cache_key(URL, PARAMS) != cache_key(URL, {**PARAMS, "observation_start": "2022-07-22"})
+
+
+class TestDiskCacheBackend:
+    def test_put_and_get_round_trip(self, tmp_path):
+        backend = DiskCacheBackend(str(tmp_path))
+        backend.put("k", b"body")
+
+        assert backend.get("k") == b"body"
+        assert backend.get("missing") is None
+
+    def test_evicts_least_recently_used_entries_over_budget(self, tmp_path):
+        backend = DiskCacheBackend(str(tmp_path), max_bytes=None)
+        for age, key in enumerate(["old", "mid", "new"]):
+            backend.put(key, b"x" * 100)
+            os.utime(tmp_path / f"{key}.json", (age, age))
+
+        removed = backend.evict(max_bytes=200)
+
+        assert removed == 1
+        assert backend.get("old") is None
+        assert backend.get("new") == b"x" * 100
+
+
+class TestS3CacheBackend:
+    def test_put_get_and_evict(self, s3_client):
+        backend = S3CacheBackend(s3_client, BUCKET)
+
+        backend.put("first", b"x" * 100)
+        backend.put("second", b"y" * 100)
+
+        assert backend.get("first") == b"x" * 100
+        assert backend.get("missing") is None
+        assert backend.evict(max_bytes=100) == 1
+        assert len(s3_client.list_objects_v2(Bucket=BUCKET, Prefix="fred-cache/")["Contents"]) == 1
+
+
+class TestResponseCache:
+    def test_fresh_entry_is_a_hit(self, tmp_path, clock):
+        cache = ResponseCache(DiskCacheBackend(str(tmp_path)), ttl_seconds=60, clock=clock)
+        cache.store(URL, PARAMS, {"observations": []})
+
+        entry = cache.lookup(URL, {**PARAMS, "api_key": "other"})
+
+        assert entry["body"] == {"observations": []}
+        assert "secret" not in str(entry)
+        assert cache.is_fresh(entry)
+        assert cache.stats["hits"] == 1
+
+    def test_stale_entry_without_validators_is_dropped(self, tmp_path, clock):
+        cache = ResponseCache(DiskCacheBackend(str(tmp_path)), ttl_seconds=60, clock=clock)
+        cache.store(URL, PARAMS, {"observations": []})
+        clock.now += 61
+
+        assert cache.lookup(URL, PARAMS) is None
+        assert os.listdir(tmp_path) == []
+
+    def test_stale_entry_with_validators_is_kept_for_revalidation(self, tmp_path, clock):
+        cache = ResponseCache(DiskCacheBackend(str(tmp_path)), ttl_seconds=60, clock=clock)
+        cache.store(URL, PARAMS, {"observations": []}, {"ETag": '"abc"', "Last-Modified": "Thu, 21 Jul 2022"})
+        clock.now += 61
+
+        entry = cache.lookup(URL, PARAMS)
+
+        assert not cache.is_fresh(entry)
+        assert cache.revalidation_headers(entry) == {"If-None-Match": '"abc"', "If-Modified-Since": "Thu, 21 Jul 2022"}
+        assert cache.is_fresh(cache.renew(URL, PARAMS, entry))
+
+
+class TestFredExtractorResponseCache:
+    def _extractor(self, event_fixture, cache):
+        client = FredClient(requests_per_minute=60000, burst=1000)
+        return FredExtractor(event_fixture, None, None, "bucket", fred_client=client, response_cache=cache)
+
+    def test_rerun_of_range_request_is_served_from_cache(self, event_fixture, tmp_path):
+        cache = ResponseCache(DiskCacheBackend(str(tmp_path)))
+        body = {"count": 1, "observations": [{"date": "2022-07-21", "value": "3998.95"}]}
+        start, end = pendulum.parse("2022-07-01"), pendulum.parse("2022-07-31")
+
+        with patch("requests.Session.get", return_value=_response(body=body)) as mock_get:
+            first = self._extractor(event_fixture, cache).request_fred_data_range("key", start, end)
+            second = self._extractor(event_fixture, cache).request_fred_data_range("rotated", start, end)
+
+        assert first["observations"] == second["observations"]
+        assert mock_get.call_count == 1
+
+    def test_stale_entry_is_revalidated_and_304_served_from_cache(self, event_fixture, tmp_path, clock):
+        cache = ResponseCache(DiskCacheBackend(str(tmp_path)), ttl_seconds=60, clock=clock)
+        body = {"observations": [{"date": "2022-07-21", "value": "3998.95"}]}
+
+        with patch("requests.Session.get", return_value=_response(body=body, headers={"ETag": '"v1"'})):
+            self._extractor(event_fixture, cache).request_fred_data("key")
+        clock.now += 61
+
+        with patch("requests.Session.get", return_value=_response(status_code=304)) as mock_get:
+            result = self._extractor(event_fixture, cache).request_fred_data("key")
+
+        assert result == body
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+        assert cache.stats["revalidations"] == 1
+
+    def test_invalid_responses_are_not_cached(self, event_fixture, tmp_path):
+        cache = ResponseCache(DiskCacheBackend(str(tmp_path)))
+
+        with patch("requests.Session.get", return_value=_response(body={"error": "x"})):
+            with pytest.raises(ValueError):
+                self._extractor(event_fixture, cache).request_fred_data("key")
+
+        assert cache.stats["stores"] == 0
+
+    def test_empty_responses_are_refetched_on_the_next_call(self, event_fixture, tmp_path):
+        cache = ResponseCache(DiskCacheBackend(str(tmp_path)))
+        body = {"observations": [{"date": "2022-07-21", "value": "3998.95"}]}
+
+        with patch("requests.Session.get", side_effect=[
+            _response(body={"observations": []}), _response(body=body)
+        ]) as mock_get:
+            first = self._extractor(event_fixture, cache).request_fred_data("key")
+            second = self._extractor(event_fixture, cache).request_fred_data("key")
+
+        assert first["observations"] == []
+        assert second == body
+        assert mock_get.call_count == 2
+        assert cache.stats["stores"] == 1
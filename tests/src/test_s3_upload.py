@@ -0,0 +1,97 @@
+import json
+import subprocess
+import sys
+import textwrap
+import pytest
+from unittest.mock import Mock
+
+from src.fred_extractor.s3_upload import MIN_PART_SIZE, upload_stream
+from tests.src.conftest import BUCKET
+
+
+class TestUploadStream:
+
+    def test_upload_stream_raises_value_error_for_small_part_size(self):
+        with pytest.raises(ValueError, match="part_size must be at least"):
+            upload_stream(Mock(), BUCKET, "key", [b"data"], part_size=1024)
+
+    def test_upload_stream_uses_single_put_for_small_bodies(self, s3_client):
+        upload_stream(s3_client, BUCKET, "small.json", [b'{"a":', b"1}"], ContentType="application/json")
+
+        obj = s3_client.get_object(Bucket=BUCKET, Key="small.json")
+        assert obj["Body"].read() == b'{"a":1}'
+        assert obj["ContentType"] == "application/json"
+
+    def test_upload_stream_switches_to_multipart_for_large_bodies(self, s3_client):
+        chunk = b"x" * (1024 * 1024)
+        chunks = [chunk] * (2 * MIN_PART_SIZE // len(chunk) + 1)
+
+        upload_stream(s3_client, BUCKET, "large.bin", chunks, part_size=MIN_PART_SIZE)
+
+        obj = s3_client.get_object(Bucket=BUCKET, Key="large.bin")
+        assert obj["ContentLength"] == len(chunk) * len(chunks)
+        assert obj["ETag"].strip('"').endswith("-3")
+
+    def test_upload_stream_aborts_multipart_upload_on_failure(self, s3_client):
+        def failing_chunks():
+            yield b"x" * MIN_PART_SIZE
+            raise RuntimeError("serializer failed")
+
+        with pytest.raises(RuntimeError):
+            upload_stream(s3_client, BUCKET, "broken.bin", failing_chunks(), part_size=MIN_PART_SIZE)
+
+        assert s3_client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+
+    @pytest.mark.slow
+    def test_store_gzip_json_never_holds_the_serialized_body(self):
+        # Measured in a subprocess so its peak RSS only reflects this upload; moto keeps the
+        # compressed body (and botocore's copies of it) in memory, the uncompressed one must not be
+        script = textwrap.dedent(
+            """
+            import json, resource
+            import boto3
+            from moto import mock_aws
+            from src.fred_extractor.fred_extractor import FredExtractor
+
+            def extractor(time, s3_client):
+                return FredExtractor({"time": time}, None, None, "test-bucket", s3_client=s3_client, compression="gzip")
+
+            with mock_aws():
+                s3_client = boto3.client("s3", region_name="us-east-1")
+                s3_client.create_bucket(Bucket="test-bucket")
+                # A whole-history response as parsed from the FRED API
+                api_response = {
+                    "realtime_start": "2026-01-25", "realtime_end": "2026-01-25", "units": "lin",
+                    "count": 500_000, "offset": 0, "limit": 100_000,
+                    "observations": [
+                        {
+                            "realtime_start": "2026-01-25",
+                            "realtime_end": "2026-01-25",
+                            "date": f"{1900 + i // 366 % 126}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                            "value": f"{i % 7919}.{i % 97:02d}",
+                        }
+                        for i in range(500_000)
+                    ],
+                }
+                fred = extractor("2022-07-22T00:00:00Z", s3_client)
+                raw = sum(len(chunk) for chunk in fred.serializer.serializer.iter_chunks(api_response))
+                # Warm every code path on another date so only the large upload's growth is measured
+                extractor("2022-07-21T00:00:00Z", s3_client).store_fred_data_in_s3(
+                    {**api_response, "observations": api_response["observations"][:1000]}
+                )
+
+                baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                fred.store_fred_data_in_s3(api_response)
+                growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss
+
+                stored = s3_client.head_object(Bucket="test-bucket", Key=fred.generate_s3_object_key())["ContentLength"]
+                print(json.dumps({"raw": raw, "stored": stored, "rss_growth": growth * 1024}))
+            """
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+
+        assert stats["raw"] > 64 * 1024 * 1024
+        assert 0 < stats["stored"] < stats["raw"] // 10
+        # Serializing the ~70 MB body in one piece would grow RSS by at least its size
+        assert stats["rss_growth"] < stats["raw"] // 2
@@ -0,0 +1,105 @@
+import datetime
+import gzip
+import io
+import json
+import pytest
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.serializers import CHUNK_SIZE, JsonSerializer, ParquetSerializer, get_serializer
+
+
+@pytest.fixture
+def multi_day_response():
+    return {
+        "observations": [
+            {"realtime_start": "2026-01-25", "realtime_end": "2026-01-25", "date": "2022-07-20", "value": "3959.90"},
+            {"realtime_start": "2026-01-25", "realtime_end": "2026-01-25", "date": "2022-07-21", "value": "."},
+        ]
+    }
+
+
+class TestSerializers:
+
+    def test_get_serializer_raises_value_error_for_unknown_format(self):
+        with pytest.raises(ValueError, match="Unsupported output format 'xml'"):
+            get_serializer("xml")
+
+    def test_json_serializer_round_trips_api_response(self, api_response_fixture):
+        body = JsonSerializer().serialize(api_response_fixture)
+        assert json.loads(body) == api_response_fixture
+
+    def test_json_serializer_matches_indented_json_dumps(self, api_response_fixture):
+        body = JsonSerializer().serialize(api_response_fixture)
+        assert body == json.dumps(api_response_fixture, indent=2, ensure_ascii=False).encode("utf-8")
+
+    def test_json_serializer_streams_bounded_chunks(self):
+        observations = [{"date": "2022-07-21", "value": str(i)} for i in range(20000)]
+        chunks = list(JsonSerializer().iter_chunks({"observations": observations}))
+
+        assert len(chunks) > 1
+        assert max(len(chunk) for chunk in chunks) < 2 * CHUNK_SIZE
+
+    def test_compact_json_serializer_has_no_whitespace(self, api_response_fixture):
+        body = get_serializer("json-compact").serialize(api_response_fixture)
+        assert body == json.dumps(api_response_fixture, separators=(",", ":")).encode("utf-8")
+
+    def test_ndjson_serializer_writes_one_observation_per_line(self, multi_day_response):
+        serializer = get_serializer("ndjson")
+        lines = serializer.serialize(multi_day_response).decode("utf-8").splitlines()
+
+        assert [json.loads(line) for line in lines] == multi_day_response["observations"]
+        assert serializer.CONTENT_TYPE == "application/x-ndjson"
+
+    def test_gzip_compression_sets_encoding_and_extension(self, api_response_fixture):
+        serializer = get_serializer("json-compact", "gzip")
+
+        assert serializer.EXTENSION == "json.gz"
+        assert serializer.CONTENT_ENCODING == "gzip"
+        assert serializer.CONTENT_TYPE == "application/json"
+        assert json.loads(gzip.decompress(serializer.serialize(api_response_fixture))) == api_response_fixture
+
+    def test_zstd_compression_round_trips(self, multi_day_response):
+        zstandard = pytest.importorskip("zstandard")
+        serializer = get_serializer("ndjson", "zstd")
+
+        body = zstandard.ZstdDecompressor().decompressobj().decompress(serializer.serialize(multi_day_response))
+
+        assert serializer.EXTENSION == "ndjson.zst"
+        assert serializer.CONTENT_ENCODING == "zstd"
+        assert len(body.splitlines()) == 2
+
+    def test_get_serializer_rejects_compressed_parquet(self):
+        with pytest.raises(ValueError, match="Parquet output is compressed internally"):
+            get_serializer("parquet", "gzip")
+
+    def test_get_serializer_raises_value_error_for_unknown_compression(self):
+        with pytest.raises(ValueError, match="Unsupported compression 'lz4'"):
+            get_serializer("json", "lz4")
+
+    def test_parquet_serializer_writes_typed_columns(self, multi_day_response):
+        table = pq.read_table(io.BytesIO(ParquetSerializer().serialize(multi_day_response)))
+
+        assert table.schema.field("date").type == pa.date32()
+        assert table.schema.field("value").type == pa.float64()
+        assert table.schema.field("realtime_start").type == pa.date32()
+        assert table.schema.field("realtime_end").type == pa.date32()
+        assert table.column("date").to_pylist() == [datetime.date(2022, 7, 20), datetime.date(2022, 7, 21)]
+
+    def test_parquet_serializer_maps_missing_marker_to_null(self, multi_day_response):
+        table = pq.read_table(io.BytesIO(ParquetSerializer().serialize(multi_day_response)))
+        assert table.column("value").to_pylist() == [3959.90, None]
+
+    def test_parquet_output_uses_same_partition_layout(self, event_fixture, api_response_fixture, s3_client_mock):
+        s3_client = s3_client_mock
+        fred = FredExtractor(event_fixture, None, None, "bucket", s3_client=s3_client, output_format="parquet")
+
+        result = fred.store_fred_data_in_s3(api_response_fixture)
+
+        assert result == {"HTTPStatusCode": 200}
+        kwargs = s3_client.put_object.call_args_list[0].kwargs
+        assert kwargs["Key"] == "fred/SP500/year=2022/month=07/SP500-2022-07-21.parquet"
+        assert kwargs["ContentType"] == ParquetSerializer.CONTENT_TYPE
+        assert pq.read_table(io.BytesIO(kwargs["Body"])).num_rows == 1
@@ -0,0 +1,148 @@
+import datetime
+import json
+import tracemalloc
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.fred_extractor.fred_client import FredClient
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.streaming import ObservationStream, validate_observations
+
+
+def _observation(day: int, value: str = "3998.95") -> dict:
+    return {"realtime_start": "2022-07-21", "realtime_end": "2022-07-21", "date": f"2022-07-{day:02d}", "value": value}
+
+
+def _body(observations, **metadata) -> bytes:
+    return json.dumps({"units": "lin", "count": len(observations), **metadata, "observations": observations}).encode()
+
+
+def _split(body: bytes, size: int) -> list:
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+def _generated_body(count: int):
+    # Yields the body piece by piece so the test itself never holds it whole
+    yield b'{"units":"lin","count":%d,"observations":[' % count
+    for i in range(count):
+        prefix = b"," if i else b""
+        yield prefix + json.dumps({"date": f"2022-01-{i % 28 + 1:02d}", "value": f"{i}.5", "i": i}).encode()
+    yield b"]}"
+
+
+class TestObservationStream:
+    @pytest.mark.parametrize("read_size", [1, 3, 7, 64 * 1024])
+    def test_parses_regardless_of_chunk_boundaries(self, read_size):
+        observations = [_observation(21), _observation(22, "."), {"date": "2022-07-25", "value": "-1.5e3", "note": "é"}]
+        stream = ObservationStream(_split(_body(observations, limit=100000), read_size))
+
+        assert list(stream) == observations
+        assert stream.metadata == {"units": "lin", "count": 3, "limit": 100000}
+
+    def test_collects_fields_after_observations(self):
+        body = b'{"observations": [{"date": "2022-07-21", "value": "1"}], "count": 12345}'
+        stream = ObservationStream(_split(body, 5))
+
+        assert len(list(stream)) == 1
+        assert stream.metadata == {"count": 12345}
+
+    def test_chunks_have_at_most_chunk_size_observations(self):
+        observations = [_observation(day) for day in range(1, 11)]
+        chunks = list(ObservationStream([_body(observations)]).chunks(4))
+
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+        assert [o for chunk in chunks for o in chunk] == observations
+
+    def test_empty_observations(self):
+        stream = ObservationStream([b'{"count": 0, "observations": []}'])
+
+        assert list(stream.chunks(10)) == []
+        assert stream.has_observations
+
+    @pytest.mark.parametrize("body", [b"<html>", b'{"observations": [{"date": "2022-07-21"', b'{"observations": []} x'])
+    def test_invalid_json_raises_value_error(self, body):
+        with pytest.raises(ValueError, match="Invalid JSON"):
+            list(ObservationStream(_split(body, 4)))
+
+    def test_validate_observations_reports_position(self):
+        with pytest.raises(ValueError, match="observation 11"):
+            validate_observations([_observation(21), {"value": "1"}], first_index=10)
+
+    def test_peak_memory_scales_with_chunk_size_not_body_size(self):
+        count = 20000
+
+        tracemalloc.start()
+        for _ in ObservationStream(_generated_body(count)).chunks(500):
+            pass
+        streaming_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        json.loads(b"".join(_generated_body(count)))
+        full_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        assert streaming_peak * 10 < full_peak
+
+
+class TestFredExtractorStreaming:
+    def _response(self, body: bytes):
+        response = Mock(status_code=200, headers={})
+        response.iter_content.side_effect = lambda size: iter(_split(body, 16))
+        return response
+
+    def test_backfill_streams_chunks_without_splitting_dates(self, event_fixture, s3_client_mock):
+        # Two observations (vintages) per date, chunked so a date straddles chunk boundaries
+        observations = [_observation(day, str(v)) for day in (18, 19, 20, 21) for v in (1, 2)]
+        fred = FredExtractor(
+            event_fixture,
+            None,
+            None,
+            "bucket",
+            api_key="key",
+            s3_client=s3_client_mock,
+            stream_chunk_size=3,
+            fred_client=FredClient(requests_per_minute=60000, burst=100),
+        )
+
+        with patch("requests.Session.get", return_value=self._response(_body(observations))) as mock_get:
+            result = fred.backfill("2022-07-18", "2022-07-21")
+
+        assert mock_get.call_args.kwargs["stream"] is True
+        assert result["ObjectsWritten"] == 4
+        assert result["LastObservationDate"] == "2022-07-21"
+        bodies = {
+            c.kwargs["Key"]: json.loads(c.kwargs["Body"])
+            for c in s3_client_mock.put_object.call_args_list
+            if c.kwargs["Key"].startswith("fred/")
+        }
+        assert all(len(body["observations"]) == 2 for body in bodies.values())
+        assert all(body["units"] == "lin" for body in bodies.values())
+
+    def test_streamed_range_pages_with_offset(self, event_fixture):
+        pages = [
+            _body([_observation(18), _observation(19)], count=3),
+            _body([_observation(20)], count=3, offset=2),
+        ]
+        fred = FredExtractor(event_fixture, None, None, "bucket", stream_chunk_size=10)
+
+        with patch("requests.Session.get", side_effect=[self._response(body) for body in pages]) as mock_get:
+            chunks = list(fred.iter_fred_data_range("key", datetime.date(2022, 7, 18), datetime.date(2022, 7, 20)))
+
+        assert [o["date"] for chunk in chunks for o in chunk] == ["2022-07-18", "2022-07-19", "2022-07-20"]
+        assert [c.kwargs["params"]["offset"] for c in mock_get.call_args_list] == [0, 2]
+
+    def test_streaming_request_fred_data_validates_chunks(self, event_fixture):
+        fred = FredExtractor(event_fixture, None, None, "bucket", stream_chunk_size=10)
+
+        with patch("requests.Session.get", return_value=self._response(b'{"observations": [{"value": "1"}]}')):
+            with pytest.raises(ValueError, match="observation 0"):
+                fred.request_fred_data("key")
+
+    def test_streaming_response_without_observations_is_rejected(self, event_fixture):
+        fred = FredExtractor(event_fixture, None, None, "bucket", stream_chunk_size=10)
+
+        with patch("requests.Session.get", return_value=self._response(b'{"error_message": "x"}')):
+            with pytest.raises(ValueError, match="missing 'observations'"):
+                fred.request_fred_data("key")
@@ -0,0 +1,162 @@
+import datetime
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.vintages import (
+    LATEST_REALTIME,
+    VINTAGE_PREFIX,
+    VintageStore,
+    revision_deltas,
+    vintage_index_key,
+)
+from tests.src.conftest import BUCKET
+
+
+def _row(date, value, start, end=LATEST_REALTIME):
+    return {"date": date, "value": value, "realtime_start": start, "realtime_end": end}
+
+
+def _revised_series(vintage_count=120):
+    """
+    ALFRED rows of a quarterly series published weekly: each vintage revises the latest four quarters
+    and every fourth vintage adds a quarter.
+    """
+    vintages = [(datetime.date(2000, 1, 5) + datetime.timedelta(weeks=k)).isoformat() for k in range(vintage_count)]
+    history = {}
+    for k, vintage in enumerate(vintages):
+        quarters = 40 + k // 4
+        for q in range(quarters):
+            date = f"{1990 + q // 4}-{3 * (q % 4) + 1:02d}-01"
+            value = f"{1000 + q}.{k if q >= quarters - 4 else 0}"
+            changes = history.setdefault(date, [])
+            if not changes or changes[-1][1] != value:
+                changes.append((vintage, value))
+    rows = []
+    for date, changes in history.items():
+        for i, (start, value) in enumerate(changes):
+            end = _day_before(changes[i + 1][0]) if i + 1 < len(changes) else LATEST_REALTIME
+            rows.append(_row(date, value, start, end))
+    return vintages, rows
+
+
+def _day_before(value):
+    return (datetime.date.fromisoformat(value) - datetime.timedelta(days=1)).isoformat()
+
+
+def _as_of(rows, realtime):
+    """Brute-force reconstruction straight from the real-time periods."""
+    return {r["date"]: r["value"] for r in rows if r["realtime_start"] <= realtime <= r["realtime_end"]}
+
+
+def _stored_bytes(s3_client, prefix):
+    return sum(o["Size"] for o in s3_client.list_objects_v2(Bucket=BUCKET, Prefix=prefix).get("Contents", []))
+
+
+class TestRevisionDeltas:
+    def test_emits_first_release_and_each_revision(self):
+        rows = [
+            _row("2020-01-01", "100.0", "2020-04-29", "2020-05-27"),
+            _row("2020-01-01", "101.5", "2020-05-28", "2020-06-24"),
+            _row("2020-01-01", "101.2", "2020-06-25"),
+        ]
+
+        deltas = revision_deltas(rows)
+
+        assert [(d["old_value"], d["new_value"], d["realtime_start"]) for d in deltas] == [
+            (None, "100.0", "2020-04-29"),
+            ("100.0", "101.5", "2020-05-28"),
+            ("101.5", "101.2", "2020-06-25"),
+        ]
+        assert deltas[1]["realtime_end"] == "2020-06-24"
+
+    def test_withdrawn_values_become_null_deltas(self):
+        rows = [_row("2020-01-01", "1", "2020-02-01", "2020-02-10"), _row("2020-01-01", "2", "2020-03-01")]
+
+        deltas = revision_deltas(rows)
+
+        assert [(d["new_value"], d["realtime_start"], d["realtime_end"]) for d in deltas] == [
+            ("1", "2020-02-01", "2020-02-10"),
+            (None, "2020-02-11", "2020-02-29"),
+            ("2", "2020-03-01", LATEST_REALTIME),
+        ]
+
+    def test_after_skips_known_periods_and_unchanged_values(self):
+        rows = [_row("2020-01-01", "1", "2020-01-15", "2020-02-01"), _row("2020-01-01", "2", "2020-02-02")]
+
+        assert revision_deltas(rows, state={"2020-01-01": "2"}, after="2020-02-05") == []
+        [delta] = revision_deltas(rows, state={"2020-01-01": "1"}, after="2020-01-20")
+        assert (delta["old_value"], delta["new_value"]) == ("1", "2")
+
+
+class TestVintageStore:
+    def test_as_of_matches_every_vintage(self, s3_client):
+        vintages, rows = _revised_series()
+        store = VintageStore(s3_client, BUCKET, checkpoint_interval=10)
+
+        summary = store.update("GDP", rows)
+
+        assert summary == {"Vintages": 120, "Deltas": summary["Deltas"], "Checkpoints": 11, "LastVintage": vintages[-1]}
+        for realtime in vintages[::7] + [vintages[-1], "2099-01-01"]:
+            response = store.as_of("GDP", realtime)
+            assert {o["date"]: o["value"] for o in response["observations"]} == _as_of(rows, realtime)
+        assert store.as_of("GDP", "1999-12-31")["observations"] == []
+
+    def test_deltas_take_far_less_space_than_snapshots(self, s3_client):
+        vintages, rows = _revised_series()
+        VintageStore(s3_client, BUCKET, checkpoint_interval=50).update("GDP", rows)
+
+        snapshots = sum(
+            len(json.dumps({"observations": [{"date": d, "value": v} for d, v in _as_of(rows, realtime).items()]}))
+            for realtime in vintages
+        )
+
+        assert _stored_bytes(s3_client, f"{VINTAGE_PREFIX}/GDP/") * 20 < snapshots
+
+    def test_incremental_update_appends_new_vintages(self, s3_client):
+        vintages, rows = _revised_series(60)
+        cut = vintages[29]
+        # What ALFRED returns for realtime_end=cut, then for realtime_start=cut + 1 day
+        known = [{**r, "realtime_end": min(r["realtime_end"], cut)} for r in rows if r["realtime_start"] <= cut]
+        known = [
+            {**r, "realtime_end": LATEST_REALTIME if r["realtime_end"] == cut else r["realtime_end"]} for r in known
+        ]
+        later = [r for r in rows if r["realtime_end"] > cut]
+        store = VintageStore(s3_client, BUCKET, checkpoint_interval=8)
+
+        store.update("GDP", known)
+        summary = store.update("GDP", later)
+
+        assert summary["Vintages"] == 30
+        assert store.load_index("GDP")["last_vintage"] == vintages[-1]
+        for realtime in (vintages[10], cut, vintages[30], vintages[45], vintages[-1]):
+            assert {o["date"]: o["value"] for o in store.as_of("GDP", realtime)["observations"]} == _as_of(
+                rows, realtime
+            )
+        assert store.update("GDP", later)["Vintages"] == 0
+
+    def test_init_rejects_non_positive_interval(self):
+        with pytest.raises(ValueError, match="checkpoint_interval"):
+            VintageStore(Mock(), BUCKET, checkpoint_interval=0)
+
+
+class TestExecuteVintages:
+    def test_requests_only_vintages_after_the_last_stored_one(self, event_fixture, s3_client):
+        _, rows = _revised_series(8)
+        fred = FredExtractor(event_fixture, None, None, BUCKET, series_id="GDP", api_key="key", s3_client=s3_client)
+
+        with patch("requests.Session.get") as get:
+            get.return_value.json.return_value = {"count": len(rows), "observations": rows}
+            first = fred.execute_vintages()
+            get.return_value.json.return_value = {"count": 0, "observations": []}
+            second = fred.execute_vintages()
+
+        first_params, second_params = (c.kwargs["params"] for c in get.call_args_list)
+        assert (first_params["realtime_start"], first_params["realtime_end"]) == ("1776-07-04", LATEST_REALTIME)
+        assert "frequency" not in first_params
+        assert second_params["realtime_start"] == "2000-02-24"
+        assert (first["HTTPStatusCode"], first["Vintages"]) == (200, 8)
+        assert (second["HTTPStatusCode"], second["Vintages"]) == (204, 0)
+        assert vintage_index_key("GDP") in [o["Key"] for o in s3_client.list_objects_v2(Bucket=BUCKET)["Contents"]]
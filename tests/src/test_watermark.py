@@ -0,0 +1,95 @@
+import json
+from unittest.mock import Mock, patch
+
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.watermark import load_watermark, save_watermark, watermark_key
+from tests.src.conftest import BUCKET
+
+
+def _response(payload):
+    response = Mock(status_code=200)
+    response.json.return_value = payload
+    return response
+
+
+def _metadata(last_updated, observation_end):
+    return _response({"seriess": [{"id": "SP500", "last_updated": last_updated, "observation_end": observation_end}]})
+
+
+class TestWatermark:
+
+    def test_watermark_key_is_outside_data_prefix(self):
+        assert watermark_key("SP500") == "fred-state/SP500/watermark.json"
+
+    def test_load_watermark_returns_none_when_missing(self, s3_client):
+        assert load_watermark(s3_client, BUCKET, "SP500") is None
+
+    def test_save_and_load_watermark_round_trip(self, s3_client):
+        save_watermark(s3_client, BUCKET, "SP500", "2022-07-20", "2022-07-20 19:11:03-05")
+
+        assert load_watermark(s3_client, BUCKET, "SP500") == {
+            "series_id": "SP500",
+            "last_observation_date": "2022-07-20",
+            "last_updated": "2022-07-20 19:11:03-05",
+        }
+
+
+class TestExecuteIncremental:
+
+    def test_skips_observations_request_when_series_unchanged(self, event_fixture, s3_client):
+        save_watermark(s3_client, BUCKET, "SP500", "2022-07-20", "2022-07-20 19:11:03-05")
+        fred = FredExtractor(event_fixture, None, None, BUCKET, api_key="key", s3_client=s3_client)
+
+        with patch('requests.Session.get', return_value=_metadata("2022-07-20 19:11:03-05", "2022-07-20")) as get:
+            result = fred.execute_incremental()
+
+        assert result["HTTPStatusCode"] == 204
+        assert result["ObjectsWritten"] == 0
+        get.assert_called_once()
+        assert get.call_args.kwargs["url"] == FredExtractor.SERIES_URL
+
+    def test_fetches_only_missing_range_and_advances_watermark(self, event_fixture, s3_client):
+        save_watermark(s3_client, BUCKET, "SP500", "2022-07-18", "2022-07-18 19:11:03-05")
+        fred = FredExtractor(event_fixture, None, None, BUCKET, api_key="key", s3_client=s3_client)
+        observations = {
+            "count": 3,
+            "observations": [{"date": d, "value": "1.0"} for d in ("2022-07-19", "2022-07-20", "2022-07-21")],
+        }
+
+        with patch('requests.Session.get', side_effect=[
+            _metadata("2022-07-21 19:11:03-05", "2022-07-21"), _response(observations)
+        ]) as get:
+            result = fred.execute_incremental()
+
+        params = get.call_args_list[1].kwargs["params"]
+        assert (params["observation_start"], params["observation_end"]) == ("2022-07-19", "2022-07-21")
+        assert result["ObjectsWritten"] == 3
+        assert load_watermark(s3_client, BUCKET, "SP500")["last_observation_date"] == "2022-07-21"
+        keys = [o["Key"] for o in s3_client.list_objects_v2(Bucket=BUCKET, Prefix="fred/")["Contents"]]
+        assert "fred/SP500/year=2022/month=07/SP500-2022-07-19.json" in keys
+
+    def test_without_watermark_fetches_observation_date_only(self, event_fixture, s3_client, api_response_fixture):
+        fred = FredExtractor(event_fixture, None, None, BUCKET, api_key="key", s3_client=s3_client)
+
+        with patch('requests.Session.get', side_effect=[
+            _metadata("2022-07-21 19:11:03-05", "2022-07-21"), _response(api_response_fixture)
+        ]) as get:
+            result = fred.execute_incremental()
+
+        params = get.call_args_list[1].kwargs["params"]
+        assert (params["observation_start"], params["observation_end"]) == ("2022-07-21", "2022-07-21")
+        assert result["Watermark"]["last_updated"] == "2022-07-21 19:11:03-05"
+        body = s3_client.get_object(Bucket=BUCKET, Key=watermark_key("SP500"))["Body"].read()
+        assert json.loads(body)["last_observation_date"] == "2022-07-21"
+
+    def test_metadata_without_observation_end_checks_up_to_observation_date(self, event_fixture, s3_client):
+        save_watermark(s3_client, BUCKET, "SP500", "2022-07-19", None)
+        fred = FredExtractor(event_fixture, None, None, BUCKET, api_key="key", s3_client=s3_client)
+
+        with patch('requests.Session.get', return_value=_response({"observations": []})) as get:
+            result = fred.execute_incremental({"id": "SP500", "last_updated": "2022-07-21 19:11:03-05"})
+
+        params = get.call_args.kwargs["params"]
+        assert (params["observation_start"], params["observation_end"]) == ("2022-07-20", "2022-07-21")
+        assert result["HTTPStatusCode"] == 204
+        assert result["Watermark"]["last_observation_date"] == "2022-07-19"
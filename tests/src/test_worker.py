@@ -0,0 +1,188 @@
+import json
+import time
+from unittest.mock import Mock, patch
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.fred_extractor.fred_client import FredClient
+from src.fred_extractor.fred_extractor import FredExtractor
+from src.fred_extractor.metrics import MetricsLogger
+from src.fred_extractor.worker import LocalQueue, SqsQueue, Worker
+from tests.src.conftest import BUCKET
+
+
+@pytest.fixture
+def session():
+    with mock_aws():
+        session = boto3.Session(region_name="us-east-1")
+        session.client("s3").create_bucket(Bucket=BUCKET)
+        session.client("secretsmanager").create_secret(
+            Name=FredExtractor.SECRET_NAME, SecretString=json.dumps({FredExtractor.SECRET_KEY: "key"})
+        )
+        yield session
+
+
+def _observations_response(params):
+    dates = ["2022-07-18", "2022-07-19", "2022-07-20"]
+    observations = [{"date": d, "value": "1.0"} for d in dates if params["observation_start"] <= d]
+    response = Mock(status_code=200)
+    response.json.return_value = {"count": len(observations), "observations": observations}
+    return response
+
+
+def _worker(queue, session, **kwargs):
+    return Worker(
+        queue,
+        session,
+        BUCKET,
+        max_workers=2,
+        wait_seconds=0,
+        fred_client=FredClient(requests_per_minute=60000, burst=100),
+        metrics=MetricsLogger(enabled=False),
+        **kwargs,
+    )
+
+
+class TestLocalQueue:
+    def test_received_message_reappears_after_visibility_timeout(self, clock):
+        queue = LocalQueue(clock=clock)
+        queue.send({"series_id": "SP500"})
+
+        [first] = queue.receive(10, visibility_timeout=30)
+        assert queue.receive(10, visibility_timeout=30) == []
+
+        clock.now += 31
+        [second] = queue.receive(10, visibility_timeout=30)
+        assert second.body == {"series_id": "SP500"}
+        # The first receipt is stale and deletes nothing
+        queue.delete(first)
+        assert len(queue) == 1
+        queue.delete(second)
+        assert len(queue) == 0
+
+    def test_change_visibility_extends_the_timeout(self, clock):
+        queue = LocalQueue(clock=clock)
+        queue.send({"series_id": "SP500"})
+        [message] = queue.receive(1, visibility_timeout=30)
+
+        clock.now += 20
+        queue.change_visibility(message, 30)
+        clock.now += 20
+
+        assert queue.receive(1, visibility_timeout=30) == []
+
+    def test_file_backed_queue_survives_restart(self, tmp_path):
+        path = str(tmp_path / "queue.json")
+        LocalQueue(path).send({"series_id": "SP500", "start": "2022-07-18"})
+
+        [message] = LocalQueue(path).receive(1, visibility_timeout=0)
+
+        assert message.body == {"series_id": "SP500", "start": "2022-07-18"}
+
+
+class TestWorker:
+    def test_run_drains_queue_with_shared_api_key(self, session):
+        queue = LocalQueue()
+        for series_id in ("SP500", "DGS10", "T10Y2Y"):
+            queue.send({"series_id": series_id, "start": "2022-07-18", "end": "2022-07-20"})
+        worker = _worker(queue, session)
+
+        with (
+            patch("requests.Session.get", side_effect=lambda **kw: _observations_response(kw["params"])),
+            patch.object(session, "client", wraps=session.client) as client,
+        ):
+            stats = worker.run(max_idle_receives=1)
+
+        assert (stats["succeeded"], stats["failed"], stats["objects_written"]) == (3, 0, 9)
+        assert stats["jobs_per_second"] > 0
+        assert len(queue) == 0
+        assert [c.kwargs["service_name"] for c in client.call_args_list].count("secretsmanager") == 1
+        keys = session.client("s3").list_objects_v2(Bucket=BUCKET, Prefix="fred/DGS10/")["Contents"]
+        assert len(keys) == 3
+
+    def test_failed_job_stays_queued_for_retry(self, session, clock):
+        queue = LocalQueue(clock=clock)
+        queue.send({"series_id": "SP500", "start": "2022-07-20", "end": "2022-07-18"})
+        worker = _worker(queue, session, visibility_timeout=60)
+
+        stats = worker.run(max_idle_receives=1)
+
+        assert (stats["succeeded"], stats["failed"]) == (0, 1)
+        assert len(queue) == 1
+        clock.now += 61
+        assert len(queue.receive(1, visibility_timeout=60)) == 1
+
+    def test_stop_finishes_jobs_in_flight_and_takes_no_more(self, session):
+        queue = LocalQueue()
+        for day in range(10):
+            queue.send({"series_id": f"S{day}", "start": "2022-07-20", "end": "2022-07-20"})
+        worker = _worker(queue, session)
+
+        def stop_on_first_request(**kwargs):
+            worker.stop()
+            return _observations_response(kwargs["params"])
+
+        with patch("requests.Session.get", side_effect=stop_on_first_request):
+            stats = worker.run()
+
+        assert stats["failed"] == 0
+        assert stats["succeeded"] == 10 - len(queue)
+        assert len(queue) >= 8
+
+    def test_shutdown_keeps_extending_visibility_of_jobs_in_flight(self, session):
+        queue = LocalQueue()
+        queue.send({"series_id": "SP500", "start": "2022-07-20", "end": "2022-07-20"})
+        worker = _worker(queue, session, visibility_timeout=1)
+        extensions_at_stop = []
+
+        def slow_job_after_stop(**kwargs):
+            worker.stop()
+            extensions_at_stop.append(change_visibility.call_count)
+            time.sleep(2.2)
+            return _observations_response(kwargs["params"])
+
+        with (
+            patch.object(queue, "change_visibility", wraps=queue.change_visibility) as change_visibility,
+            patch("requests.Session.get", side_effect=slow_job_after_stop),
+        ):
+            stats = worker.run()
+
+        assert stats["succeeded"] == 1
+        assert change_visibility.call_count - extensions_at_stop[0] >= 3
+        assert len(queue) == 0
+
+    def test_job_past_max_receives_is_dropped(self, session, clock):
+        queue = LocalQueue(clock=clock)
+        queue.send({"series_id": "SP500", "start": "2022-07-20", "end": "2022-07-18"})
+        worker = _worker(queue, session, visibility_timeout=60, max_receives=2)
+
+        for _ in range(3):
+            stats = worker.run(max_idle_receives=1)
+            clock.now += 61
+
+        assert (stats["failed"], stats["dropped"]) == (2, 1)
+        assert len(queue) == 0
+
+    def test_init_rejects_non_positive_workers(self, session):
+        with pytest.raises(ValueError, match="max_workers"):
+            Worker(LocalQueue(), session, BUCKET, max_workers=0)
+
+
+class TestSqsQueue:
+    def test_send_receive_delete_round_trip(self):
+        with mock_aws():
+            sqs = boto3.client("sqs", region_name="us-east-1")
+            queue = SqsQueue(sqs, sqs.create_queue(QueueName="fred-jobs")["QueueUrl"])
+            queue.send({"series_id": "SP500", "start": "2022-07-18"})
+
+            [first] = queue.receive(10, visibility_timeout=30, wait_seconds=0)
+            queue.change_visibility(first, 0)
+            [message] = queue.receive(10, visibility_timeout=30, wait_seconds=0)
+            queue.change_visibility(message, 60)
+            queue.delete(message)
+
+            assert message.body == {"series_id": "SP500", "start": "2022-07-18"}
+            assert (first.receive_count, message.receive_count) == (1, 2)
+            assert queue.receive(10, visibility_timeout=0, wait_seconds=0) == []
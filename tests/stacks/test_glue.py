@@ -0,0 +1,108 @@
+import io
+import json
+from unittest.mock import Mock
+
+import aws_cdk as core
+import aws_cdk.assertions as assertions
+import boto3
+import pyarrow.parquet as pq
+import pytest
+from aws_cdk import aws_s3 as s3
+from moto import mock_aws
+
+from src.fred_extractor.compaction import MonthlyCompactor
+from src.fred_extractor.fred_extractor import FredExtractor
+from stacks.glue.glue_construct import FredGlueConstruct
+
+
+def _table_input(**kwargs):
+    app = core.App()
+    stack = core.Stack(app, "glue-stack", env=core.Environment(account="123456789012", region="us-east-1"))
+    bucket = s3.Bucket.from_bucket_name(stack, "bucket", "fred-data")
+    FredGlueConstruct(stack, "glue").create_table(bucket, **kwargs)
+    template = assertions.Template.from_stack(stack)
+    [table] = template.find_resources("AWS::Glue::Table").values()
+    return template, table["Properties"]["TableInput"]
+
+
+@pytest.mark.slow
+class TestGlueTable:
+    def test_partition_projection_matches_key_scheme(self):
+        _, table_input = _table_input()
+        parameters = table_input["Parameters"]
+
+        assert [key["Name"] for key in table_input["PartitionKeys"]] == ["series_id", "year", "month"]
+        assert parameters["projection.enabled"] == "true"
+        assert parameters["projection.series_id.type"] == "injected"
+        assert (parameters["projection.year.type"], parameters["projection.year.digits"]) == ("integer", "4")
+        assert (parameters["projection.month.range"], parameters["projection.month.digits"]) == ("1,12", "2")
+        assert (
+            parameters["storage.location.template"] == "s3://fred-data/fred/${series_id}/year=${year}/month=${month}/"
+        )
+
+    def test_parquet_columns_and_serde(self):
+        template, table_input = _table_input()
+
+        template.has_resource_properties("AWS::Glue::Database", {"DatabaseInput": {"Name": "fred"}})
+        descriptor = table_input["StorageDescriptor"]
+        assert descriptor["Location"] == "s3://fred-data/fred/"
+        assert descriptor["SerdeInfo"]["SerializationLibrary"].endswith("ParquetHiveSerDe")
+        assert {c["Name"]: c["Type"] for c in descriptor["Columns"]}["value"] == "double"
+
+    def test_ndjson_uses_json_serde(self):
+        _, table_input = _table_input(data_format="ndjson")
+
+        assert table_input["Parameters"]["classification"] == "json"
+        assert table_input["StorageDescriptor"]["SerdeInfo"]["SerializationLibrary"] == (
+            "org.openx.data.jsonserde.JsonSerDe"
+        )
+
+    def test_rejects_whole_response_json(self):
+        stack = core.Stack(core.App(), "glue-stack")
+
+        with pytest.raises(ValueError, match="format"):
+            FredGlueConstruct(stack, "glue").create_table(s3.Bucket(stack, "bucket"), data_format="json")
+
+
+class TestGlueTableWithCompaction:
+    """Every object left under a compacted partition must read with the table's SerDe and columns."""
+
+    @pytest.fixture
+    def s3_client(self):
+        with mock_aws():
+            client = boto3.client("s3", region_name="us-east-1")
+            client.create_bucket(Bucket="fred-data")
+            yield client
+
+    @staticmethod
+    def _rows(key, body):
+        if key.endswith(".parquet"):
+            return pq.read_table(io.BytesIO(body)).to_pylist(), pq.read_schema(io.BytesIO(body)).names
+        rows = [json.loads(line) for line in body.splitlines()]
+        return rows, sorted({name for row in rows for name in row})
+
+    @pytest.mark.parametrize("data_format", sorted(FredGlueConstruct.FORMATS))
+    def test_compacted_partition_matches_table_format(self, s3_client, data_format):
+        fred = FredExtractor(
+            {"time": "2022-08-01T00:00:00Z"}, None, None, "fred-data", api_key="key", s3_client=s3_client,
+            output_format=data_format,
+        )
+        observations = [
+            {"realtime_start": "2022-08-01", "realtime_end": "2022-08-01", "date": date, "value": value}
+            for date, value in (("2022-07-19", "1.5"), ("2022-07-20", "."), ("2022-07-21", "2.5"))
+        ]
+        fred.request_fred_data_range = Mock(return_value={"observations": observations})
+        fred.backfill("2022-07-19", "2022-07-21")
+
+        MonthlyCompactor(s3_client, "fred-data", delete_daily=True, output_format=data_format).compact("SP500", 2022, 7)
+
+        columns = sorted(name for name, _ in FredGlueConstruct.FORMATS[data_format]["columns"])
+        dates = []
+        for obj in s3_client.list_objects_v2(Bucket="fred-data", Prefix="fred/SP500/")["Contents"]:
+            rows, names = self._rows(obj["Key"], s3_client.get_object(Bucket="fred-data", Key=obj["Key"])["Body"].read())
+            assert obj["Key"].endswith(f".{fred.serializer.EXTENSION}")
+            assert sorted(names) == columns
+            assert all(row["realtime_start"] is not None for row in rows)
+            dates.extend(str(row["date"]) for row in rows)
+        # A table scan reads every date exactly once
+        assert dates == ["2022-07-19", "2022-07-20", "2022-07-21"]
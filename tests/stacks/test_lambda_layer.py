@@ -0,0 +1,60 @@
+import aws_cdk as core
+import aws_cdk.assertions as assertions
+import pytest
+from aws_cdk import aws_lambda as lambda_
+from aws_cdk import aws_s3 as s3
+
+from stacks.lambda_.lambda_ import LambdaConstruct
+
+
+def _construct(**kwargs):
+    # An empty bundling-stacks list skips the Docker build of the layer asset
+    app = core.App(context={"aws:cdk:bundling-stacks": []})
+    stack = core.Stack(app, "lambda-stack")
+    construct = LambdaConstruct(stack, "lambda", s3.Bucket(stack, "bucket"), "123456789012", **kwargs)
+    construct.python_lambda_generator()
+    return construct, assertions.Template.from_stack(stack)
+
+
+@pytest.mark.slow
+class TestLambdaLayer:
+    def test_arm64_function_and_layer_share_architecture_and_runtime(self):
+        _, template = _construct(architecture=lambda_.Architecture.ARM_64, slim_layer=True)
+
+        template.has_resource_properties(
+            "AWS::Lambda::Function", {"Architectures": ["arm64"], "Runtime": LambdaConstruct.PYTHON_RUNTIME.name}
+        )
+        template.has_resource_properties(
+            "AWS::Lambda::LayerVersion",
+            {
+                "CompatibleArchitectures": ["arm64"],
+                "CompatibleRuntimes": [LambdaConstruct.PYTHON_RUNTIME.name],
+                "LayerName": LambdaConstruct.LAYER_NAME,
+            },
+        )
+
+    def test_default_stays_on_x86_64(self):
+        construct, template = _construct()
+
+        template.has_resource_properties("AWS::Lambda::LayerVersion", {"CompatibleArchitectures": ["x86_64"]})
+        assert construct._docker_platform() == "linux/amd64"
+        assert "compileall" not in construct._layer_build_script()
+
+    def test_default_build_checks_unzipped_size(self):
+        construct, _ = _construct()
+        script = construct._layer_build_script()
+
+        assert "--no-compile" not in script and "botocore/data" not in script
+        assert script.endswith(f"test $size -le {LambdaConstruct.MAX_UNZIPPED_BYTES}")
+
+    def test_slim_build_precompiles_prunes_and_reports_size(self):
+        construct, _ = _construct(architecture=lambda_.Architecture.ARM_64, slim_layer=True)
+        script = construct._layer_build_script()
+
+        assert construct._docker_platform() == "linux/arm64"
+        assert "--no-compile" in script
+        assert "compileall -q -j 0 --invalidation-mode unchecked-hash" in script
+        assert "-name tests" in script and "-name RECORD" in script
+        assert all(f"! -name {service}" in script for service in LambdaConstruct.BOTOCORE_SERVICES)
+        assert "Layer unzipped size: ${size} bytes" in script
+        assert f"test $size -le {LambdaConstruct.MAX_UNZIPPED_BYTES}" in script
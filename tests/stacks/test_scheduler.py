@@ -0,0 +1,114 @@
+import json
+
+import aws_cdk as core
+import aws_cdk.assertions as assertions
+import pytest
+from aws_cdk import aws_lambda as lambda_
+from aws_cdk import aws_s3 as s3
+
+from stacks.lambda_.lambda_ import LambdaConstruct
+from stacks.scheduler.scheduler import FredSchedulerConstruct
+
+
+def _synth(**fan_out_kwargs):
+    app = core.App()
+    stack = core.Stack(app, "scheduler-stack")
+    # Inline code keeps the test free of Docker bundling; the timeout matches the deployed function
+    function = lambda_.Function(
+        stack,
+        "extractor",
+        runtime=lambda_.Runtime.PYTHON_3_14,
+        handler="index.handler",
+        code=lambda_.Code.from_inline("def handler(event, context): return {}"),
+        timeout=LambdaConstruct.FUNCTION_TIMEOUT,
+    )
+    if fan_out_kwargs.pop("from_s3", False):
+        fan_out_kwargs["series_list_bucket"] = s3.Bucket(stack, "series-list")
+        fan_out_kwargs["series_list_key"] = "config/series.json"
+    FredSchedulerConstruct(stack, "scheduler", function).fan_out_workflow(**fan_out_kwargs)
+    return assertions.Template.from_stack(stack)
+
+
+def _definition(template) -> dict:
+    [state_machine] = template.find_resources("AWS::StepFunctions::StateMachine").values()
+    parts = state_machine["Properties"]["DefinitionString"]["Fn::Join"][1]
+    # Token references (function ARN, bucket name) are replaced with placeholders
+    return json.loads("".join(part if isinstance(part, str) else "TOKEN" for part in parts))
+
+
+@pytest.mark.slow
+class TestFanOutWorkflow:
+    def test_inline_map_shards_series_and_limits_concurrency(self):
+        template = _synth(series_ids=["SP500", "DGS10", "DEXUSEU"], batch_size=2, max_concurrency=3)
+        states = _definition(template)["States"]
+
+        assert states["series-list"]["Result"] == ["SP500", "DGS10", "DEXUSEU"]
+        assert states["shard-series"]["Parameters"]["batches.$"] == "States.ArrayPartition($.series_ids, 2)"
+        fan_out = states["fan-out-series"]
+        assert fan_out["Type"] == "Map"
+        assert fan_out["MaxConcurrency"] == 3
+        assert fan_out["ItemsPath"] == "$.batches"
+        assert fan_out["ResultPath"] == "$.results"
+
+    def test_batch_invocation_retries_and_catches_per_item(self):
+        states = _definition(_synth(max_concurrency=4))["States"]
+        batch = states["fan-out-series"]["ItemProcessor"]["States"]["extract-batch"]
+
+        assert {"States.TaskFailed"} <= {error for retry in batch["Retry"] for error in retry["ErrorEquals"]}
+        assert batch["Catch"] == [
+            {"ErrorEquals": ["States.ALL"], "ResultPath": "$.error", "Next": "extract-batch-failed"}
+        ]
+        assert batch["Parameters"] == {
+            "time.$": "$.time",
+            "series_ids.$": "$.series_ids",
+            "requests_per_minute": 30,
+            "fail_on_error": True,
+        }
+
+    def test_concurrency_splits_the_fred_rate_limit_per_batch_only(self):
+        template = _synth(max_concurrency=4)
+        states = _definition(template)["States"]
+
+        assert states["fan-out-series"]["ItemProcessor"]["States"]["extract-batch"]["Parameters"][
+            "requests_per_minute"
+        ] == 30
+        # The shared function keeps its full rate for the scheduled and backfill modes
+        [function] = template.find_resources("AWS::Lambda::Function").values()
+        assert "FRED_REQUESTS_PER_MINUTE" not in function["Properties"].get("Environment", {}).get("Variables", {})
+
+    def test_default_batch_fits_the_function_timeout_at_the_rate_limit_share(self):
+        states = _definition(_synth(max_concurrency=4))["States"]
+
+        # 30 requests/min for 45s is 22 requests, two per series
+        assert states["shard-series"]["Parameters"]["batches.$"] == "States.ArrayPartition($.series_ids, 11)"
+
+    def test_rejects_batches_that_cannot_finish_within_the_timeout(self):
+        with pytest.raises(ValueError, match="between 1 and 11"):
+            _synth(batch_size=25, max_concurrency=4)
+
+    def test_series_list_from_s3_uses_distributed_map_with_batching(self):
+        states = _definition(_synth(from_s3=True, batch_size=20, max_concurrency=2))["States"]
+        fan_out = states["fan-out-series"]
+
+        assert fan_out["ItemProcessor"]["ProcessorConfig"]["Mode"] == "DISTRIBUTED"
+        assert fan_out["MaxConcurrency"] == 2
+        assert fan_out["ItemBatcher"]["MaxItemsPerBatch"] == 20
+        assert fan_out["ItemReader"]["Parameters"]["Key"] == "config/series.json"
+        assert fan_out["ItemReader"]["ReaderConfig"]["InputType"] == "JSON"
+        batch = fan_out["ItemProcessor"]["States"]["extract-batch-from-s3"]
+        assert (batch["Parameters"]["requests_per_minute"], batch["Parameters"]["fail_on_error"]) == (60, True)
+
+    def test_rejects_bucket_without_key(self):
+        app = core.App()
+        stack = core.Stack(app, "scheduler-stack")
+        function = lambda_.Function(
+            stack,
+            "extractor",
+            runtime=lambda_.Runtime.PYTHON_3_14,
+            handler="index.handler",
+            code=lambda_.Code.from_inline("def handler(event, context): return {}"),
+        )
+        with pytest.raises(ValueError, match="together"):
+            FredSchedulerConstruct(stack, "scheduler", function).fan_out_workflow(
+                series_list_bucket=s3.Bucket(stack, "series-list")
+            )